@@ -0,0 +1,8 @@
+"""
+Script de entrada para os benchmarks.
+"""
+
+from src.benchmark import main
+
+if __name__ == '__main__':
+    main()
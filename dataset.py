@@ -0,0 +1,8 @@
+"""
+Script de entrada para a geração de conjuntos de dados sintéticos.
+"""
+
+from src.dataset import main
+
+if __name__ == '__main__':
+    main()
@@ -1,42 +1,161 @@
 """
 Módulo de algoritmos de deconvolução.
+
+Os algoritmos são registrados pelo nome e só são importados no primeiro
+uso, de modo que listar os algoritmos (por exemplo, para montar o --help
+da linha de comando) não carrega o SciPy. Algoritmos de terceiros podem
+ser descobertos pelo grupo de entry points 'deconvolucao.algorithms':
+
+    [project.entry-points."deconvolucao.algorithms"]
+    meu_algoritmo = "meu_pacote.modulo:MeuAlgoritmo"
 """
 
-from src.algorithms.wiener import Wiener
-from .base import DeconvolutionAlgorithm
-from .richardson_lucy import RichardsonLucy
+import importlib
+import threading
+
+# Grupo de entry points para algoritmos de terceiros
+ENTRY_POINT_GROUP = 'deconvolucao.algorithms'
 
-# Registro de algoritmos disponíveis
+# Registro de algoritmos disponíveis: nome -> 'módulo:Classe' (importado sob demanda) ou classe
 ALGORITHMS = {
-    'richardson_lucy': RichardsonLucy,
-    'wiener': Wiener,
+    'richardson_lucy': 'src.algorithms.richardson_lucy:RichardsonLucy',
+    'wiener': 'src.algorithms.wiener:Wiener',
+    'joint_richardson_lucy': 'src.algorithms.joint_richardson_lucy:JointRichardsonLucy',
+    'tikhonov': 'src.algorithms.tikhonov:Tikhonov',
+    'landweber': 'src.algorithms.landweber:Landweber',
+    'tv_admm': 'src.algorithms.tv_admm:TotalVariationADMM',
+    'blind_richardson_lucy': 'src.algorithms.blind_richardson_lucy:BlindRichardsonLucy',
+}
+
+# Classes exportadas por este pacote, importadas apenas quando acessadas
+_LAZY_EXPORTS = {
+    'DeconvolutionAlgorithm': 'base',
+    'RichardsonLucy': 'richardson_lucy',
+    'Wiener': 'wiener',
+    'JointRichardsonLucy': 'joint_richardson_lucy',
+    'Tikhonov': 'tikhonov',
+    'Landweber': 'landweber',
+    'TotalVariationADMM': 'tv_admm',
+    'BlindRichardsonLucy': 'blind_richardson_lucy',
 }
 
+# Algoritmos que exigem uma pilha de quadros (atributo multi_frame), conhecidos sem importá-los
+MULTI_FRAME_ALGORITHMS = {'joint_richardson_lucy'}
+
+_entry_points_loaded = False
+_lock = threading.Lock()
+
+
+def register_algorithm(name, target, multi_frame=False):
+    """
+    Registra um algoritmo.
+
+    Args:
+        name: Nome do algoritmo (str)
+        target: Subclasse de DeconvolutionAlgorithm ou referência
+            'módulo:Classe', importada apenas no primeiro uso
+        multi_frame: Se o algoritmo exige uma pilha de quadros (usado apenas
+            quando target é uma referência; classes informam o próprio atributo)
+    """
+    with _lock:
+        ALGORITHMS[name] = target
+        if multi_frame:
+            MULTI_FRAME_ALGORITHMS.add(name)
+        else:
+            MULTI_FRAME_ALGORITHMS.discard(name)
+
+
+def _load_entry_points():
+    """Adiciona ao registro os algoritmos declarados por outros pacotes (uma única vez)."""
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    with _lock:
+        if _entry_points_loaded:
+            return
+        _entry_points_loaded = True
+        try:
+            from importlib.metadata import entry_points
+            try:
+                found = entry_points(group=ENTRY_POINT_GROUP)
+            except TypeError:
+                # Python < 3.10: entry_points() retorna um dicionário por grupo
+                found = entry_points().get(ENTRY_POINT_GROUP, [])
+        except Exception:
+            return
+        for entry_point in found:
+            # Algoritmos embutidos têm precedência sobre plugins com o mesmo nome
+            ALGORITHMS.setdefault(entry_point.name, entry_point.value)
+
+
+def _resolve(name):
+    """Importa (se necessário) e retorna a classe registrada com o nome dado."""
+    target = ALGORITHMS[name]
+    if isinstance(target, str):
+        module_name, _, class_name = target.partition(':')
+        target = getattr(importlib.import_module(module_name), class_name)
+        with _lock:
+            ALGORITHMS[name] = target
+    return target
+
+
 def get_algorithm(name):
     """
     Retorna uma instância do algoritmo pelo nome.
-    
+
     Args:
         name: Nome do algoritmo
-    
+
     Returns:
         Instância do algoritmo
-    
+
     Raises:
         ValueError: Se o algoritmo não for encontrado
     """
+    if name not in ALGORITHMS:
+        _load_entry_points()
     if name not in ALGORITHMS:
         available = ', '.join(ALGORITHMS.keys())
         raise ValueError(f"Algoritmo '{name}' não encontrado. Algoritmos disponíveis: {available}")
-    
-    return ALGORITHMS[name]()
+
+    return _resolve(name)()
+
+
+def is_multi_frame(name):
+    """
+    Indica se o algoritmo exige uma pilha de quadros, sem importá-lo.
+
+    Algoritmos ainda não importados (inclusive plugins) são consultados em
+    MULTI_FRAME_ALGORITHMS; para classes já carregadas vale o atributo
+    multi_frame.
+
+    Args:
+        name: Nome do algoritmo
+
+    Returns:
+        True se o algoritmo opera sobre múltiplos quadros
+    """
+    target = ALGORITHMS.get(name)
+    if target is None or isinstance(target, str):
+        return name in MULTI_FRAME_ALGORITHMS
+    return bool(target.multi_frame)
+
 
 def list_algorithms():
     """
     Retorna lista de nomes de algoritmos disponíveis.
-    
+
     Returns:
         Lista de strings com nomes dos algoritmos
     """
+    _load_entry_points()
     return list(ALGORITHMS.keys())
 
+
+def __getattr__(name):
+    # Mantém `from src.algorithms import RichardsonLucy` funcionando sem importação antecipada
+    # (nem mesmo do NumPy, usado pela classe base)
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(f"{__name__}.{_LAZY_EXPORTS[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
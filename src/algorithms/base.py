@@ -3,6 +3,7 @@ Classe base para algoritmos de deconvolução.
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
 
@@ -11,6 +12,18 @@ class DeconvolutionAlgorithm(ABC):
     Classe abstrata base para algoritmos de deconvolução.
     """
     
+    # Indica se deconvolve() aceita o parâmetro initial_estimate
+    supports_warm_start = False
+    
+    # Indica se deconvolve() recebe uma pilha de quadros (N, ...) e retorna
+    # uma única imagem; esses algoritmos não podem ser executados em blocos
+    multi_frame = False
+    
+    # Número aproximado de arrays float64 do tamanho do domínio da FFT
+    # mantidos vivos ao mesmo tempo ao processar um canal (usado pelo
+    # planejador de memória)
+    working_arrays = 8
+    
     @property
     @abstractmethod
     def name(self):
@@ -39,22 +52,87 @@ class DeconvolutionAlgorithm(ABC):
         """
         pass
     
-    def _process_rgb_image(self, image, process_channel_func):
+    def estimate_memory(self, image_shape, psf_shape, threads=1, **kwargs):
+        """
+        Estima o pico de memória de trabalho de deconvolve(), sem contar a
+        imagem de entrada.
+        
+        Args:
+            image_shape: Shape da imagem (tupla)
+            psf_shape: Shape da PSF (tupla)
+            threads: Número de canais processados em paralelo (int, padrão: 1)
+            **kwargs: Parâmetros específicos do algoritmo
+        
+        Returns:
+            int: Estimativa em bytes
+        """
+        spatial_ndim = len(psf_shape)
+        spatial_shape = tuple(image_shape[:spatial_ndim])
+        channels = image_shape[spatial_ndim] if len(image_shape) > spatial_ndim else 1
+        
+        # Domínio estendido usado pelas FFTs
+        padded = int(np.prod([s + k - 1 for s, k in zip(spatial_shape, psf_shape)]))
+        pixels = int(np.prod(spatial_shape))
+        
+        concurrent = max(1, min(int(threads or 1), channels))
+        working = concurrent * self.working_arrays * padded * 8
+        output = channels * pixels * 8
+        return working + output
+    
+    def _has_channels(self, image, psf):
+        """
+        Indica se a imagem tem um eixo de canais (último eixo) além das
+        dimensões espaciais da PSF, como (H, W, 3) com PSF 2-D ou
+        (Z, H, W, 3) com PSF 3-D.
+        
+        Args:
+            image: Imagem de entrada (numpy.ndarray)
+            psf: Point Spread Function (numpy.ndarray)
+        
+        Returns:
+            bool
+        """
+        return np.ndim(image) == np.ndim(psf) + 1
+    
+    def _describe_image(self, image, psf):
+        """Retorna uma descrição curta do tipo de imagem para mensagens de log."""
+        kind = "Volume 3-D" if np.ndim(psf) == 3 else None
+        if self._has_channels(image, psf):
+            channels = "RGB" if np.shape(image)[-1] == 3 else f"{np.shape(image)[-1]} canais"
+            return f"{kind} {channels}" if kind else channels
+        return kind or "Grayscale"
+    
+    def _process_rgb_image(self, image, process_channel_func, threads=1):
         """
         Processa uma imagem RGB canal por canal.
         
+        Com threads > 1 os canais são processados em paralelo em um pool de
+        threads. As FFTs e ufuncs do NumPy/SciPy liberam o GIL, então os
+        canais rodam de fato em paralelo; os canais são lidos como views e
+        escritos direto no array de saída, sem cópias intermediárias.
+        
         Args:
             image: Imagem RGB (numpy.ndarray com shape (H, W, 3))
-            process_channel_func: Função que processa um único canal
+            process_channel_func: Função que processa um único canal; recebe os
+                dados do canal (numpy.ndarray 2D) e o índice do canal (int)
+            threads: Número de threads (int, padrão: 1)
         
         Returns:
             numpy.ndarray: Imagem processada
         """
-        deconvolved_channels = []
-        for channel in range(3):
-            channel_data = image[:, :, channel]
-            deconvolved_channel = process_channel_func(channel_data)
-            deconvolved_channels.append(deconvolved_channel)
+        num_channels = image.shape[-1]
+        output = np.empty(image.shape, dtype=np.float64)
         
-        return np.stack(deconvolved_channels, axis=2)
-
+        def run(channel):
+            output[..., channel] = process_channel_func(image[..., channel], channel)
+        
+        threads = max(1, min(int(threads or 1), num_channels))
+        if threads == 1:
+            for channel in range(num_channels):
+                run(channel)
+        else:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                # list() propaga exceções levantadas nas threads
+                list(executor.map(run, range(num_channels)))
+        
+        return output
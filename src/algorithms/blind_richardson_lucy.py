@@ -0,0 +1,251 @@
+"""
+Implementação do Richardson-Lucy cego (blind), que estima a PSF junto com a imagem.
+"""
+
+import numpy as np
+from scipy import fft as sp_fft
+from PIL import Image
+from .base import DeconvolutionAlgorithm
+from .convolution import kernel_origin
+from .richardson_lucy import RichardsonLucy
+
+
+# Lado máximo (em pixels) da imagem usada para estimar a PSF
+DEFAULT_WORKING_SIZE = 512
+
+# Menor lado de uma PSF nas escalas reduzidas
+MIN_PSF_SIZE = 3
+
+# Fração da energia do palpite inicial distribuída uniformemente no suporte
+# (as atualizações multiplicativas não criam energia onde a PSF é zero)
+DEFAULT_PSF_MIXING = 0.2
+
+
+def _resize(array, shape):
+    """Redimensiona um array 2-D float (média de blocos ao reduzir, bilinear ao ampliar)."""
+    if tuple(shape) == array.shape:
+        return np.array(array, dtype=np.float64)
+    shrinking = shape[0] < array.shape[0] or shape[1] < array.shape[1]
+    resample = Image.Resampling.BOX if shrinking else Image.Resampling.BILINEAR
+    resized = Image.fromarray(np.asarray(array, dtype=np.float32), 'F').resize((shape[1], shape[0]), resample)
+    return np.asarray(resized, dtype=np.float64)
+
+
+def _odd_size(size):
+    """Arredonda um tamanho de kernel para o ímpar mais próximo (no mínimo MIN_PSF_SIZE)."""
+    size = max(MIN_PSF_SIZE, int(round(size)))
+    return size if size % 2 else size + 1
+
+
+def _resize_psf(psf, shape):
+    """Redimensiona uma PSF mantendo-a não negativa e normalizada."""
+    psf = np.maximum(_resize(psf, shape), 0)
+    total = psf.sum()
+    return psf / total if total > 0 else np.full(shape, 1.0 / np.prod(shape))
+
+
+def _embed_psf(psf, shape):
+    """Posiciona a PSF em um array de shape `shape` com a origem em (0, 0) (como psf_to_otf)."""
+    padded = np.zeros(shape)
+    padded[:psf.shape[0], :psf.shape[1]] = psf
+    return np.roll(padded, [-o for o in kernel_origin(psf.shape)], axis=(0, 1))
+
+
+class BlindRichardsonLucy(DeconvolutionAlgorithm):
+    """
+    Richardson-Lucy cego: estima a PSF e a imagem alternadamente.
+
+    Útil quando nem o modelo gaussiano nem o de movimento descrevem o
+    borrão: a PSF informada serve apenas de palpite inicial e é refinada a
+    partir da própria imagem, sempre não negativa e normalizada.
+    """
+
+    # Deconvolução final (Richardson-Lucy em resolução total)
+    working_arrays = 9
+
+    @property
+    def name(self):
+        return "blind_richardson_lucy"
+
+    @property
+    def description(self):
+        return "Richardson-Lucy cego - Estima a PSF junto com a imagem a partir de um palpite inicial"
+
+    def deconvolve(self, image, psf, num_iterations=30, clip=True, logger=None, scales=1,
+                   working_size=DEFAULT_WORKING_SIZE, psf_size=None, psf_mixing=DEFAULT_PSF_MIXING,
+                   final_iterations=None, threads=1, info=None, **kwargs):
+        """
+        Aplica o Richardson-Lucy cego.
+
+        A PSF é estimada na luminância da imagem, reduzida a uma resolução de
+        trabalho (lado máximo working_size). Cada iteração alterna duas
+        atualizações multiplicativas de Richardson-Lucy, ambas feitas como
+        multiplicações de espectros no domínio da frequência:
+
+        h^(n+1) = h^n * (u^n)^T * (g / (h^n * u^n)), restrita ao suporte, >= 0 e com soma 1
+        u^(n+1) = u^n * (h^(n+1))^T * (g / (h^(n+1) * u^n))
+
+        Com scales > 1 (coarse-to-fine), a estimativa começa em resoluções
+        menores (metade da anterior a cada nível) e a PSF e a imagem obtidas
+        em cada nível servem de ponto de partida para o seguinte, o que
+        acelera a convergência e evita mínimos locais com PSFs grandes. A PSF
+        estimada é então levada à resolução total e a imagem é deconvoluída
+        com o Richardson-Lucy comum.
+
+        Args:
+            image: Imagem de entrada (numpy.ndarray, pode ser RGB ou grayscale)
+            psf: Palpite inicial da PSF 2-D (numpy.ndarray), por exemplo uma PSF
+                gaussiana ou de movimento gerada pelo psf_generator
+            num_iterations: Iterações alternadas em cada escala (int, padrão: 30)
+            clip: Se True, limita os valores entre 0 e 1 após deconvolução (bool, padrão: True)
+            logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+            scales: Número de níveis da estratégia coarse-to-fine (int, padrão: 1)
+            working_size: Lado máximo da imagem usada na estimativa da PSF
+                (int, padrão: 512; None usa a resolução total)
+            psf_size: Lado do suporte da PSF estimada na resolução total (int,
+                padrão: o dobro do palpite inicial menos 1, para que a PSF possa
+                crescer além dele)
+            psf_mixing: Fração da energia do palpite distribuída uniformemente
+                no suporte, para que a PSF possa crescer além do palpite (float
+                em [0, 1), padrão: 0.2)
+            final_iterations: Iterações da deconvolução final em resolução total
+                (int, padrão: num_iterations)
+            threads: Número de threads para processar os canais RGB em paralelo (int, padrão: 1)
+            info: Dicionário opcional preenchido com 'psf' (PSF estimada), 'scales' e
+                as informações da deconvolução final do Richardson-Lucy
+            **kwargs: Parâmetros repassados à deconvolução final (por exemplo,
+                stopping e noise_sigma do Richardson-Lucy)
+
+        Returns:
+            numpy.ndarray: Imagem deconvoluída
+
+        Raises:
+            ValueError: Se a PSF não for 2-D ou se scales, working_size ou psf_mixing forem inválidos
+        """
+        psf = np.asarray(psf, dtype=np.float64)
+        if psf.ndim != 2:
+            raise ValueError(f"O Richardson-Lucy cego exige uma PSF 2-D, recebido {psf.shape}")
+        scales = int(scales)
+        if scales < 1:
+            raise ValueError(f"scales deve ser pelo menos 1, recebido {scales}")
+        if working_size is not None and working_size < 16:
+            raise ValueError(f"working_size deve ser pelo menos 16, recebido {working_size}")
+        if not 0 <= psf_mixing < 1:
+            raise ValueError(f"psf_mixing deve estar em [0, 1), recebido {psf_mixing}")
+
+        image = np.asarray(image, dtype=np.float64)
+        is_rgb = self._has_channels(image, psf)
+        luminance = image.mean(axis=-1) if is_rgb else image
+        height, width = luminance.shape
+
+        # Suporte da PSF estimada: o palpite centralizado em uma janela maior
+        support = _odd_size(psf_size if psf_size is not None else 2 * max(psf.shape) - 1)
+        guess = np.zeros((support, support))
+        offset = [(support - 1) // 2 - o for o in kernel_origin(psf.shape)]
+        if min(offset) < 0 or max(o + k for o, k in zip(offset, psf.shape)) > support:
+            # Palpite maior que o suporte: redimensionar em vez de recortar
+            guess = _resize_psf(psf, (support, support))
+        else:
+            guess[offset[0]:offset[0] + psf.shape[0], offset[1]:offset[1] + psf.shape[1]] = psf
+        guess = np.maximum(guess, 0)
+        guess /= max(guess.sum(), 1e-12)
+        guess = (1 - psf_mixing) * guess + psf_mixing / guess.size
+
+        working_scale = 1.0 if working_size is None else min(1.0, working_size / max(height, width))
+        if logger:
+            image_type = self._describe_image(image, psf)
+            logger.info(f"Iniciando Richardson-Lucy cego ({image_type}, suporte da PSF {support}x{support}, "
+                        f"{scales} escala(s), resolução de trabalho {working_scale:.0%})")
+
+        estimate = None
+        current_psf = guess
+        total_steps = scales * num_iterations
+        for level in reversed(range(scales)):
+            factor = working_scale / 2 ** level
+            shape = (max(16, int(round(height * factor))), max(16, int(round(width * factor))))
+            kernel_size = _odd_size(support * factor)
+
+            observed = _resize(luminance, shape)
+            current_psf = _resize_psf(current_psf, (kernel_size, kernel_size))
+            estimate = observed.copy() if estimate is None else _resize(estimate, shape)
+
+            if logger:
+                logger.info(f"Escala {scales - level}/{scales}: imagem {shape[1]}x{shape[0]}, "
+                            f"PSF {kernel_size}x{kernel_size}")
+            done = (scales - 1 - level) * num_iterations
+            estimate, current_psf = self._alternate(observed, current_psf, estimate, num_iterations,
+                                                    logger, done, total_steps)
+
+        # PSF estimada levada à resolução total
+        estimated_psf = _resize_psf(current_psf, (support, support))
+
+        if logger:
+            logger.info("PSF estimada; deconvoluindo a imagem em resolução total")
+        iterations = num_iterations if final_iterations is None else final_iterations
+        deconvolved = RichardsonLucy().deconvolve(image, estimated_psf, num_iterations=iterations, clip=clip,
+                                                  logger=logger, threads=threads, info=info, **kwargs)
+        if info is not None:
+            info['psf'] = estimated_psf
+            info['scales'] = scales
+        return deconvolved
+
+    def _alternate(self, observed, psf, estimate, num_iterations, logger=None, done=0, total_steps=None):
+        """
+        Alterna as atualizações da PSF e da imagem em uma escala.
+
+        A imagem é estendida de forma simétrica e as convoluções são
+        circulares no domínio estendido, feitas como produtos de espectros;
+        a PSF é mantida em seu suporte (kh x kw em torno da origem).
+
+        Args:
+            observed: Imagem observada 2-D na resolução da escala (numpy.ndarray)
+            psf: PSF inicial normalizada (numpy.ndarray 2-D)
+            estimate: Estimativa inicial da imagem, com o shape de observed
+            num_iterations: Número de iterações alternadas (int)
+            logger: Logger opcional para mensagens de progresso
+            done: Iterações já executadas nas escalas anteriores (int)
+            total_steps: Total de iterações em todas as escalas (int)
+
+        Returns:
+            Tupla (estimativa da imagem, PSF estimada)
+        """
+        shape = observed.shape
+        kernel_shape = psf.shape
+        padded_shape = tuple(sp_fft.next_fast_len(s + 2 * k, real=True) for s, k in zip(shape, kernel_shape))
+        pad_width = tuple((k, p - s - k) for s, k, p in zip(shape, kernel_shape, padded_shape))
+        crop = tuple(slice(k, k + s) for s, k in zip(shape, kernel_shape))
+        origin = kernel_origin(kernel_shape)
+
+        observed = np.pad(observed, pad_width, mode='symmetric')
+        estimate = np.maximum(np.pad(estimate, pad_width, mode='symmetric'), 1e-10)
+        psf = psf.copy()
+
+        for iteration in range(num_iterations):
+            image_spectrum = sp_fft.rfftn(estimate)
+
+            # Atualização da PSF: correlação da razão com a estimativa da imagem
+            otf = sp_fft.rfftn(_embed_psf(psf, padded_shape))
+            convolved = sp_fft.irfftn(image_spectrum * otf, s=padded_shape)
+            ratio = observed / np.maximum(convolved, 1e-10)
+            ratio_spectrum = sp_fft.rfftn(ratio)
+            correlation = sp_fft.irfftn(ratio_spectrum * np.conj(image_spectrum), s=padded_shape)
+            # Deslocamentos de -origem a +(k - 1 - origem) voltam para os índices do kernel
+            correlation = np.roll(correlation, origin, axis=(0, 1))[:kernel_shape[0], :kernel_shape[1]]
+            psf *= np.maximum(correlation, 0)
+            psf /= max(psf.sum(), 1e-12)
+
+            # Atualização da imagem com a nova PSF
+            otf = sp_fft.rfftn(_embed_psf(psf, padded_shape))
+            convolved = sp_fft.irfftn(image_spectrum * otf, s=padded_shape)
+            ratio = observed / np.maximum(convolved, 1e-10)
+            ratio_spectrum = sp_fft.rfftn(ratio)
+            estimate *= sp_fft.irfftn(ratio_spectrum * np.conj(otf), s=padded_shape)
+            np.maximum(estimate, 1e-10, out=estimate)
+
+            if logger:
+                logger.progress('blind_richardson_lucy', done + iteration + 1, total_steps)
+                if num_iterations <= 10 or (iteration + 1) % max(1, num_iterations // 10) == 0:
+                    progress = ((iteration + 1) / num_iterations) * 100
+                    logger.info(f"Iteração {iteration + 1}/{num_iterations} ({progress:.1f}%)")
+
+        return estimate[crop], psf
@@ -0,0 +1,481 @@
+"""
+Motores de convolução usados pelos algoritmos de deconvolução.
+
+Todos os motores seguem a convenção de scipy.signal.convolve2d com
+mode='same' e boundary='symm', de modo que podem ser trocados entre si
+sem alterar o resultado (a menos de erros de arredondamento).
+"""
+
+import threading
+from collections import OrderedDict
+import numpy as np
+from scipy import fft as sp_fft
+
+
+# Métodos de convolução aceitos pelos algoritmos
+CONVOLUTION_METHODS = ('auto', 'direct', 'fft', 'separable', 'sparse')
+
+# Energia relativa máxima descartada na decomposição separável (SVD)
+_RANK_TOLERANCE = 1e-12
+
+# Fração máxima de taps não nulos para considerar a convolução esparsa
+SPARSE_MAX_DENSITY = 0.5
+
+# Custo de um tap esparso (multiplicação + soma vetorizadas) em relação a um tap de convolve2d
+SPARSE_TAP_COST = 1.0
+
+# Número máximo de OTFs mantidas em cache
+_CACHE_SIZE = 16
+
+
+class _LRUCache:
+    """Cache LRU simples e thread-safe para OTFs e motores de convolução."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key, factory):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+        value = factory()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_otf_cache = _LRUCache(_CACHE_SIZE)
+_convolver_cache = _LRUCache(_CACHE_SIZE)
+_spectral_cache = _LRUCache(_CACHE_SIZE)
+
+
+def _kernel_key(kernel):
+    return (kernel.shape, kernel.dtype.str, kernel.tobytes())
+
+
+def kernel_origin(kernel_shape):
+    """
+    Retorna o índice do elemento do kernel que corresponde ao deslocamento zero,
+    seguindo a convenção de convolve2d(mode='same').
+
+    Args:
+        kernel_shape: Shape do kernel (tupla)
+
+    Returns:
+        Tupla com o índice da origem em cada eixo
+    """
+    return tuple((k - 1) // 2 for k in kernel_shape)
+
+
+def psf_to_otf(psf, shape):
+    """
+    Calcula a OTF (transformada da PSF) para convolução circular em `shape`.
+
+    A PSF é posicionada com sua origem no índice (0, 0) antes da FFT.
+    O resultado é o espectro real (rfftn), com o último eixo reduzido
+    para shape[-1] // 2 + 1.
+
+    Args:
+        psf: Point Spread Function (numpy.ndarray)
+        shape: Shape do domínio da convolução (tupla)
+
+    Returns:
+        numpy.ndarray: OTF complexa
+    """
+    psf = np.asarray(psf, dtype=np.float64)
+    key = (_kernel_key(psf), tuple(shape))
+    return _otf_cache.get_or_create(key, lambda: _compute_otf(psf, shape))
+
+
+def _compute_otf(psf, shape):
+    if any(p > s for p, s in zip(psf.shape, shape)):
+        raise ValueError(f"PSF {psf.shape} maior que o domínio {tuple(shape)}")
+    padded = np.zeros(shape, dtype=np.float64)
+    padded[tuple(slice(0, p) for p in psf.shape)] = psf
+    origin = kernel_origin(psf.shape)
+    padded = np.roll(padded, [-o for o in origin], axis=tuple(range(psf.ndim)))
+    otf = sp_fft.rfftn(padded)
+    otf.flags.writeable = False
+    return otf
+
+
+class DirectConvolver:
+    """Convolução direta no domínio espacial (scipy.signal.convolve2d)."""
+
+    method = 'direct'
+
+    def __init__(self, kernel, shape):
+        # scipy.signal é importado apenas quando a convolução direta é usada (importação lenta)
+        from scipy.signal import convolve2d
+        self._convolve2d = convolve2d
+        self.kernel = np.asarray(kernel, dtype=np.float64)
+        self.shape = tuple(shape)
+
+    def convolve(self, image):
+        return self._convolve2d(image, self.kernel, mode='same', boundary='symm')
+
+
+class FFTConvolver:
+    """
+    Convolução via FFT com extensão simétrica das bordas.
+
+    A imagem é estendida de forma simétrica (equivalente a boundary='symm')
+    até um tamanho rápido para a FFT, convoluída de forma circular com a
+    OTF pré-calculada e recortada de volta ao tamanho original.
+    """
+
+    method = 'fft'
+
+    def __init__(self, kernel, shape):
+        self.kernel = np.asarray(kernel, dtype=np.float64)
+        self.shape = tuple(shape)
+
+        origin = kernel_origin(self.kernel.shape)
+        self._pad_before = tuple(k - 1 - o for k, o in zip(self.kernel.shape, origin))
+        self.padded_shape = tuple(
+            sp_fft.next_fast_len(s + k - 1, real=True)
+            for s, k in zip(self.shape, self.kernel.shape)
+        )
+        self._pad_width = tuple(
+            (before, padded - s - before)
+            for before, padded, s in zip(self._pad_before, self.padded_shape, self.shape)
+        )
+        self._crop = tuple(slice(b, b + s) for b, s in zip(self._pad_before, self.shape))
+        self.otf = psf_to_otf(self.kernel, self.padded_shape)
+
+    def convolve(self, image):
+        padded = np.pad(image, self._pad_width, mode='symmetric')
+        spectrum = sp_fft.rfftn(padded)
+        spectrum *= self.otf
+        result = sp_fft.irfftn(spectrum, s=self.padded_shape)
+        return result[self._crop]
+
+
+def separable_terms(kernel, tolerance=_RANK_TOLERANCE):
+    """
+    Decompõe um kernel 2-D em uma soma de produtos externos de kernels 1-D.
+
+    A decomposição usa a SVD do kernel: K = sum_i s_i * u_i * v_i^T. São
+    mantidos apenas os termos necessários para que a energia descartada
+    (soma dos s_i^2 ignorados) fique abaixo de `tolerance` vezes a energia
+    total, de modo que o resultado coincide com a convolução 2-D a menos
+    de erros de arredondamento. PSFs gaussianas e de movimento horizontal
+    ou vertical têm posto 1.
+
+    Args:
+        kernel: Kernel 2-D (numpy.ndarray)
+        tolerance: Energia relativa máxima descartada (float, padrão: 1e-12)
+
+    Returns:
+        Lista de tuplas (kernel_coluna, kernel_linha), uma por termo
+    """
+    kernel = np.asarray(kernel, dtype=np.float64)
+    if kernel.ndim != 2:
+        raise ValueError(f"A decomposição separável exige um kernel 2-D, recebido {kernel.shape}")
+    u, singular, vt = np.linalg.svd(kernel, full_matrices=False)
+    energy = singular ** 2
+    total = energy.sum()
+    if total == 0:
+        return [(np.zeros(kernel.shape[0]), np.zeros(kernel.shape[1]))]
+    # Energia que sobra ao manter os primeiros r termos, para r = 1, 2, ...
+    remaining = total - np.cumsum(energy)
+    rank = int(np.argmax(remaining <= tolerance * total)) + 1
+    return [(u[:, i] * singular[i], vt[i].copy()) for i in range(rank)]
+
+
+def kernel_rank(kernel, tolerance=_RANK_TOLERANCE):
+    """
+    Retorna o número de termos separáveis necessários para representar o kernel.
+
+    Args:
+        kernel: Kernel de convolução (numpy.ndarray)
+        tolerance: Energia relativa máxima descartada (float, padrão: 1e-12)
+
+    Returns:
+        int: Posto efetivo (ou None se o kernel não for 2-D)
+    """
+    if np.ndim(kernel) != 2:
+        return None
+    return len(separable_terms(kernel, tolerance))
+
+
+class SeparableConvolver:
+    """
+    Convolução como soma de pares de convoluções 1-D (kernels de posto baixo).
+
+    Cada termo da decomposição SVD do kernel é aplicado como uma convolução
+    ao longo das linhas seguida de uma ao longo das colunas, com extensão
+    espelhada das bordas (mode='reflect' do scipy.ndimage, equivalente a
+    boundary='symm'). O custo por pixel cai de K_h * K_w para
+    posto * (K_h + K_w) multiplicações.
+    """
+
+    method = 'separable'
+
+    def __init__(self, kernel, shape):
+        from scipy.ndimage import convolve1d
+        self._convolve1d = convolve1d
+        self.kernel = np.asarray(kernel, dtype=np.float64)
+        self.shape = tuple(shape)
+        self.terms = separable_terms(self.kernel)
+        # ndimage centra kernels de tamanho par um elemento à direita de convolve2d
+        self._origins = tuple((k % 2) - 1 for k in self.kernel.shape)
+
+    @property
+    def rank(self):
+        return len(self.terms)
+
+    def convolve(self, image):
+        result = None
+        for column, row in self.terms:
+            term = self._convolve1d(image, column, axis=0, mode='reflect', origin=self._origins[0])
+            term = self._convolve1d(term, row, axis=1, mode='reflect', origin=self._origins[1])
+            if result is None:
+                result = term
+            else:
+                result += term
+        return result
+
+
+class SparseConvolver:
+    """
+    Convolução direta que percorre apenas os taps não nulos do kernel.
+
+    PSFs de movimento são quase todas zero, com uma linha fina de taps não
+    nulos. Este motor guarda somente os pesos não nulos e seus
+    deslocamentos e acumula fatias deslocadas e ponderadas da imagem
+    estendida de forma simétrica (equivalente a boundary='symm'). O custo
+    por pixel é proporcional ao número de taps não nulos, e não a K_h * K_w.
+    Funciona em qualquer número de dimensões.
+    """
+
+    method = 'sparse'
+
+    def __init__(self, kernel, shape):
+        self.kernel = np.asarray(kernel, dtype=np.float64)
+        self.shape = tuple(shape)
+
+        origin = kernel_origin(self.kernel.shape)
+        self._pad_width = tuple((k - 1 - o, o) for k, o in zip(self.kernel.shape, origin))
+        taps = np.nonzero(self.kernel)
+        self.weights = self.kernel[taps]
+        # Convolução: o tap k[i] lê a imagem estendida a partir de K - 1 - i
+        self.slices = [
+            tuple(slice(k - 1 - i, k - 1 - i + s) for i, k, s in zip(index, self.kernel.shape, self.shape))
+            for index in zip(*taps)
+        ]
+
+    @property
+    def nnz(self):
+        return len(self.weights)
+
+    def convolve(self, image):
+        padded = np.pad(image, self._pad_width, mode='symmetric')
+        result = np.zeros(self.shape, dtype=np.float64)
+        scratch = np.empty(self.shape, dtype=np.float64)
+        for weight, region in zip(self.weights, self.slices):
+            np.multiply(padded[region], weight, out=scratch)
+            result += scratch
+        return result
+
+
+def _direct_cost(kernel_shape, shape):
+    return float(np.prod(shape)) * float(np.prod(kernel_shape))
+
+
+def _fft_cost(kernel_shape, shape):
+    padded = np.prod([s + k - 1 for s, k in zip(shape, kernel_shape)])
+    # Constante ajustada empiricamente em relação ao custo de um tap direto
+    return 0.5 * float(padded) * np.log2(max(padded, 2))
+
+
+def _separable_cost(kernel_shape, shape, rank):
+    # Convoluções 1-D do scipy.ndimage custam bem menos por tap que convolve2d
+    return 0.25 * float(np.prod(shape)) * rank * float(sum(kernel_shape))
+
+
+def _sparse_cost(shape, nnz):
+    # Cada tap não nulo custa uma multiplicação e uma soma sobre a imagem inteira
+    return SPARSE_TAP_COST * float(np.prod(shape)) * nnz
+
+
+def select_method(kernel_shape, shape, method='auto', rank=None, nnz=None):
+    """
+    Escolhe o método de convolução para um kernel e uma imagem.
+
+    Args:
+        kernel_shape: Shape do kernel (tupla)
+        shape: Shape da imagem (tupla)
+        method: 'auto', 'direct', 'fft' ou 'separable' (str, padrão: 'auto')
+        rank: Posto efetivo do kernel (int ou None se desconhecido); com
+            'auto', o caminho separável só é considerado quando informado
+        nnz: Número de taps não nulos do kernel (int ou None se desconhecido);
+            com 'auto', o caminho esparso só é considerado quando informado
+
+    Returns:
+        str: Método escolhido ('direct', 'fft', 'separable' ou 'sparse')
+
+    Raises:
+        ValueError: Se o método for inválido
+    """
+    if method not in CONVOLUTION_METHODS:
+        raise ValueError(f"Método de convolução '{method}' inválido. Opções: {', '.join(CONVOLUTION_METHODS)}")
+    if len(shape) != 2:
+        # convolve2d e a decomposição SVD só suportam 2-D
+        if method == 'sparse':
+            return method
+        if method == 'auto' and nnz is not None and _sparse_cost(shape, nnz) < _fft_cost(kernel_shape, shape):
+            return 'sparse'
+        return 'fft'
+    if method != 'auto':
+        return method
+    costs = {
+        'direct': _direct_cost(kernel_shape, shape),
+        'fft': _fft_cost(kernel_shape, shape),
+    }
+    if rank is not None:
+        costs['separable'] = _separable_cost(kernel_shape, shape, rank)
+    if nnz is not None:
+        costs['sparse'] = _sparse_cost(shape, nnz)
+    # Em caso de empate, a ordem acima (direct, fft, separable, sparse) decide
+    return min(costs, key=costs.get)
+
+
+_CONVOLVERS = {
+    'direct': DirectConvolver,
+    'fft': FFTConvolver,
+    'separable': SeparableConvolver,
+    'sparse': SparseConvolver,
+}
+
+
+def get_convolver(kernel, shape, method='auto'):
+    """
+    Retorna um motor de convolução para o kernel e o shape dados.
+
+    Motores são mantidos em cache, de modo que chamadas repetidas com a
+    mesma PSF e o mesmo tamanho de imagem (canais RGB, quadros de vídeo)
+    reutilizam a OTF já calculada.
+
+    Args:
+        kernel: Kernel de convolução (numpy.ndarray)
+        shape: Shape da imagem a ser convoluída (tupla)
+        method: 'auto', 'direct', 'fft', 'separable' ou 'sparse' (str, padrão: 'auto')
+
+    Returns:
+        Objeto com método convolve(image)
+    """
+    kernel = np.asarray(kernel, dtype=np.float64)
+    shape = tuple(shape)
+    if method == 'auto':
+        rank = kernel_rank(kernel)
+        nnz = np.count_nonzero(kernel)
+        # O caminho esparso só compensa quando a maior parte do kernel é zero
+        if nnz > SPARSE_MAX_DENSITY * kernel.size:
+            nnz = None
+    else:
+        rank = nnz = None
+    chosen = select_method(kernel.shape, shape, method, rank, nnz)
+    key = (chosen, _kernel_key(kernel), shape)
+    return _convolver_cache.get_or_create(key, lambda: _CONVOLVERS[chosen](kernel, shape))
+
+
+class SpectralOperator:
+    """
+    Espectros pré-calculados para resolver problemas de deconvolução no
+    domínio da frequência.
+
+    A imagem é estendida de forma simétrica (psf.shape pixels de cada lado,
+    até um tamanho rápido para a FFT) e o problema é resolvido com
+    convolução circular nesse domínio estendido. Guarda a OTF H, |H|^2 e o
+    espectro das diferenças finitas, de modo que os passos internos dos
+    métodos regularizados se reduzem a multiplicações e divisões elemento
+    a elemento entre espectros.
+
+    Attributes:
+        padded_shape: Shape do domínio estendido (tupla)
+        otf: OTF H (numpy.ndarray complexo, espectro real)
+        otf_power: |H|^2 (numpy.ndarray)
+        difference_power: Soma de |D_d|^2 das diferenças finitas progressivas
+            circulares ao longo de cada eixo; é também o valor absoluto do
+            espectro do laplaciano discreto (numpy.ndarray)
+    """
+
+    def __init__(self, psf, shape):
+        self.psf = np.asarray(psf, dtype=np.float64)
+        self.shape = tuple(shape)
+        self.padded_shape = tuple(
+            sp_fft.next_fast_len(s + 2 * k, real=True) for s, k in zip(self.shape, self.psf.shape)
+        )
+        self._pad_width = tuple(
+            (k, p - s - k) for s, k, p in zip(self.shape, self.psf.shape, self.padded_shape)
+        )
+        self._crop = tuple(slice(k, k + s) for s, k in zip(self.shape, self.psf.shape))
+
+        self.otf = psf_to_otf(self.psf, self.padded_shape)
+        self.otf_power = self.otf.real ** 2 + self.otf.imag ** 2
+
+        # |D_d|^2 = 2 - 2 cos(2 pi f_d), somado sobre os eixos (espectro real no último eixo)
+        ndim = len(self.padded_shape)
+        freqs = [sp_fft.fftfreq(n) for n in self.padded_shape[:-1]] + [sp_fft.rfftfreq(self.padded_shape[-1])]
+        difference_power = np.zeros(self.otf.shape)
+        for axis, f in enumerate(freqs):
+            difference_power += (2 - 2 * np.cos(2 * np.pi * f)).reshape([-1 if a == axis else 1 for a in range(ndim)])
+        self.difference_power = difference_power
+
+        for array in (self.otf_power, self.difference_power):
+            array.flags.writeable = False
+
+    def pad(self, image):
+        """Estende a imagem de forma simétrica até o domínio da FFT."""
+        return np.pad(np.asarray(image, dtype=np.float64), self._pad_width, mode='symmetric')
+
+    def crop(self, array):
+        """Recorta um array do domínio estendido de volta ao shape da imagem."""
+        return array[self._crop]
+
+    def forward(self, array):
+        """Espectro real (rfftn) de um array do domínio estendido."""
+        return sp_fft.rfftn(array)
+
+    def inverse(self, spectrum):
+        """Volta um espectro real para o domínio estendido (irfftn)."""
+        return sp_fft.irfftn(spectrum, s=self.padded_shape)
+
+
+def get_spectral_operator(psf, shape):
+    """
+    Retorna os espectros pré-calculados para uma PSF e um shape de imagem.
+
+    Os operadores ficam em cache, compartilhados entre canais, chamadas e
+    algoritmos (Tikhonov, Landweber, TV-ADMM) com a mesma PSF e o mesmo
+    tamanho de imagem.
+
+    Args:
+        psf: Point Spread Function (numpy.ndarray)
+        shape: Shape da imagem (sem o eixo de canais) (tupla)
+
+    Returns:
+        SpectralOperator
+    """
+    psf = np.asarray(psf, dtype=np.float64)
+    shape = tuple(shape)
+    key = (_kernel_key(psf), shape)
+    return _spectral_cache.get_or_create(key, lambda: SpectralOperator(psf, shape))
+
+
+def clear_cache():
+    """Limpa os caches de OTFs, motores de convolução e operadores espectrais."""
+    _otf_cache.clear()
+    _convolver_cache.clear()
+    _spectral_cache.clear()
@@ -0,0 +1,170 @@
+"""
+Implementação do Richardson-Lucy conjunto para rajadas de quadros (multi-frame).
+"""
+
+import numpy as np
+from scipy import fft as sp_fft
+from .base import DeconvolutionAlgorithm
+from .convolution import kernel_origin, psf_to_otf
+
+
+class JointRichardsonLucy(DeconvolutionAlgorithm):
+    """
+    Richardson-Lucy conjunto para N quadros observados com N PSFs.
+
+    Produz uma única estimativa a partir de todos os quadros de uma rajada
+    (já alinhados), cada um com seu próprio borrão. As PSFs diferentes se
+    complementam: frequências perdidas por um quadro são recuperadas pelos
+    outros, de modo que o conjunto converge em menos iterações do que
+    deconvoluir cada quadro separadamente.
+    """
+
+    # Recebe uma pilha de quadros e retorna uma única imagem
+    multi_frame = True
+
+    @property
+    def name(self):
+        return "joint_richardson_lucy"
+
+    @property
+    def description(self):
+        return "Richardson-Lucy conjunto - Uma estimativa a partir de vários quadros com PSFs diferentes"
+
+    def deconvolve(self, image, psf, num_iterations=30, clip=True, logger=None, initial_estimate=None,
+                   threads=1, info=None, **kwargs):
+        """
+        Aplica o Richardson-Lucy conjunto a uma pilha de quadros.
+
+        A atualização multiplicativa combina as correções de todos os quadros:
+        u^(n+1) = u^n * (1/N) * soma_k h_k^T * (g_k / (h_k * u^n))
+
+        Onde g_k é o quadro k e h_k a sua PSF. A cada iteração a estimativa é
+        transformada uma vez e as N convoluções (e as N correlações) são
+        feitas em lote, como uma única FFT sobre um array (N, H, W).
+
+        Args:
+            image: Quadros observados, alinhados (numpy.ndarray com shape
+                (N, H, W) ou (N, H, W, C) para quadros coloridos)
+            psf: PSFs dos quadros (numpy.ndarray com shape (N, kh, kw)) ou uma
+                única PSF 2-D usada em todos os quadros
+            num_iterations: Número de iterações do algoritmo (int, padrão: 30)
+            clip: Se True, limita os valores entre 0 e 1 após deconvolução (bool, padrão: True)
+            logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+            initial_estimate: Estimativa inicial opcional com shape (H, W) ou (H, W, C)
+                (numpy.ndarray, padrão: média dos quadros)
+            threads: Número de threads das FFTs em lote (int, padrão: 1)
+            info: Dicionário opcional preenchido com 'iterations' e 'frames'
+            **kwargs: Parâmetros adicionais (ignorados)
+
+        Returns:
+            numpy.ndarray: Estimativa única com shape (H, W) ou (H, W, C)
+
+        Raises:
+            ValueError: Se os shapes dos quadros e das PSFs não forem compatíveis
+        """
+        frames = np.asarray(image, dtype=np.float64)
+        if frames.ndim not in (3, 4):
+            raise ValueError(f"Os quadros devem ter shape (N, H, W) ou (N, H, W, C), recebido {frames.shape}")
+        psfs = np.asarray(psf, dtype=np.float64)
+        if psfs.ndim == 2:
+            psfs = np.broadcast_to(psfs, (frames.shape[0],) + psfs.shape)
+        if psfs.ndim != 3 or psfs.shape[0] != frames.shape[0]:
+            raise ValueError(f"Esperadas {frames.shape[0]} PSFs 2-D (N, kh, kw), recebido {psfs.shape}")
+
+        num_frames = frames.shape[0]
+        spatial_shape = frames.shape[1:3]
+        has_channels = frames.ndim == 4
+        if has_channels:
+            # (N, H, W, C) -> (N, C, H, W): as FFTs em lote atuam nos dois últimos eixos
+            frames = np.moveaxis(frames, -1, 1)
+
+        if logger:
+            kind = f"{frames.shape[1]} canais" if has_channels else "grayscale"
+            logger.info(f"Iniciando Richardson-Lucy conjunto ({num_frames} quadros, {kind}, "
+                        f"{num_iterations} iterações)")
+
+        # Cada PSF normalizada individualmente (soma 1)
+        psfs = psfs / np.maximum(psfs.sum(axis=(1, 2), keepdims=True), 1e-12)
+
+        # Extensão simétrica das bordas até um tamanho rápido para a FFT (como no FFTConvolver)
+        kernel_shape = psfs.shape[1:]
+        pad_before = tuple(k - 1 - o for k, o in zip(kernel_shape, kernel_origin(kernel_shape)))
+        fft_shape = tuple(sp_fft.next_fast_len(s + k - 1, real=True) for s, k in zip(spatial_shape, kernel_shape))
+        pad_width = ((0, 0),) * (frames.ndim - 2) + tuple(
+            (before, padded - s - before) for before, padded, s in zip(pad_before, fft_shape, spatial_shape)
+        )
+        observed = np.pad(frames, pad_width, mode='symmetric')
+        crop = tuple(slice(b, b + s) for b, s in zip(pad_before, spatial_shape))
+
+        forward = np.stack([psf_to_otf(p, fft_shape) for p in psfs])
+        backward = np.stack([psf_to_otf(p[::-1, ::-1], fft_shape) for p in psfs])
+        if has_channels:
+            forward = forward[:, np.newaxis]
+            backward = backward[:, np.newaxis]
+
+        if initial_estimate is None:
+            estimate = observed.mean(axis=0)
+        else:
+            estimate = np.asarray(initial_estimate, dtype=np.float64)
+            if has_channels:
+                estimate = np.moveaxis(estimate, -1, 0)
+            estimate = np.pad(estimate, pad_width[1:], mode='symmetric')
+        estimate = np.maximum(estimate, 1e-10)
+
+        axes = (-2, -1)
+        workers = max(1, int(threads or 1))
+        for iteration in range(num_iterations):
+            # Uma FFT da estimativa; N convoluções em lote
+            spectrum = sp_fft.rfftn(estimate, axes=axes, workers=workers)
+            convolved = sp_fft.irfftn(spectrum * forward, s=fft_shape, axes=axes, workers=workers)
+
+            np.maximum(convolved, 1e-10, out=convolved)
+            ratio = np.divide(observed, convolved, out=convolved)
+
+            # N correlações em lote; a correção é a média entre os quadros
+            ratio_spectrum = sp_fft.rfftn(ratio, axes=axes, workers=workers)
+            ratio_spectrum *= backward
+            correction = sp_fft.irfftn(ratio_spectrum.mean(axis=0), s=fft_shape, axes=axes, workers=workers)
+
+            estimate *= correction
+            np.maximum(estimate, 0, out=estimate)
+
+            if logger:
+                logger.progress('joint_richardson_lucy', iteration + 1, num_iterations)
+                if num_iterations <= 10 or (iteration + 1) % max(1, num_iterations // 10) == 0:
+                    progress = ((iteration + 1) / num_iterations) * 100
+                    logger.info(f"Iteração {iteration + 1}/{num_iterations} ({progress:.1f}%)")
+
+        result = estimate[(Ellipsis,) + crop]
+        if has_channels:
+            result = np.moveaxis(result, 0, -1)
+        result = np.ascontiguousarray(result)
+
+        if info is not None:
+            info['iterations'] = num_iterations
+            info['frames'] = num_frames
+
+        if clip:
+            np.clip(result, 0, 1, out=result)
+
+        if logger:
+            logger.info("Deconvolução concluída com sucesso")
+
+        return result
+
+    def estimate_memory(self, image_shape, psf_shape, threads=1, **kwargs):
+        """
+        Estima o pico de memória de trabalho de deconvolve().
+
+        Os quadros estendidos, as convoluções em lote, os espectros e as OTFs
+        ocupam cerca de quatro arrays por quadro do tamanho do domínio da FFT.
+        """
+        num_frames = image_shape[0]
+        spatial_shape = tuple(image_shape[1:3])
+        channels = int(np.prod(image_shape[3:])) if len(image_shape) > 3 else 1
+        kernel_shape = tuple(psf_shape[-2:])
+
+        padded = int(np.prod([s + k - 1 for s, k in zip(spatial_shape, kernel_shape)]))
+        pixels = int(np.prod(spatial_shape))
+        working = (4 * num_frames + 4) * channels * padded * 8
+        return working + channels * pixels * 8
@@ -0,0 +1,128 @@
+"""
+Implementação do algoritmo de Landweber projetado para deconvolução.
+"""
+
+import numpy as np
+from .base import DeconvolutionAlgorithm
+from .convolution import get_spectral_operator
+
+
+class Landweber(DeconvolutionAlgorithm):
+    """
+    Algoritmo de Landweber projetado para deconvolução de imagens.
+
+    Descida de gradiente nos mínimos quadrados com projeção nos valores
+    não negativos a cada iteração. O número de iterações atua como
+    regularização: poucas iterações recuperam as frequências bem
+    preservadas pela PSF sem amplificar o ruído.
+    """
+
+    # Estimativa, imagem estendida, espectros, H^T g e ganho
+    working_arrays = 7
+
+    @property
+    def name(self):
+        return "landweber"
+
+    @property
+    def description(self):
+        return "Landweber projetado - Gradiente iterativo com restrição de não negatividade"
+
+    def deconvolve(self, image, psf, num_iterations=30, step=1.0, clip=True, logger=None, threads=1,
+                   **kwargs):
+        """
+        Aplica o algoritmo de Landweber projetado.
+
+        A atualização iterativa é:
+        u^(n+1) = P+(u^n + tau * h^T * (g - h * u^n))
+
+        Onde P+ zera os valores negativos e tau é o passo. O passo de
+        gradiente é feito no domínio da frequência, como uma única operação
+        elemento a elemento sobre espectros pré-calculados:
+        U = U * (1 - tau |H|^2) + tau H* G
+
+        de modo que cada iteração custa uma FFT e uma FFT inversa (necessárias
+        para a projeção no domínio espacial).
+
+        Args:
+            image: Imagem de entrada (numpy.ndarray, pode ser RGB ou grayscale)
+            psf: Point Spread Function (numpy.ndarray)
+            num_iterations: Número de iterações do algoritmo (int, padrão: 30)
+            step: Passo tau em unidades de 1 / max|H|^2 (igual a tau para PSFs
+                normalizadas); converge para 0 < step < 2 (float, padrão: 1.0)
+            clip: Se True, limita os valores entre 0 e 1 após deconvolução (bool, padrão: True)
+            logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+            threads: Número de threads para processar os canais RGB em paralelo (int, padrão: 1)
+            **kwargs: Parâmetros adicionais (ignorados)
+
+        Returns:
+            numpy.ndarray: Imagem deconvoluída
+
+        Raises:
+            ValueError: Se o passo estiver fora do intervalo de convergência
+        """
+        step = float(step)
+        if not 0 < step < 2:
+            raise ValueError(f"Passo {step:g} fora do intervalo de convergência (0, 2)")
+
+        if logger:
+            image_type = self._describe_image(image, psf)
+            logger.info(f"Iniciando deconvolução Landweber ({image_type}, {num_iterations} iterações, passo {step:g})")
+
+        if self._has_channels(image, psf):
+            def process_channel(channel_data, channel):
+                if logger:
+                    logger.info(f"Processando canal {channel + 1}/{image.shape[-1]}")
+                return self._landweber_single_channel(channel_data, psf, num_iterations, step, logger)
+
+            deconvolved = self._process_rgb_image(image, process_channel, threads)
+        else:
+            deconvolved = self._landweber_single_channel(image, psf, num_iterations, step, logger)
+
+        if clip:
+            np.clip(deconvolved, 0, 1, out=deconvolved)
+
+        if logger:
+            logger.info("Deconvolução concluída com sucesso")
+
+        return deconvolved
+
+    def _landweber_single_channel(self, image, psf, num_iterations, step, logger=None):
+        """
+        Aplica o Landweber projetado em um único canal (grayscale ou volume 3-D).
+
+        Args:
+            image: Imagem de entrada (numpy.ndarray 2D ou 3D)
+            psf: Point Spread Function (numpy.ndarray com a mesma dimensão da imagem)
+            num_iterations: Número de iterações (int)
+            step: Passo relativo a 1 / max|H|^2 (float)
+            logger: Logger opcional para mensagens de progresso
+
+        Returns:
+            numpy.ndarray: Imagem deconvoluída
+        """
+        operator = get_spectral_operator(psf, np.shape(image))
+        step = step / max(float(operator.otf_power.max()), 1e-12)
+        estimate = operator.pad(image)
+
+        # Termos fixos do passo de gradiente: tau H* G e o ganho 1 - tau |H|^2
+        data_term = operator.forward(estimate)
+        data_term *= step * np.conj(operator.otf)
+        gain = 1.0 - step * operator.otf_power
+
+        for iteration in range(num_iterations):
+            spectrum = operator.forward(estimate)
+            spectrum *= gain
+            spectrum += data_term
+            estimate = operator.inverse(spectrum)
+
+            # Projeção nos valores não negativos
+            np.maximum(estimate, 0, out=estimate)
+
+            if logger:
+                logger.progress('landweber', iteration + 1, num_iterations)
+                if num_iterations <= 10 or (iteration + 1) % max(1, num_iterations // 10) == 0:
+                    progress = ((iteration + 1) / num_iterations) * 100
+                    logger.info(f"Iteração {iteration + 1}/{num_iterations} ({progress:.1f}%)")
+
+        return np.ascontiguousarray(operator.crop(estimate))
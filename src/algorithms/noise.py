@@ -0,0 +1,36 @@
+"""
+Estimativa do nível de ruído de imagens.
+"""
+
+import numpy as np
+
+
+def estimate_noise_sigma(image):
+    """
+    Estima o desvio padrão do ruído gaussiano de uma imagem.
+    
+    Usa o estimador de Donoho: a mediana dos valores absolutos da sub-banda
+    de detalhes diagonal de uma transformada de Haar (que, em imagens
+    borradas, contém praticamente só ruído) dividida por 0.6745.
+    Funciona para imagens 2-D e volumes N-dimensionais.
+    
+    Args:
+        image: Imagem de um único canal (numpy.ndarray)
+    
+    Returns:
+        float: Desvio padrão estimado do ruído
+    """
+    image = np.asarray(image, dtype=np.float64)
+    # Recortar para dimensões pares
+    image = image[tuple(slice(0, (s // 2) * 2) for s in image.shape)]
+    if image.size == 0:
+        return 0.0
+    
+    # Sub-banda de detalhes em todos os eixos: diferenças alternadas entre vizinhos
+    detail = image
+    for axis in range(image.ndim):
+        even = detail.take(np.arange(0, detail.shape[axis], 2), axis=axis)
+        odd = detail.take(np.arange(1, detail.shape[axis], 2), axis=axis)
+        detail = (even - odd) / np.sqrt(2)
+    
+    return float(np.median(np.abs(detail)) / 0.6745)
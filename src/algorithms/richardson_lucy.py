@@ -3,8 +3,13 @@ Implementação do algoritmo Richardson-Lucy para deconvolução.
 """
 
 import numpy as np
-from scipy.signal import convolve2d
 from .base import DeconvolutionAlgorithm
+from .convolution import get_convolver
+from .noise import estimate_noise_sigma
+
+
+# Critérios de parada aceitos
+STOPPING_CRITERIA = ('fixed', 'discrepancy')
 
 
 class RichardsonLucy(DeconvolutionAlgorithm):
@@ -15,6 +20,11 @@ class RichardsonLucy(DeconvolutionAlgorithm):
     Implementado do zero sem dependências externas de deconvolução.
     """
     
+    supports_warm_start = True
+    
+    # Estimativa, imagem, razão, correção, buffers da FFT e as duas OTFs
+    working_arrays = 9
+    
     @property
     def name(self):
         return "richardson_lucy"
@@ -23,7 +33,9 @@ class RichardsonLucy(DeconvolutionAlgorithm):
     def description(self):
         return "Algoritmo Richardson-Lucy - Método iterativo de máxima verossimilhança"
     
-    def deconvolve(self, image, psf, num_iterations=30, clip=True, logger=None, **kwargs):
+    def deconvolve(self, image, psf, num_iterations=30, clip=True, logger=None,
+                   method='auto', initial_estimate=None, threads=1, stopping='fixed',
+                   noise_sigma=None, discrepancy_factor=1.0, info=None, **kwargs):
         """
         Aplica o algoritmo Richardson-Lucy para deconvolução de imagem.
         
@@ -39,41 +51,81 @@ class RichardsonLucy(DeconvolutionAlgorithm):
         A atualização iterativa é:
         u^(n+1) = u^n * (h^T * (g / (h * u^n)))
         
+        Com stopping='discrepancy', num_iterations passa a ser o máximo de
+        iterações: o algoritmo para assim que o resíduo RMS entre a estimativa
+        borrada (h * u^n, já calculada a cada iteração) e a imagem observada
+        fica abaixo de discrepancy_factor vezes o nível de ruído (princípio
+        da discrepância de Morozov), evitando amplificar o ruído.
+        
         Args:
             image: Imagem de entrada (numpy.ndarray, pode ser RGB ou grayscale)
             psf: Point Spread Function (numpy.ndarray)
             num_iterations: Número de iterações do algoritmo (int, padrão: 30)
             clip: Se True, limita os valores entre 0 e 1 após deconvolução (bool, padrão: True)
             logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+            method: Método de convolução: 'auto', 'direct', 'fft', 'separable' ou 'sparse' (str, padrão: 'auto')
+            initial_estimate: Estimativa inicial opcional com o mesmo shape da imagem
+                (numpy.ndarray, padrão: a própria imagem observada)
+            threads: Número de threads para processar os canais RGB em paralelo (int, padrão: 1)
+            stopping: Critério de parada: 'fixed' ou 'discrepancy' (str, padrão: 'fixed')
+            noise_sigma: Desvio padrão do ruído para stopping='discrepancy'
+                (float, padrão: estimado a partir da imagem)
+            discrepancy_factor: Fator aplicado ao nível de ruído no critério de
+                discrepância (float, padrão: 1.0)
+            info: Dicionário opcional preenchido com 'iterations' (iterações
+                executadas), 'residuals' (resíduo RMS por iteração) e 'noise_sigma';
+                para imagens RGB, inclui também 'channels' com um dicionário por canal
             **kwargs: Parâmetros adicionais (ignorados)
         
         Returns:
             numpy.ndarray: Imagem deconvoluída
+        
+        Raises:
+            ValueError: Se o critério de parada for inválido
         """
-        # Verificar se a imagem é RGB ou grayscale
-        is_rgb = len(image.shape) == 3 and image.shape[2] == 3
+        if stopping not in STOPPING_CRITERIA:
+            raise ValueError(f"Critério de parada '{stopping}' inválido. Opções: {', '.join(STOPPING_CRITERIA)}")
+        
+        stop_options = {
+            'stopping': stopping,
+            'noise_sigma': noise_sigma,
+            'discrepancy_factor': discrepancy_factor,
+        }
+        
+        # Verificar se a imagem tem canais (RGB) ou não (grayscale ou volume 3-D)
+        is_rgb = self._has_channels(image, psf)
         
         if logger:
-            image_type = "RGB" if is_rgb else "Grayscale"
+            image_type = self._describe_image(image, psf)
             logger.info(f"Iniciando deconvolução Richardson-Lucy ({image_type}, {num_iterations} iterações)")
         
         if is_rgb:
-            # Processar cada canal separadamente
-            deconvolved_channels = []
-            for channel in range(3):
+            # Processar cada canal separadamente (em paralelo se threads > 1)
+            channel_infos = [{} for _ in range(image.shape[-1])]
+            
+            def process_channel(channel_data, channel):
                 if logger:
-                    logger.info(f"Processando canal {channel + 1}/3")
-                channel_data = image[:, :, channel]
-                deconvolved_channel = self._richardson_lucy_single_channel(
+                    logger.info(f"Processando canal {channel + 1}/{image.shape[-1]}")
+                channel_estimate = None if initial_estimate is None else initial_estimate[..., channel]
+                return self._richardson_lucy_single_channel(
                     channel_data,
                     psf,
                     num_iterations,
                     clip,
-                    logger
+                    logger,
+                    method,
+                    channel_estimate,
+                    info=channel_infos[channel],
+                    **stop_options
                 )
-                deconvolved_channels.append(deconvolved_channel)
             
-            deconvolved = np.stack(deconvolved_channels, axis=2)
+            deconvolved = self._process_rgb_image(image, process_channel, threads)
+            
+            if info is not None:
+                info['channels'] = channel_infos
+                info['iterations'] = max(channel['iterations'] for channel in channel_infos)
+                info['residuals'] = [channel['residuals'] for channel in channel_infos]
+                info['noise_sigma'] = [channel['noise_sigma'] for channel in channel_infos]
         else:
             # Processar imagem em escala de cinza
             deconvolved = self._richardson_lucy_single_channel(
@@ -81,7 +133,11 @@ class RichardsonLucy(DeconvolutionAlgorithm):
                 psf,
                 num_iterations,
                 clip,
-                logger
+                logger,
+                method,
+                initial_estimate,
+                info=info,
+                **stop_options
             )
         
         if logger:
@@ -89,16 +145,24 @@ class RichardsonLucy(DeconvolutionAlgorithm):
         
         return deconvolved
     
-    def _richardson_lucy_single_channel(self, image, psf, num_iterations, clip, logger=None):
+    def _richardson_lucy_single_channel(self, image, psf, num_iterations, clip, logger=None,
+                                        method='auto', initial_estimate=None, stopping='fixed',
+                                        noise_sigma=None, discrepancy_factor=1.0, info=None):
         """
-        Aplica o algoritmo Richardson-Lucy em um único canal (grayscale).
+        Aplica o algoritmo Richardson-Lucy em um único canal (grayscale ou volume 3-D).
         
         Args:
-            image: Imagem de entrada (numpy.ndarray 2D)
-            psf: Point Spread Function (numpy.ndarray 2D)
+            image: Imagem de entrada (numpy.ndarray 2D ou 3D)
+            psf: Point Spread Function (numpy.ndarray com a mesma dimensão da imagem)
             num_iterations: Número de iterações
             clip: Se True, limita valores entre 0 e 1
             logger: Logger opcional para mensagens de progresso
+            method: Método de convolução ('auto', 'direct', 'fft', 'separable' ou 'sparse')
+            initial_estimate: Estimativa inicial opcional (numpy.ndarray com o shape da imagem)
+            stopping: Critério de parada ('fixed' ou 'discrepancy')
+            noise_sigma: Desvio padrão do ruído (float ou None para estimar)
+            discrepancy_factor: Fator aplicado ao nível de ruído no critério de discrepância
+            info: Dicionário opcional preenchido com iterações, resíduos e nível de ruído
         
         Returns:
             numpy.ndarray: Imagem deconvoluída
@@ -115,43 +179,91 @@ class RichardsonLucy(DeconvolutionAlgorithm):
         if psf_sum > 0:
             psf = psf / psf_sum
         
-        # PSF rotacionada 180 graus (transposta para convolução reversa)
-        psf_flipped = np.flip(np.flip(psf, 0), 1)
+        # PSF rotacionada 180 graus em todos os eixos (transposta para convolução reversa)
+        psf_flipped = np.flip(psf)
+        
+        # Motores de convolução (reutilizados entre canais e chamadas via cache)
+        forward = get_convolver(psf, image.shape, method)
+        backward = get_convolver(psf_flipped, image.shape, method)
+        
+        if logger:
+            logger.info(f"Método de convolução: {forward.method}")
         
-        # Inicializar estimativa com a imagem observada
+        # Inicializar estimativa com a imagem observada (ou a estimativa fornecida)
         # Adicionar um pequeno valor para evitar divisão por zero
-        estimate = np.maximum(image, 1e-10)
+        if initial_estimate is None:
+            estimate = np.maximum(image, 1e-10)
+        else:
+            estimate = np.maximum(np.asarray(initial_estimate, dtype=np.float64), 1e-10)
+        
+        # Critério de discrepância: parar quando o resíduo atingir o nível de ruído
+        use_discrepancy = stopping == 'discrepancy'
+        if use_discrepancy and noise_sigma is None:
+            noise_sigma = estimate_noise_sigma(image)
+        threshold = discrepancy_factor * noise_sigma if use_discrepancy else None
+        residuals = []
+        residual_buffer = np.empty_like(image) if use_discrepancy else None
+        iterations_done = 0
         
         if logger:
-            logger.info(f"Iniciando {num_iterations} iterações do algoritmo Richardson-Lucy")
+            if use_discrepancy:
+                logger.info(f"Iniciando até {num_iterations} iterações do algoritmo Richardson-Lucy "
+                            f"(parada por discrepância, ruído estimado: {noise_sigma:.4g})")
+            else:
+                logger.info(f"Iniciando {num_iterations} iterações do algoritmo Richardson-Lucy")
         
         # Iterações do algoritmo Richardson-Lucy
         for iteration in range(num_iterations):
             # Convolução da estimativa atual com a PSF
             # mode='same' mantém o tamanho da imagem original
-            convolved = convolve2d(estimate, psf, mode='same', boundary='symm')
+            convolved = forward.convolve(estimate)
+            
+            if use_discrepancy:
+                # Resíduo RMS entre a estimativa borrada e a imagem observada,
+                # reaproveitando a convolução já calculada
+                np.subtract(image, convolved, out=residual_buffer)
+                flat = residual_buffer.ravel()
+                residual = float(np.sqrt(np.dot(flat, flat) / flat.size))
+                residuals.append(residual)
+                if residual <= threshold:
+                    if logger:
+                        logger.info(f"Critério de discrepância atingido após {iterations_done} iterações "
+                                    f"(resíduo {residual:.4g} <= {threshold:.4g})")
+                        # Encerrar a etapa de progresso antes do número máximo de iterações
+                        logger.progress('richardson_lucy', iterations_done, iterations_done, residual)
+                    break
             
             # Evitar divisão por zero
-            convolved = np.maximum(convolved, 1e-10)
+            # (operações in-place reduzem o pico de memória em volumes 3-D)
+            np.maximum(convolved, 1e-10, out=convolved)
             
             # Calcular razão entre imagem observada e convolução
-            ratio = image / convolved
+            ratio = np.divide(image, convolved, out=convolved)
             
             # Convolução reversa da razão com a PSF rotacionada
-            correction = convolve2d(ratio, psf_flipped, mode='same', boundary='symm')
+            correction = backward.convolve(ratio)
             
             # Atualizar estimativa
-            estimate = estimate * correction
+            estimate *= correction
             
             # Garantir valores não-negativos
-            estimate = np.maximum(estimate, 0)
+            np.maximum(estimate, 0, out=estimate)
+            iterations_done = iteration + 1
             
             # Log de progresso a cada 10% ou a cada iteração se menos de 10 iterações
+            # (eventos de progresso são emitidos a cada iteração e limitados pelo logger)
             if logger:
+                logger.progress('richardson_lucy', iterations_done, num_iterations,
+                                residuals[-1] if residuals else None)
                 if num_iterations <= 10 or (iteration + 1) % max(1, num_iterations // 10) == 0:
                     progress = ((iteration + 1) / num_iterations) * 100
                     logger.info(f"Iteração {iteration + 1}/{num_iterations} ({progress:.1f}%)")
         
+        if info is not None:
+            info['iterations'] = iterations_done
+            info['residuals'] = residuals
+            info['noise_sigma'] = noise_sigma
+        
         # Aplicar clipping se solicitado
         if clip:
             if logger:
@@ -0,0 +1,103 @@
+"""
+Implementação da deconvolução de Tikhonov com prior laplaciano.
+"""
+
+import numpy as np
+from .base import DeconvolutionAlgorithm
+from .convolution import get_spectral_operator
+
+
+# Peso padrão do termo de regularização
+DEFAULT_REGULARIZATION = 0.01
+
+
+class Tikhonov(DeconvolutionAlgorithm):
+    """
+    Deconvolução de Tikhonov (mínimos quadrados regularizados) em forma fechada.
+
+    Penaliza o laplaciano da estimativa: o ruído nas altas frequências é
+    suprimido, enquanto as baixas frequências são restauradas quase sem
+    atenuação (ao contrário do Wiener com K constante).
+    """
+
+    # Imagem estendida, espectro, filtro e resultado
+    working_arrays = 5
+
+    @property
+    def name(self):
+        return "tikhonov"
+
+    @property
+    def description(self):
+        return "Tikhonov - Mínimos quadrados com prior laplaciano, solução direta na frequência"
+
+    def deconvolve(self, image, psf, regularization=None, clip=True, logger=None, threads=1, **kwargs):
+        """
+        Aplica a deconvolução de Tikhonov.
+
+        Resolve min_u ||h * u - g||^2 + lambda ||L u||^2, cuja solução é:
+        U(u,v) = H*(u,v) G(u,v) / (|H(u,v)|^2 + lambda |L(u,v)|^2)
+
+        Onde L é o laplaciano discreto. Os espectros da PSF e do laplaciano
+        são pré-calculados e compartilhados, de modo que a solução custa uma
+        FFT, uma divisão elemento a elemento e uma FFT inversa por canal.
+
+        Args:
+            image: Imagem de entrada (numpy.ndarray, pode ser RGB ou grayscale)
+            psf: Point Spread Function (numpy.ndarray)
+            regularization: Peso lambda do prior laplaciano (float, padrão: 0.01)
+            clip: Se True, limita os valores entre 0 e 1 após deconvolução (bool, padrão: True)
+            logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+            threads: Número de threads para processar os canais RGB em paralelo (int, padrão: 1)
+            **kwargs: Parâmetros adicionais (ignorados)
+
+        Returns:
+            numpy.ndarray: Imagem deconvoluída
+
+        Raises:
+            ValueError: Se regularization for negativo
+        """
+        regularization = DEFAULT_REGULARIZATION if regularization is None else float(regularization)
+        if regularization < 0:
+            raise ValueError(f"regularization deve ser não negativo, recebido {regularization}")
+
+        if logger:
+            image_type = self._describe_image(image, psf)
+            logger.info(f"Iniciando deconvolução Tikhonov ({image_type}, regularization={regularization:g})")
+
+        if self._has_channels(image, psf):
+            deconvolved = self._process_rgb_image(
+                image,
+                lambda channel_data, channel: self._tikhonov_single_channel(channel_data, psf, regularization),
+                threads
+            )
+        else:
+            deconvolved = self._tikhonov_single_channel(image, psf, regularization)
+
+        if clip:
+            np.clip(deconvolved, 0, 1, out=deconvolved)
+
+        if logger:
+            logger.info("Deconvolução Tikhonov concluída")
+
+        return deconvolved
+
+    def _tikhonov_single_channel(self, image, psf, regularization):
+        """
+        Aplica a solução de Tikhonov em um único canal (grayscale ou volume 3-D).
+
+        Args:
+            image: Imagem de entrada (numpy.ndarray 2D ou 3D)
+            psf: Point Spread Function (numpy.ndarray com a mesma dimensão da imagem)
+            regularization: Peso lambda do prior laplaciano (float)
+
+        Returns:
+            numpy.ndarray: Imagem deconvoluída
+        """
+        operator = get_spectral_operator(psf, np.shape(image))
+
+        spectrum = operator.forward(operator.pad(image))
+        spectrum *= np.conj(operator.otf)
+        spectrum /= np.maximum(operator.otf_power + regularization * operator.difference_power ** 2, 1e-10)
+
+        return np.ascontiguousarray(operator.crop(operator.inverse(spectrum)))
@@ -0,0 +1,168 @@
+"""
+Implementação da deconvolução com variação total (TV) pelo método ADMM.
+"""
+
+import numpy as np
+from .base import DeconvolutionAlgorithm
+from .convolution import get_spectral_operator
+
+
+# Peso padrão do termo de variação total
+DEFAULT_REGULARIZATION = 0.002
+
+# Razão padrão entre o parâmetro de penalidade do ADMM (rho) e o peso da TV
+DEFAULT_PENALTY_RATIO = 10.0
+
+
+def _gradient(array):
+    """Diferenças finitas progressivas circulares ao longo de cada eixo (D_d u)."""
+    return [np.roll(array, -1, axis=axis) - array for axis in range(array.ndim)]
+
+
+def _divergence_adjoint(fields):
+    """Aplica o adjunto do gradiente: soma_d D_d^T v_d."""
+    result = np.zeros_like(fields[0])
+    for axis, field in enumerate(fields):
+        result += np.roll(field, 1, axis=axis)
+        result -= field
+    return result
+
+
+class TotalVariationADMM(DeconvolutionAlgorithm):
+    """
+    Deconvolução com regularização de variação total resolvida por ADMM.
+
+    Preserva bordas nítidas enquanto suprime o ruído em regiões planas,
+    sendo indicada para imagens ruidosas.
+    """
+
+    # Estimativa, gradiente, variável auxiliar e dual (um por eixo), espectros e denominador
+    working_arrays = 14
+
+    @property
+    def name(self):
+        return "tv_admm"
+
+    @property
+    def description(self):
+        return "Variação total (ADMM) - Regularização que preserva bordas, indicada para imagens ruidosas"
+
+    def deconvolve(self, image, psf, num_iterations=30, regularization=None, penalty=None, clip=True,
+                   logger=None, threads=1, **kwargs):
+        """
+        Aplica a deconvolução com variação total.
+
+        Resolve min_u 1/2 ||h * u - g||^2 + lambda TV(u), com TV isotrópica,
+        separando z = grad(u) (ADMM com dual escalado w):
+
+        u^(n+1) = argmin 1/2 ||h * u - g||^2 + rho/2 ||grad(u) - z^n + w^n||^2
+        z^(n+1) = shrink(grad(u^(n+1)) + w^n, lambda / rho)
+        w^(n+1) = w^n + grad(u^(n+1)) - z^(n+1)
+
+        O passo em u é uma divisão elemento a elemento no domínio da
+        frequência, com os espectros pré-calculados da PSF e das diferenças
+        finitas:
+        U = (H* G + rho F(div^T(z - w))) / (|H|^2 + rho soma_d |D_d|^2)
+
+        Args:
+            image: Imagem de entrada (numpy.ndarray, pode ser RGB ou grayscale)
+            psf: Point Spread Function (numpy.ndarray)
+            num_iterations: Número de iterações do ADMM (int, padrão: 30)
+            regularization: Peso lambda da variação total (float, padrão: 0.002)
+            penalty: Parâmetro de penalidade rho do ADMM (float, padrão: 10 * lambda)
+            clip: Se True, limita os valores entre 0 e 1 após deconvolução (bool, padrão: True)
+            logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+            threads: Número de threads para processar os canais RGB em paralelo (int, padrão: 1)
+            **kwargs: Parâmetros adicionais (ignorados)
+
+        Returns:
+            numpy.ndarray: Imagem deconvoluída
+
+        Raises:
+            ValueError: Se regularization ou penalty não forem positivos
+        """
+        regularization = DEFAULT_REGULARIZATION if regularization is None else float(regularization)
+        penalty = DEFAULT_PENALTY_RATIO * regularization if penalty is None else float(penalty)
+        if regularization <= 0 or penalty <= 0:
+            raise ValueError(f"regularization e penalty devem ser positivos, recebido "
+                             f"{regularization:g} e {penalty:g}")
+
+        if logger:
+            image_type = self._describe_image(image, psf)
+            logger.info(f"Iniciando deconvolução TV-ADMM ({image_type}, {num_iterations} iterações, "
+                        f"regularization={regularization:g})")
+
+        if self._has_channels(image, psf):
+            def process_channel(channel_data, channel):
+                if logger:
+                    logger.info(f"Processando canal {channel + 1}/{image.shape[-1]}")
+                return self._tv_single_channel(channel_data, psf, num_iterations, regularization, penalty, logger)
+
+            deconvolved = self._process_rgb_image(image, process_channel, threads)
+        else:
+            deconvolved = self._tv_single_channel(image, psf, num_iterations, regularization, penalty, logger)
+
+        if clip:
+            np.clip(deconvolved, 0, 1, out=deconvolved)
+
+        if logger:
+            logger.info("Deconvolução concluída com sucesso")
+
+        return deconvolved
+
+    def _tv_single_channel(self, image, psf, num_iterations, regularization, penalty, logger=None):
+        """
+        Aplica o TV-ADMM em um único canal (grayscale ou volume 3-D).
+
+        Args:
+            image: Imagem de entrada (numpy.ndarray 2D ou 3D)
+            psf: Point Spread Function (numpy.ndarray com a mesma dimensão da imagem)
+            num_iterations: Número de iterações (int)
+            regularization: Peso lambda da variação total (float)
+            penalty: Parâmetro de penalidade rho (float)
+            logger: Logger opcional para mensagens de progresso
+
+        Returns:
+            numpy.ndarray: Imagem deconvoluída
+        """
+        operator = get_spectral_operator(psf, np.shape(image))
+        estimate = operator.pad(image)
+
+        # Termos fixos do passo em u: H* G e o denominador
+        data_term = operator.forward(estimate)
+        data_term *= np.conj(operator.otf)
+        denominator = operator.otf_power + penalty * operator.difference_power
+        np.maximum(denominator, 1e-10, out=denominator)
+
+        auxiliary = _gradient(estimate)
+        dual = [np.zeros_like(estimate) for _ in auxiliary]
+        threshold = regularization / penalty
+
+        for iteration in range(num_iterations):
+            # Passo em u: divisão elemento a elemento na frequência
+            target = _divergence_adjoint([z - w for z, w in zip(auxiliary, dual)])
+            spectrum = operator.forward(target)
+            spectrum *= penalty
+            spectrum += data_term
+            spectrum /= denominator
+            estimate = operator.inverse(spectrum)
+
+            # Passo em z: encolhimento isotrópico da magnitude do gradiente
+            gradient = _gradient(estimate)
+            shifted = [g + w for g, w in zip(gradient, dual)]
+            magnitude = np.sqrt(sum(s ** 2 for s in shifted))
+            scale = np.maximum(1.0 - threshold / np.maximum(magnitude, 1e-12), 0.0)
+            auxiliary = [s * scale for s in shifted]
+
+            # Passo no dual
+            for w, g, z in zip(dual, gradient, auxiliary):
+                w += g
+                w -= z
+
+            if logger:
+                logger.progress('tv_admm', iteration + 1, num_iterations)
+                if num_iterations <= 10 or (iteration + 1) % max(1, num_iterations // 10) == 0:
+                    progress = ((iteration + 1) / num_iterations) * 100
+                    logger.info(f"Iteração {iteration + 1}/{num_iterations} ({progress:.1f}%)")
+
+        return np.ascontiguousarray(operator.crop(estimate))
@@ -3,8 +3,20 @@ Implementação do algoritmo Wiener para deconvolução.
 """
 
 import numpy as np
-from numpy.fft import fft2, ifft2, ifftshift
+from scipy import fft as sp_fft
 from .base import DeconvolutionAlgorithm
+from .convolution import psf_to_otf
+from .noise import estimate_noise_sigma
+
+
+# Tratamentos de borda aceitos
+BOUNDARIES = ('symmetric', 'periodic')
+
+# Valores candidatos avaliados pelo modo balance='auto'
+AUTO_BALANCE_CANDIDATES = np.logspace(-6, 0, 121)
+
+# Valor usado quando não há informação suficiente para estimar o balance
+DEFAULT_BALANCE = 0.01
 
 
 class Wiener(DeconvolutionAlgorithm):
@@ -14,6 +26,9 @@ class Wiener(DeconvolutionAlgorithm):
     Um método baseado em filtragem no domínio da frequência que minimiza o erro quadrático médio.
     """
     
+    # Espectros da imagem e da PSF, filtro, denominador e resultado
+    working_arrays = 6
+    
     @property
     def name(self):
         return "wiener"
@@ -22,7 +37,8 @@ class Wiener(DeconvolutionAlgorithm):
     def description(self):
         return "Algoritmo Wiener - Método rápido no domínio da frequência"
     
-    def deconvolve(self, image, psf, balance=0.01, clip=True, logger=None, **kwargs):
+    def deconvolve(self, image, psf, balance=0.01, clip=True, logger=None, threads=1,
+                   boundary=None, **kwargs):
         """
         Aplica o algoritmo Wiener para deconvolução de imagem.
 
@@ -36,49 +52,66 @@ class Wiener(DeconvolutionAlgorithm):
         - H*(u,v) é o conjugado complexo de H(u,v)
         - K é o parâmetro de equilíbrio (balance)
         
+        Com balance='auto', K é escolhido por canal minimizando o erro quadrático
+        esperado do filtro, estimado a partir dos espectros já calculados: o
+        ruído é estimado na própria imagem e o espectro do sinal é modelado por
+        uma lei de potência ajustada nas frequências onde a PSF preserva o sinal.
+        Todos os candidatos são avaliados de uma vez, de forma vetorizada.
+        
         Args:
             image: Imagem de entrada (numpy.ndarray, pode ser RGB ou grayscale)
             psf: Point Spread Function (numpy.ndarray)
-            balance: Parâmetro de equilíbrio K (float, padrão: 0.01)
+            balance: Parâmetro de equilíbrio K (float ou 'auto', padrão: 0.01)
             clip: Se True, limita os valores entre 0 e 1 após deconvolução (bool, padrão: True)
             logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+            threads: Número de threads para processar os canais RGB em paralelo (int, padrão: 1)
+            boundary: Tratamento das bordas: 'symmetric' estende a imagem de forma
+                espelhada antes da FFT, reduzindo artefatos nas bordas; 'periodic'
+                usa a FFT diretamente (str, padrão: 'symmetric' com balance='auto'
+                e 'periodic' com K fixo, preservando os resultados anteriores)
             **kwargs: Parâmetros adicionais (ignorados)
         
         Returns:
             numpy.ndarray: Imagem deconvoluída
         """
-        # Verificar se a imagem é RGB ou grayscale
-        is_rgb = len(image.shape) == 3 and image.shape[2] == 3
+        # Verificar se a imagem tem canais (RGB) ou não (grayscale ou volume 3-D)
+        is_rgb = self._has_channels(image, psf)
         
         # Converter balance para float caso venha como string
-        try:
-            balance = float(balance)
-        except (ValueError, TypeError):
-            balance = 0.01
+        if isinstance(balance, str) and balance.strip().lower() == 'auto':
+            balance = 'auto'
+        else:
+            try:
+                balance = float(balance)
+            except (ValueError, TypeError):
+                balance = DEFAULT_BALANCE
+        
+        if boundary is None:
+            boundary = 'symmetric' if balance == 'auto' else 'periodic'
+        if boundary not in BOUNDARIES:
+            raise ValueError(f"Tratamento de borda '{boundary}' inválido. Opções: {', '.join(BOUNDARIES)}")
 
         if logger:
-            image_type = "RGB" if is_rgb else "Grayscale"
+            image_type = self._describe_image(image, psf)
             logger.info(f"Iniciando deconvolução Wiener ({image_type}, balance={balance})")
         
         if is_rgb:
-            # Processar cada canal separadamente
-            deconvolved_channels = []
-            for channel in range(3):
-                channel_data = image[:, :, channel]
-                deconvolved_channel = self._wiener_single_channel(
-                    channel_data,
-                    psf,
-                    balance
-                )
-                deconvolved_channels.append(deconvolved_channel)
-            
-            deconvolved = np.stack(deconvolved_channels, axis=2)
+            # Processar cada canal separadamente (em paralelo se threads > 1)
+            deconvolved = self._process_rgb_image(
+                image,
+                lambda channel_data, channel: self._wiener_single_channel(
+                    channel_data, psf, balance, boundary, logger
+                ),
+                threads
+            )
         else:
             # Processar imagem em escala de cinza
             deconvolved = self._wiener_single_channel(
                 image,
                 psf,
-                balance
+                balance,
+                boundary,
+                logger
             )
         
         # Aplicar clipping se solicitado
@@ -90,50 +123,132 @@ class Wiener(DeconvolutionAlgorithm):
         
         return deconvolved
     
-    def _wiener_single_channel(self, image, psf, balance):
+    def _wiener_single_channel(self, image, psf, balance, boundary='periodic', logger=None):
         """
-        Aplica o algoritmo Wiener em um único canal.
+        Aplica o algoritmo Wiener em um único canal (grayscale ou volume 3-D).
         
         Args:
-            image: Imagem de entrada (numpy.ndarray 2D)
-            psf: Point Spread Function (numpy.ndarray 2D)
-            balance: Parâmetro de equilíbrio K
+            image: Imagem de entrada (numpy.ndarray 2D ou 3D)
+            psf: Point Spread Function (numpy.ndarray com a mesma dimensão da imagem)
+            balance: Parâmetro de equilíbrio K (float ou 'auto')
+            boundary: Tratamento das bordas ('symmetric' ou 'periodic')
+            logger: Logger opcional para mensagens de progresso
         
         Returns:
             numpy.ndarray: Imagem deconvoluída
         """
-        # Dimensões
-        h, w = image.shape
-        ph, pw = psf.shape
-        
-        # 1. Preparar a PSF para a FFT (padding)
-        psf_padded = np.zeros((h, w))
-        
-        # Centralizar a PSF na matriz de padding
-        start_h = (h - ph) // 2
-        start_w = (w - pw) // 2
-        psf_padded[start_h:start_h+ph, start_w:start_w+pw] = psf
+        image = np.asarray(image, dtype=np.float64)
+        psf = np.asarray(psf, dtype=np.float64)
+        shape = image.shape
+        
+        # 0. Estender a imagem de forma espelhada (até um tamanho rápido para a FFT)
+        # para que a convolução circular implícita na FFT não crie descontinuidades nas bordas
+        if boundary == 'symmetric':
+            padded_shape = tuple(
+                sp_fft.next_fast_len(s + 2 * k, real=True) for s, k in zip(shape, psf.shape)
+            )
+            pad_width = tuple((k, p - s - k) for s, k, p in zip(shape, psf.shape, padded_shape))
+            image = np.pad(image, pad_width, mode='symmetric')
+            crop = tuple(slice(k, k + s) for s, k in zip(shape, psf.shape))
+        else:
+            crop = None
         
-        # Mover o centro da PSF para a origem (0,0) para a FFT
-        psf_padded = ifftshift(psf_padded)
+        # 1. Obter a OTF da PSF (transformada com a origem da PSF em (0,0)).
+        # A OTF fica em cache e é reutilizada entre canais e chamadas com o mesmo tamanho.
+        psf_fft = psf_to_otf(psf, image.shape)
         
-        # 2. Transformar para o Domínio da Frequência (FFT)
-        img_fft = fft2(image)
-        psf_fft = fft2(psf_padded)
+        # 2. Transformar a imagem para o Domínio da Frequência (FFT real N-dimensional)
+        img_fft = sp_fft.rfftn(image)
         
         # 3. Aplicar a Fórmula de Wiener
         # G(u,v) = F(u,v) * [ H*(u,v) / (|H(u,v)|^2 + K) ]
         
+        psf_power = psf_fft.real ** 2 + psf_fft.imag ** 2
+        
+        if balance == 'auto':
+            balance = self._estimate_balance(image, img_fft, psf_power)
+            if logger:
+                logger.info(f"Balance estimado automaticamente: {balance:.3g}")
+        
         psf_conj = np.conj(psf_fft)
-        denominator = (np.abs(psf_fft) ** 2) + balance
+        denominator = psf_power + balance
         
         # Evitar divisão por zero
         denominator = np.maximum(denominator, 1e-10)
         
-        # Calcular o resultado na frequência
-        result_fft = img_fft * (psf_conj / denominator)
+        # Calcular o resultado na frequência (in-place para reduzir o pico de memória)
+        psf_conj /= denominator
+        img_fft *= psf_conj
         
         # 4. Voltar para o Domínio Espacial (IFFT)
-        result = np.real(ifft2(result_fft))
+        result = sp_fft.irfftn(img_fft, s=image.shape)
+        
+        if crop is not None:
+            result = result[crop]
+        
+        return result
+    
+    def _estimate_balance(self, image, img_fft, psf_power, num_bins=256):
+        """
+        Estima o parâmetro K que minimiza o erro quadrático esperado do filtro.
+        
+        Para cada frequência, o erro esperado de uma estimativa de Wiener com
+        parâmetro K é:
         
-        return result
\ No newline at end of file
+            R(K) = (K / (|H|^2 + K))^2 * S_f + |H|^2 * S_n / (|H|^2 + K)^2
+        
+        onde S_n é a potência do ruído (estimada na imagem) e S_f é a potência
+        do sinal, modelada como uma lei de potência do raio da frequência e
+        ajustada nas frequências em que |H|^2 é grande (S_f = (|F|^2 - S_n) / |H|^2).
+        As frequências são agrupadas em faixas de |H|^2 para que todos os
+        candidatos sejam avaliados com uma única operação matricial pequena.
+        
+        Args:
+            image: Imagem (possivelmente estendida) usada na FFT (numpy.ndarray)
+            img_fft: Espectro real da imagem (rfftn)
+            psf_power: |H|^2 no mesmo grid de frequências
+            num_bins: Número de faixas de |H|^2 (int, padrão: 256)
+        
+        Returns:
+            float: Valor de K escolhido
+        """
+        shape = image.shape
+        noise_power = image.size * estimate_noise_sigma(image) ** 2
+        img_power = img_fft.real ** 2 + img_fft.imag ** 2
+        
+        # Raio da frequência e pesos do espectro real (colunas espelhadas contam em dobro)
+        freqs = [sp_fft.fftfreq(n) for n in shape[:-1]] + [sp_fft.rfftfreq(shape[-1])]
+        radius_sq = sum(f.reshape([-1 if a == i else 1 for a in range(len(shape))]) ** 2
+                        for i, f in enumerate(freqs))
+        weights = np.full(img_power.shape[-1], 2.0)
+        weights[0] = 1.0
+        if shape[-1] % 2 == 0:
+            weights[-1] = 1.0
+        weights = np.broadcast_to(weights, img_power.shape)
+        radius_sq = np.broadcast_to(radius_sq, img_power.shape)
+        
+        # Ajustar log S_f = a + b * log(raio) onde a PSF preserva o sinal
+        reliable = (psf_power > 0.1) & (radius_sq > 0) & (img_power > 2 * noise_power)
+        if np.count_nonzero(reliable) < 16:
+            return DEFAULT_BALANCE
+        signal = (img_power[reliable] - noise_power) / psf_power[reliable]
+        slope, intercept = np.polyfit(0.5 * np.log(radius_sq[reliable]), np.log(signal), 1)
+        min_radius_sq = 1.0 / max(shape) ** 2
+        signal_power = np.exp(intercept + 0.5 * slope * np.log(np.maximum(radius_sq, min_radius_sq)))
+        
+        # Agrupar frequências em faixas de log |H|^2
+        log_power = np.log10(np.maximum(psf_power, 1e-30))
+        low, high = log_power.min(), log_power.max()
+        bins = ((log_power - low) / max(high - low, 1e-12) * num_bins).astype(np.intp)
+        bins = np.minimum(bins, num_bins - 1).ravel()
+        weights = weights.ravel()
+        bin_weight = np.bincount(bins, weights=weights, minlength=num_bins)
+        bin_signal = np.bincount(bins, weights=weights * signal_power.ravel(), minlength=num_bins)
+        bin_psf = np.bincount(bins, weights=weights * psf_power.ravel(), minlength=num_bins)
+        bin_psf = bin_psf / np.maximum(bin_weight, 1e-30)
+        
+        # Erro esperado para todos os candidatos de uma vez (matriz candidatos x faixas)
+        k = AUTO_BALANCE_CANDIDATES[:, None]
+        denominator = (bin_psf[None, :] + k) ** 2
+        risk = (k ** 2 * bin_signal + bin_psf * bin_weight * noise_power) / denominator
+        return float(AUTO_BALANCE_CANDIDATES[np.argmin(risk.sum(axis=1))])
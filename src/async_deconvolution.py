@@ -0,0 +1,245 @@
+"""
+API assíncrona (asyncio) para deconvolução de imagens.
+
+Permite aguardar deconvoluções sem bloquear o loop de eventos e submeter
+lotes de trabalhos com concorrência limitada, executando o processamento
+em um executor de threads ou de processos.
+"""
+
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .deconvolution import deconvolve
+
+
+EXECUTOR_TYPES = ('thread', 'process')
+
+
+class JobProgress:
+    """
+    Evento de progresso de um lote de deconvoluções.
+
+    Attributes:
+        index: Índice do trabalho no lote (int)
+        completed: Número de trabalhos concluídos até agora (int)
+        total: Número total de trabalhos do lote (int)
+        result: Imagem deconvoluída (numpy.ndarray) ou None em caso de erro
+        error: Exceção levantada pelo trabalho ou None
+        elapsed: Tempo de execução do trabalho em segundos (float)
+    """
+
+    def __init__(self, index, completed, total, result=None, error=None, elapsed=0.0):
+        self.index = index
+        self.completed = completed
+        self.total = total
+        self.result = result
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        """True se o trabalho terminou sem erro."""
+        return self.error is None
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"erro={self.error!r}"
+        return f"JobProgress({self.completed}/{self.total}, index={self.index}, {status})"
+
+
+def default_workers(executor_type='thread'):
+    """
+    Número padrão de workers de um executor (o mesmo do concurrent.futures).
+
+    Args:
+        executor_type: 'thread' ou 'process' (str, padrão: 'thread')
+
+    Returns:
+        int: Número de workers
+    """
+    cpus = os.cpu_count() or 1
+    return min(32, cpus + 4) if executor_type == 'thread' else cpus
+
+
+def create_executor(executor_type='thread', max_workers=None):
+    """
+    Cria um executor para rodar deconvoluções.
+
+    Args:
+        executor_type: 'thread' ou 'process' (str, padrão: 'thread')
+        max_workers: Número máximo de workers (int ou None para o padrão do executor)
+
+    Returns:
+        concurrent.futures.Executor
+
+    Raises:
+        ValueError: Se o tipo de executor for inválido
+    """
+    if executor_type not in EXECUTOR_TYPES:
+        raise ValueError(f"Executor '{executor_type}' inválido. Opções: {', '.join(EXECUTOR_TYPES)}")
+    max_workers = max_workers or default_workers(executor_type)
+    if executor_type == 'thread':
+        return ThreadPoolExecutor(max_workers=max_workers)
+    return ProcessPoolExecutor(max_workers=max_workers)
+
+
+def _timed_deconvolve(image, psf, algorithm_name, logger, kwargs):
+    """Executa deconvolve() medindo o tempo (função de nível de módulo para ser serializável)."""
+    start = time.perf_counter()
+    result = deconvolve(image, psf, algorithm_name=algorithm_name, logger=logger, **kwargs)
+    return result, time.perf_counter() - start
+
+
+async def deconvolve_async(image, psf, algorithm_name='richardson_lucy', logger=None, executor=None, **kwargs):
+    """
+    Versão aguardável de deconvolve().
+
+    Args:
+        image: Imagem de entrada (numpy.ndarray, pode ser RGB ou grayscale)
+        psf: Point Spread Function (numpy.ndarray)
+        algorithm_name: Nome do algoritmo a ser usado (str, padrão: 'richardson_lucy')
+        logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+        executor: Executor opcional (None usa o executor padrão do loop)
+        **kwargs: Parâmetros específicos do algoritmo
+
+    Returns:
+        numpy.ndarray: Imagem deconvoluída
+    """
+    loop = asyncio.get_running_loop()
+    func = functools.partial(deconvolve, image, psf, algorithm_name=algorithm_name, logger=logger, **kwargs)
+    return await loop.run_in_executor(executor, func)
+
+
+class AsyncDeconvolver:
+    """
+    Executor assíncrono de deconvoluções com suporte a lotes.
+
+    Exemplo:
+        async with AsyncDeconvolver('process', max_concurrency=4) as deconvolver:
+            async for progress in deconvolver.map(jobs):
+                print(progress.completed, progress.total)
+
+    Cada trabalho é uma tupla (image, psf, params), onde params é um dicionário
+    com os parâmetros do algoritmo e, opcionalmente, a chave 'algorithm_name'.
+    """
+
+    def __init__(self, executor_type='thread', max_workers=None, max_concurrency=None, logger=None):
+        """
+        Inicializa o executor assíncrono.
+
+        Args:
+            executor_type: 'thread' ou 'process' (str, padrão: 'thread')
+            max_workers: Número máximo de workers do executor (int ou None)
+            max_concurrency: Número máximo de trabalhos em execução simultânea
+                (int ou None para usar max_workers)
+            logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+        """
+        self.executor_type = executor_type
+        self.max_workers = max_workers or default_workers(executor_type)
+        self.executor = create_executor(executor_type, self.max_workers)
+        self.max_concurrency = max_concurrency or self.max_workers
+        self.logger = logger
+
+    def _job_logger(self):
+        # Loggers com callbacks não podem ser enviados a outros processos
+        return self.logger if self.executor_type == 'thread' else None
+
+    async def _run(self, image, psf, params):
+        params = dict(params or {})
+        algorithm_name = params.pop('algorithm_name', 'richardson_lucy')
+        loop = asyncio.get_running_loop()
+        func = functools.partial(_timed_deconvolve, image, psf, algorithm_name, self._job_logger(), params)
+        return await loop.run_in_executor(self.executor, func)
+
+    async def deconvolve(self, image, psf, algorithm_name='richardson_lucy', **kwargs):
+        """
+        Aplica deconvolução de forma assíncrona em uma única imagem.
+
+        Args:
+            image: Imagem de entrada (numpy.ndarray)
+            psf: Point Spread Function (numpy.ndarray)
+            algorithm_name: Nome do algoritmo a ser usado (str, padrão: 'richardson_lucy')
+            **kwargs: Parâmetros específicos do algoritmo
+
+        Returns:
+            numpy.ndarray: Imagem deconvoluída
+        """
+        result, _ = await self._run(image, psf, dict(kwargs, algorithm_name=algorithm_name))
+        return result
+
+    async def map(self, jobs):
+        """
+        Processa um lote de trabalhos, produzindo eventos de progresso
+        na ordem em que os trabalhos terminam.
+
+        Args:
+            jobs: Iterável de tuplas (image, psf, params)
+
+        Yields:
+            JobProgress: Um evento por trabalho concluído
+        """
+        jobs = list(jobs)
+        total = len(jobs)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_job(index, job):
+            image, psf, params = job
+            async with semaphore:
+                try:
+                    result, elapsed = await self._run(image, psf, params)
+                    return index, result, None, elapsed
+                except Exception as e:
+                    return index, None, e, 0.0
+
+        tasks = [asyncio.ensure_future(run_job(i, job)) for i, job in enumerate(jobs)]
+        completed = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, result, error, elapsed = await next_done
+                completed += 1
+                if self.logger:
+                    if error is None:
+                        self.logger.info(f"Trabalho {index + 1} concluído ({completed}/{total}, {elapsed:.2f}s)")
+                    else:
+                        self.logger.error(f"Trabalho {index + 1} falhou: {error}")
+                yield JobProgress(index, completed, total, result, error, elapsed)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def gather(self, jobs):
+        """
+        Processa um lote de trabalhos e retorna os resultados na ordem de entrada.
+
+        Args:
+            jobs: Iterável de tuplas (image, psf, params)
+
+        Returns:
+            Lista de numpy.ndarray
+
+        Raises:
+            Exception: A primeira exceção levantada por algum trabalho
+        """
+        jobs = list(jobs)
+        results = [None] * len(jobs)
+        async for progress in self.map(jobs):
+            if progress.error is not None:
+                raise progress.error
+            results[progress.index] = progress.result
+        return results
+
+    def close(self, wait=True):
+        """Finaliza o executor (bloqueia até o fim dos trabalhos se wait=True)."""
+        self.executor.shutdown(wait=wait)
+
+    async def aclose(self):
+        """Finaliza o executor aguardando os trabalhos sem bloquear o loop de eventos."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.executor.shutdown)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
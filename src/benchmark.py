@@ -0,0 +1,219 @@
+"""
+Benchmarks de desempenho dos algoritmos de deconvolução.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+from .dataset import generate_batch
+from .deconvolution import deconvolve
+from .metrics import psnr, ssim
+from .psf_generator import generate_gaussian_psf
+
+
+# Algoritmos comparados em qualidade e tempo (nome, parâmetros)
+ALGORITHM_CASES = [
+    ('wiener', {'balance': 'auto'}),
+    ('tikhonov', {}),
+    ('richardson_lucy', {}),
+    ('landweber', {}),
+    ('tv_admm', {}),
+]
+
+
+def synthetic_image(shape, seed=0):
+    """
+    Gera uma imagem sintética com valores entre 0 e 1.
+
+    Args:
+        shape: Shape da imagem (tupla)
+        seed: Semente do gerador aleatório (int, padrão: 0)
+
+    Returns:
+        numpy.ndarray: Imagem sintética
+    """
+    rng = np.random.default_rng(seed)
+    return rng.random(shape)
+
+
+def time_call(func, repeats=3):
+    """
+    Mede o menor tempo de execução de uma função.
+
+    Args:
+        func: Função sem argumentos a ser medida
+        repeats: Número de repetições (int, padrão: 3)
+
+    Returns:
+        float: Menor tempo em segundos
+    """
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_threads(size=1024, iterations=10, repeats=3, threads=3):
+    """
+    Compara a execução sequencial e multi-thread dos canais RGB.
+
+    Args:
+        size: Lado da imagem RGB quadrada (int, padrão: 1024)
+        iterations: Iterações do Richardson-Lucy (int, padrão: 10)
+        repeats: Número de repetições de cada medida (int, padrão: 3)
+        threads: Número de threads da execução paralela (int, padrão: 3)
+
+    Returns:
+        Lista de tuplas (algoritmo, tempo sequencial, tempo paralelo, speedup)
+    """
+    image = synthetic_image((size, size, 3))
+    psf = generate_gaussian_psf(15, 3.0)
+    cases = [
+        ('wiener', {'balance': 0.01}),
+        ('richardson_lucy', {'num_iterations': iterations}),
+    ]
+
+    results = []
+    for algorithm_name, params in cases:
+        def run(num_threads):
+            return lambda: deconvolve(image, psf, algorithm_name=algorithm_name, threads=num_threads, **params)
+
+        # Aquecimento (preenche o cache de OTFs)
+        run(1)()
+        sequential = time_call(run(1), repeats)
+        parallel = time_call(run(threads), repeats)
+        results.append((algorithm_name, sequential, parallel, sequential / parallel))
+    return results
+
+
+def benchmark_algorithms(size=512, iterations=30, repeats=3, noise=0.01, samples=4, cases=ALGORITHM_CASES):
+    """
+    Compara tempo e qualidade (PSNR e SSIM) dos algoritmos em trios sintéticos.
+
+    Os trios (nítida, borrada, PSF) vêm do gerador de conjuntos de dados,
+    em memória, com PSFs gaussianas e de movimento sorteadas e ruído
+    gaussiano.
+
+    Args:
+        size: Lado das imagens grayscale quadradas (int, padrão: 512)
+        iterations: Iterações dos algoritmos iterativos (int, padrão: 30)
+        repeats: Número de repetições de cada medida (int, padrão: 3)
+        noise: Desvio padrão do ruído gaussiano adicionado (float, padrão: 0.01)
+        samples: Número de trios avaliados (int, padrão: 4)
+        cases: Lista de tuplas (algoritmo, parâmetros)
+
+    Returns:
+        Lista de tuplas (algoritmo, tempo médio por imagem em segundos, PSNR médio em dB, SSIM médio)
+    """
+    batch = generate_batch(samples, seed=1, patch_size=size, noise='gaussian', noise_level=noise)
+    triplets = list(zip(batch['sharp'], batch['blurred'], batch['psf']))
+
+    results = []
+    for algorithm_name, params in cases:
+        params = dict({'num_iterations': iterations}, **params)
+        run = lambda: [deconvolve(blurred, psf, algorithm_name=algorithm_name, **params)
+                       for _, blurred, psf in triplets]
+        # Aquecimento (preenche os caches de OTFs e espectros)
+        outputs = run()
+        elapsed = time_call(run, repeats) / samples
+        # Pilha (N, H, W) das saídas avaliada de uma vez contra as referências
+        outputs = np.stack(outputs)
+        scores_psnr = psnr(outputs, batch['sharp'], multichannel=False)
+        scores_ssim = ssim(outputs, batch['sharp'], multichannel=False)
+        results.append((algorithm_name, elapsed, float(np.mean(scores_psnr)), float(np.mean(scores_ssim))))
+    return results
+
+
+# Comandos medidos pelo benchmark de inicialização (executados a partir da raiz do projeto)
+STARTUP_COMMANDS = [
+    ("interpretador (python -c pass)", ['-c', 'pass']),
+    ("CLI --help", ['-m', 'src.main', '--help']),
+    ("import src.algorithms + lista", ['-c', 'import src.algorithms as a; a.list_algorithms()']),
+    ("import src.deconvolution", ['-c', 'import src.deconvolution']),
+    ("primeiro uso do Richardson-Lucy", ['-c', 'from src.algorithms import get_algorithm; get_algorithm("richardson_lucy")']),
+]
+
+
+def benchmark_startup(repeats=5):
+    """
+    Mede o tempo de inicialização de novos processos Python.
+
+    Cada comando roda em um processo novo, de modo que o tempo inclui as
+    importações feitas antes de qualquer trabalho (o que --help e tarefas
+    pequenas pagam).
+
+    Args:
+        repeats: Número de repetições de cada medida (int, padrão: 5)
+
+    Returns:
+        Lista de tuplas (comando, menor tempo em segundos)
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = []
+    for label, arguments in STARTUP_COMMANDS:
+        command = [sys.executable] + arguments
+        elapsed = time_call(
+            lambda: subprocess.run(command, cwd=root, check=True, stdout=subprocess.DEVNULL),
+            repeats
+        )
+        results.append((label, elapsed))
+    return results
+
+
+def print_table(title, header, rows):
+    """Imprime uma tabela simples de resultados."""
+    print(f"\n{title}")
+    print(" | ".join(header))
+    for row in rows:
+        print(" | ".join(f"{value:.3f}" if isinstance(value, float) else str(value) for value in row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks de deconvolução de imagens')
+    parser.add_argument('--size', type=int, default=1024,
+                        help='Lado da imagem sintética em pixels (padrão: 1024)')
+    parser.add_argument('--iterations', '-n', type=int, default=10,
+                        help='Iterações dos algoritmos iterativos (padrão: 10)')
+    parser.add_argument('--repeats', type=int, default=3,
+                        help='Repetições de cada medida (padrão: 3)')
+    parser.add_argument('--threads', type=int, default=3,
+                        help='Threads da execução paralela por canais (padrão: 3)')
+    parser.add_argument('--noise', type=float, default=0.01,
+                        help='Ruído da comparação entre algoritmos (padrão: 0.01)')
+    parser.add_argument('--samples', type=int, default=4,
+                        help='Trios sintéticos da comparação entre algoritmos (padrão: 4)')
+    parser.add_argument('--startup', action='store_true',
+                        help='Mede apenas o tempo de inicialização (importações) da CLI e da biblioteca')
+    args = parser.parse_args()
+
+    if args.startup:
+        print_table(
+            f"Tempo de inicialização (melhor de {args.repeats})",
+            ["comando", "tempo (s)"],
+            benchmark_startup(args.repeats)
+        )
+        return
+
+    print(f"Núcleos disponíveis: {os.cpu_count()}")
+    rows = benchmark_threads(args.size, args.iterations, args.repeats, args.threads)
+    print_table(
+        f"Canais RGB em paralelo ({args.size}x{args.size}x3, {args.threads} threads)",
+        ["algoritmo", "1 thread (s)", f"{args.threads} threads (s)", "speedup"],
+        rows
+    )
+
+    rows = benchmark_algorithms(args.size, args.iterations, args.repeats, args.noise, args.samples)
+    print_table(
+        f"Algoritmos ({args.samples} imagens {args.size}x{args.size}, ruído {args.noise:g}, {args.iterations} iterações)",
+        ["algoritmo", "tempo por imagem (s)", "PSNR médio (dB)", "SSIM médio"],
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Conversões de cor e deconvolução apenas da luminância.
+
+Em fotografias coloridas a maior parte do detalhe visível está na
+luminância (Y). No modo 'luminance' a imagem é convertida para YCbCr
+(BT.601, faixa completa), apenas o canal Y é deconvoluído e os canais de
+crominância são mantidos como estão, reduzindo o custo em cerca de 3x em
+relação a deconvoluir os três canais RGB.
+"""
+
+import numpy as np
+from .utils import to_float
+
+
+# Modos de cor aceitos
+COLOR_MODES = ('rgb', 'luminance')
+
+# Matriz RGB -> YCbCr (BT.601, faixa completa, valores em [0, 1])
+_RGB_TO_YCBCR = np.array([
+    [0.299, 0.587, 0.114],
+    [-0.168736, -0.331264, 0.5],
+    [0.5, -0.418688, -0.081312],
+])
+_YCBCR_TO_RGB = np.linalg.inv(_RGB_TO_YCBCR)
+
+
+def rgb_to_ycbcr(image):
+    """
+    Converte uma imagem RGB em YCbCr.
+
+    Args:
+        image: Imagem RGB com valores em [0, 1] ou inteiros (normalizados pelo
+            maior valor do tipo) (numpy.ndarray com último eixo de tamanho 3)
+
+    Returns:
+        numpy.ndarray: Imagem YCbCr (float64), com Cb e Cr centrados em 0
+    """
+    return to_float(np.asarray(image)) @ _RGB_TO_YCBCR.T
+
+
+def ycbcr_to_rgb(image):
+    """
+    Converte uma imagem YCbCr (como retornada por rgb_to_ycbcr) de volta para RGB.
+
+    Args:
+        image: Imagem YCbCr (numpy.ndarray com último eixo de tamanho 3)
+
+    Returns:
+        numpy.ndarray: Imagem RGB (float64)
+    """
+    return np.asarray(image, dtype=np.float64) @ _YCBCR_TO_RGB.T
+
+
+def is_color_image(image, psf):
+    """Retorna True se a imagem tiver três canais de cor além das dimensões da PSF."""
+    return np.ndim(image) == np.ndim(psf) + 1 and np.shape(image)[-1] == 3
+
+
+def deconvolve_luminance(image, deconvolve_channel, clip=True, logger=None):
+    """
+    Deconvolui apenas a luminância de uma imagem RGB.
+
+    Algoritmos multi-frame (como o Richardson-Lucy conjunto) recebem uma
+    pilha (N, H, W, 3) e fundem os N quadros de Y em uma única imagem; nesse
+    caso a crominância do resultado é a média dos quadros.
+
+    Args:
+        image: Imagem RGB (numpy.ndarray com último eixo de tamanho 3) ou
+            pilha de quadros RGB (N, H, W, 3)
+        deconvolve_channel: Função que recebe o canal Y (numpy.ndarray sem eixo
+            de canais) e retorna o canal deconvoluído
+        clip: Se True, limita o resultado RGB entre 0 e 1 (bool, padrão: True)
+        logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+
+    Returns:
+        numpy.ndarray: Imagem RGB com a luminância deconvoluída
+
+    Raises:
+        ValueError: Se o canal deconvoluído não tiver o shape de Y nem o de um quadro da pilha
+    """
+    if logger:
+        logger.info("Modo de cor 'luminance': deconvoluindo apenas o canal Y (YCbCr)")
+    ycbcr = rgb_to_ycbcr(image)
+    luminance = deconvolve_channel(np.ascontiguousarray(ycbcr[..., 0]))
+    if luminance.shape != ycbcr.shape[:-1]:
+        if luminance.shape != ycbcr.shape[1:-1]:
+            raise ValueError(f"Luminância deconvoluída com shape {luminance.shape} incompatível "
+                             f"com a imagem {ycbcr.shape[:-1]}")
+        # Pilha fundida em uma imagem: crominância média dos quadros
+        ycbcr = ycbcr.mean(axis=0)
+    ycbcr[..., 0] = luminance
+    result = ycbcr_to_rgb(ycbcr)
+    if clip:
+        np.clip(result, 0, 1, out=result)
+    return result
@@ -0,0 +1,389 @@
+"""
+Geração de conjuntos de dados sintéticos de borrão.
+
+Produz trios (imagem nítida, imagem borrada, PSF) para ajustar e comparar
+os algoritmos. Recortes das imagens de origem (ou cenas sintéticas) são
+borrados com PSFs gaussianas e de movimento aleatórias, geradas pelo
+psf_generator, e opcionalmente recebem ruído gaussiano ou de Poisson.
+
+Os trios de um lote são borrados juntos: os recortes estendidos de forma
+simétrica e as OTFs das PSFs são empilhados e convoluídos com uma única
+FFT sobre um array (N, H, W). Os lotes são gerados em processos
+separados e gravados como shards .npz compactados, acompanhados de um
+manifest.json; generate_batch() também pode ser usado diretamente como
+fonte em memória (por exemplo, pelos benchmarks).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import numpy as np
+from scipy import fft as sp_fft
+from .algorithms.convolution import kernel_origin
+from .color import rgb_to_ycbcr
+from .psf_generator import generate_gaussian_psf, generate_motion_psf
+from .utils import load_image
+
+
+BLUR_TYPES = ('gaussian', 'motion')
+
+NOISE_MODELS = ('none', 'gaussian', 'poisson')
+
+# Nível de ruído padrão: desvio padrão (gaussiano) ou fótons no branco (Poisson)
+DEFAULT_NOISE_LEVELS = {'gaussian': 0.01, 'poisson': 1000.0}
+
+# Intervalos sorteados para os parâmetros das PSFs
+SIGMA_RANGE = (0.8, 4.0)
+LENGTH_RANGE = (3.0, 15.0)
+
+MANIFEST_NAME = 'manifest.json'
+
+DEFAULT_SHARD_SIZE = 64
+
+
+def synthetic_scene(shape, seed=0):
+    """
+    Gera uma cena sintética com regiões planas, bordas nítidas e textura suave.
+
+    Args:
+        shape: Shape (altura, largura) da imagem (tupla)
+        seed: Semente do gerador aleatório (int ou sequência de ints, padrão: 0)
+
+    Returns:
+        numpy.ndarray: Imagem com valores entre 0 e 1
+    """
+    rng = np.random.default_rng(seed)
+    height, width = shape
+    blocks = rng.random((height // 32 + 1, width // 32 + 1))
+    blocks = np.kron(blocks, np.ones((32, 32)))[:height, :width]
+    y, x = np.mgrid[:height, :width]
+    frequency_x, frequency_y = rng.uniform(5.0, 15.0, size=2)
+    texture = 0.5 + 0.5 * np.sin(x / frequency_x) * np.cos(y / frequency_y)
+    return 0.6 * blocks + 0.4 * texture
+
+
+@lru_cache(maxsize=8)
+def _load_source(path):
+    """Lê uma imagem de origem como grayscale float (em cache por processo)."""
+    image = load_image(path)
+    if image.ndim == 3:
+        image = rgb_to_ycbcr(image[..., :3])[..., 0]
+    image.flags.writeable = False
+    return image
+
+
+def random_psf(rng, psf_size, blur_types=BLUR_TYPES):
+    """
+    Sorteia uma PSF gaussiana ou de movimento.
+
+    Args:
+        rng: Gerador aleatório (numpy.random.Generator)
+        psf_size: Tamanho do kernel (int)
+        blur_types: Tipos de blur sorteados (tupla de 'gaussian'/'motion')
+
+    Returns:
+        Tupla (psf, parâmetros) com a PSF normalizada e um dicionário com
+        'blur_type', 'sigma', 'length' e 'angle' (NaN quando não se aplicam)
+    """
+    blur_type = blur_types[rng.integers(len(blur_types))]
+    params = {'blur_type': blur_type, 'sigma': np.nan, 'length': np.nan, 'angle': np.nan}
+    if blur_type == 'gaussian':
+        params['sigma'] = float(rng.uniform(*SIGMA_RANGE))
+        psf = generate_gaussian_psf(psf_size, params['sigma'])
+    else:
+        params['length'] = float(rng.uniform(LENGTH_RANGE[0], min(LENGTH_RANGE[1], psf_size)))
+        params['angle'] = float(rng.uniform(0.0, 180.0))
+        psf = generate_motion_psf(psf_size, params['length'], params['angle'])
+    return psf, params
+
+
+def blur_batch(images, psfs):
+    """
+    Convolui uma pilha de imagens, cada uma com a sua PSF, via FFT em lote.
+
+    Segue a convenção dos motores de convolução (mode='same',
+    boundary='symm'): as imagens são estendidas de forma simétrica até um
+    tamanho rápido para a FFT e recortadas de volta após a convolução.
+
+    Args:
+        images: Imagens (numpy.ndarray com shape (N, H, W))
+        psfs: PSFs (numpy.ndarray com shape (N, kh, kw))
+
+    Returns:
+        numpy.ndarray: Imagens borradas com shape (N, H, W)
+    """
+    images = np.asarray(images, dtype=np.float64)
+    psfs = np.asarray(psfs, dtype=np.float64)
+    spatial_shape = images.shape[1:]
+    kernel_shape = psfs.shape[1:]
+
+    origin = kernel_origin(kernel_shape)
+    pad_before = tuple(k - 1 - o for k, o in zip(kernel_shape, origin))
+    fft_shape = tuple(sp_fft.next_fast_len(s + k - 1, real=True) for s, k in zip(spatial_shape, kernel_shape))
+    pad_width = ((0, 0),) + tuple(
+        (before, padded - s - before) for before, padded, s in zip(pad_before, fft_shape, spatial_shape)
+    )
+    padded = np.pad(images, pad_width, mode='symmetric')
+
+    # OTFs de todas as PSFs em uma única FFT (origem de cada PSF em (0, 0))
+    kernels = np.zeros((len(psfs),) + fft_shape)
+    kernels[(slice(None),) + tuple(slice(0, k) for k in kernel_shape)] = psfs
+    kernels = np.roll(kernels, [-o for o in origin], axis=(1, 2))
+    otfs = sp_fft.rfftn(kernels, axes=(1, 2))
+
+    spectrum = sp_fft.rfftn(padded, axes=(1, 2))
+    spectrum *= otfs
+    blurred = sp_fft.irfftn(spectrum, s=fft_shape, axes=(1, 2))
+    crop = (slice(None),) + tuple(slice(b, b + s) for b, s in zip(pad_before, spatial_shape))
+    return np.ascontiguousarray(blurred[crop])
+
+
+def add_noise(images, rng, model='gaussian', level=None):
+    """
+    Adiciona ruído a imagens com valores entre 0 e 1.
+
+    Args:
+        images: Imagens (numpy.ndarray, modificado no lugar quando possível)
+        rng: Gerador aleatório (numpy.random.Generator)
+        model: 'none', 'gaussian' ou 'poisson' (str, padrão: 'gaussian')
+        level: Desvio padrão do ruído gaussiano ou número de fótons no branco
+            do ruído de Poisson (float, padrão: DEFAULT_NOISE_LEVELS)
+
+    Returns:
+        numpy.ndarray: Imagens ruidosas, limitadas a [0, 1]
+
+    Raises:
+        ValueError: Se o modelo de ruído for inválido ou o nível não for positivo
+    """
+    if model not in NOISE_MODELS:
+        raise ValueError(f"Modelo de ruído '{model}' inválido. Opções: {', '.join(NOISE_MODELS)}")
+    if model == 'none':
+        return images
+    level = DEFAULT_NOISE_LEVELS[model] if level is None else float(level)
+    if level <= 0:
+        raise ValueError(f"O nível de ruído deve ser positivo, recebido {level}")
+
+    if model == 'gaussian':
+        images += rng.normal(0.0, level, size=images.shape)
+    else:
+        images = rng.poisson(np.maximum(images, 0) * level) / level
+    return np.clip(images, 0, 1, out=images)
+
+
+def generate_batch(count, seed=0, sources=None, patch_size=256, psf_size=15, blur_types=BLUR_TYPES,
+                   noise='gaussian', noise_level=None):
+    """
+    Gera um lote de trios (nítida, borrada, PSF) em memória.
+
+    O lote é determinístico para a mesma semente e as mesmas opções.
+
+    Args:
+        count: Número de trios (int)
+        seed: Semente do gerador aleatório (int ou sequência de ints, padrão: 0)
+        sources: Caminhos das imagens de origem, das quais são sorteados
+            recortes (lista de str; None usa cenas sintéticas)
+        patch_size: Lado dos recortes em pixels (int, padrão: 256)
+        psf_size: Tamanho dos kernels das PSFs (int, padrão: 15)
+        blur_types: Tipos de blur sorteados (tupla de 'gaussian'/'motion')
+        noise: Modelo de ruído: 'none', 'gaussian' ou 'poisson' (str, padrão: 'gaussian')
+        noise_level: Nível do ruído (float, padrão: DEFAULT_NOISE_LEVELS)
+
+    Returns:
+        Dicionário com 'sharp' e 'blurred' (N, patch_size, patch_size),
+        'psf' (N, psf_size, psf_size), 'blur_type' (N,) e 'sigma', 'length'
+        e 'angle' (N,), com NaN nos parâmetros que não se aplicam
+
+    Raises:
+        ValueError: Se algum parâmetro for inválido ou uma imagem de origem
+            for menor que patch_size
+    """
+    invalid = [blur_type for blur_type in blur_types if blur_type not in BLUR_TYPES]
+    if invalid or not blur_types:
+        raise ValueError(f"Tipos de blur inválidos: {invalid}. Opções: {', '.join(BLUR_TYPES)}")
+    if noise not in NOISE_MODELS:
+        raise ValueError(f"Modelo de ruído '{noise}' inválido. Opções: {', '.join(NOISE_MODELS)}")
+
+    rng = np.random.default_rng(seed)
+    sharp = np.empty((count, patch_size, patch_size))
+    psfs = np.empty((count, psf_size, psf_size))
+    params = []
+    for index in range(count):
+        if sources:
+            source = _load_source(sources[rng.integers(len(sources))])
+            height, width = source.shape
+            if height < patch_size or width < patch_size:
+                raise ValueError(f"Imagem de origem {source.shape} menor que o recorte de {patch_size} pixels")
+            top = rng.integers(height - patch_size + 1)
+            left = rng.integers(width - patch_size + 1)
+            sharp[index] = source[top:top + patch_size, left:left + patch_size]
+        else:
+            sharp[index] = synthetic_scene((patch_size, patch_size), rng.integers(2 ** 32))
+        psfs[index], sample_params = random_psf(rng, psf_size, tuple(blur_types))
+        params.append(sample_params)
+
+    blurred = add_noise(blur_batch(sharp, psfs), rng, noise, noise_level)
+    return {
+        'sharp': sharp,
+        'blurred': blurred,
+        'psf': psfs,
+        'blur_type': np.array([p['blur_type'] for p in params]),
+        'sigma': np.array([p['sigma'] for p in params]),
+        'length': np.array([p['length'] for p in params]),
+        'angle': np.array([p['angle'] for p in params]),
+    }
+
+
+def _write_shard(task):
+    """Gera e grava um shard (executado em um processo do pool)."""
+    output_dir, shard_index, count, seed, dtype, options = task
+    start = time.perf_counter()
+    batch = generate_batch(count, seed=(seed, shard_index), **options)
+    for key in ('sharp', 'blurred', 'psf'):
+        batch[key] = batch[key].astype(dtype)
+    filename = f"shard_{shard_index:05d}.npz"
+    np.savez_compressed(os.path.join(output_dir, filename), **batch)
+    return {'file': filename, 'count': count, 'seconds': round(time.perf_counter() - start, 3)}
+
+
+def write_dataset(output_dir, num_samples, shard_size=DEFAULT_SHARD_SIZE, workers=None, seed=0,
+                  dtype='float32', logger=None, **options):
+    """
+    Gera um conjunto de dados em shards .npz, em paralelo em vários processos.
+
+    Cada shard é gerado de forma independente com a semente (seed, índice),
+    de modo que o resultado não depende do número de processos.
+
+    Args:
+        output_dir: Diretório de saída (criado se não existir)
+        num_samples: Número total de trios (int)
+        shard_size: Trios por shard (int, padrão: 64)
+        workers: Número de processos (int ou None para os.cpu_count())
+        seed: Semente do conjunto de dados (int, padrão: 0)
+        dtype: Tipo dos arrays gravados (str, padrão: 'float32')
+        logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+        **options: Opções de generate_batch (sources, patch_size, psf_size,
+            blur_types, noise, noise_level)
+
+    Returns:
+        dict: Conteúdo do manifest gravado em output_dir/manifest.json
+
+    Raises:
+        ValueError: Se num_samples ou shard_size não forem positivos
+    """
+    if num_samples <= 0 or shard_size <= 0:
+        raise ValueError("num_samples e shard_size devem ser positivos")
+    if options.get('sources'):
+        options['sources'] = [os.path.abspath(path) for path in options['sources']]
+    os.makedirs(output_dir, exist_ok=True)
+
+    counts = [min(shard_size, num_samples - start) for start in range(0, num_samples, shard_size)]
+    tasks = [(output_dir, index, count, seed, dtype, options) for index, count in enumerate(counts)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+
+    if logger:
+        logger.info(f"Gerando {num_samples} trios em {len(tasks)} shards com {workers} processos")
+    start = time.perf_counter()
+    shards = [None] * len(tasks)
+    if workers == 1:
+        results = map(_write_shard, tasks)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_write_shard, tasks)
+    try:
+        for index, shard in enumerate(results):
+            shards[index] = shard
+            if logger:
+                logger.progress('shards', index + 1, len(tasks))
+    finally:
+        if workers > 1:
+            executor.shutdown()
+    elapsed = time.perf_counter() - start
+
+    manifest = {
+        'num_samples': num_samples,
+        'seed': seed,
+        'dtype': dtype,
+        'options': dict(options, blur_types=list(options.get('blur_types', BLUR_TYPES))),
+        'shards': shards,
+        'seconds': round(elapsed, 3),
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+
+    if logger:
+        logger.info(f"Conjunto gravado em {output_dir} ({num_samples / elapsed:.1f} trios/s)")
+    return manifest
+
+
+def load_dataset(directory):
+    """
+    Percorre os shards de um conjunto de dados gravado por write_dataset().
+
+    Args:
+        directory: Diretório com manifest.json e os shards
+
+    Yields:
+        Dicionários com os arrays de cada shard (como retornados por generate_batch)
+    """
+    with open(os.path.join(directory, MANIFEST_NAME)) as manifest_file:
+        manifest = json.load(manifest_file)
+    for shard in manifest['shards']:
+        with np.load(os.path.join(directory, shard['file'])) as data:
+            yield {key: data[key] for key in data.files}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Geração de conjuntos de dados sintéticos de borrão')
+    parser.add_argument('--output', '-o', required=True,
+                        help='Diretório de saída dos shards e do manifest.json')
+    parser.add_argument('--samples', '-n', type=int, default=1000,
+                        help='Número de trios (nítida, borrada, PSF) (padrão: 1000)')
+    parser.add_argument('--sources', nargs='+', metavar='IMAGEM',
+                        help='Imagens de origem para os recortes (padrão: cenas sintéticas)')
+    parser.add_argument('--patch-size', type=int, default=256,
+                        help='Lado dos recortes em pixels (padrão: 256)')
+    parser.add_argument('--psf-size', type=int, default=15,
+                        help='Tamanho dos kernels das PSFs (padrão: 15)')
+    parser.add_argument('--blur-types', nargs='+', choices=BLUR_TYPES, default=list(BLUR_TYPES),
+                        help='Tipos de blur sorteados (padrão: gaussian motion)')
+    parser.add_argument('--noise', choices=NOISE_MODELS, default='gaussian',
+                        help='Modelo de ruído (padrão: gaussian)')
+    parser.add_argument('--noise-level', type=float,
+                        help='Desvio padrão do ruído gaussiano (padrão: 0.01) ou fótons no branco '
+                             'do ruído de Poisson (padrão: 1000)')
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+                        help=f'Trios por shard (padrão: {DEFAULT_SHARD_SIZE})')
+    parser.add_argument('--workers', '-w', type=int,
+                        help='Número de processos (padrão: número de núcleos)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Semente do gerador aleatório (padrão: 0)')
+    args = parser.parse_args()
+
+    from .logger import DeconvolutionLogger
+
+    try:
+        write_dataset(
+            args.output,
+            args.samples,
+            shard_size=args.shard_size,
+            workers=args.workers,
+            seed=args.seed,
+            logger=DeconvolutionLogger(callback=print),
+            sources=args.sources,
+            patch_size=args.patch_size,
+            psf_size=args.psf_size,
+            blur_types=tuple(args.blur_types),
+            noise=args.noise,
+            noise_level=args.noise_level
+        )
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
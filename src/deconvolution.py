@@ -2,28 +2,64 @@
 Módulo principal de deconvolução com suporte a múltiplos algoritmos.
 """
 
-from .algorithms import get_algorithm, list_algorithms
+import numpy as np
+from .algorithms import list_algorithms
+from .color import COLOR_MODES, deconvolve_luminance, is_color_image
+from .memory_planner import execute_plan, plan_execution
 
 
-def deconvolve(image, psf, algorithm_name='richardson_lucy', logger=None, **kwargs):
+def deconvolve(image, psf, algorithm_name='richardson_lucy', logger=None, memory_budget=None,
+               color_mode='rgb', **kwargs):
     """
     Aplica deconvolução na imagem usando o algoritmo especificado.
     
+    Antes de iniciar, o planejador de memória estima o pico de memória e,
+    se a imagem inteira não couber no orçamento, processa a imagem em
+    blocos (com saída em memória ou em um arquivo mapeado em memória).
+    
+    Com color_mode='luminance', imagens RGB são convertidas para YCbCr e
+    apenas a luminância é deconvoluída, com cerca de 1/3 do custo.
+    
     Args:
         image: Imagem de entrada (numpy.ndarray, pode ser RGB ou grayscale)
         psf: Point Spread Function (numpy.ndarray)
         algorithm_name: Nome do algoritmo a ser usado (str, padrão: 'richardson_lucy')
         logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+        memory_budget: Orçamento de memória (bytes ou texto como '2G'; None usa
+            80% da memória disponível)
+        color_mode: 'rgb' deconvolui cada canal; 'luminance' deconvolui apenas
+            a luminância de imagens RGB (str, padrão: 'rgb')
         **kwargs: Parâmetros específicos do algoritmo
     
     Returns:
         numpy.ndarray: Imagem deconvoluída
     
     Raises:
-        ValueError: Se o algoritmo não for encontrado
+        ValueError: Se o algoritmo ou o modo de cor não forem válidos
+        MemoryError: Se a imagem não couber no orçamento nem em blocos
     """
-    algorithm = get_algorithm(algorithm_name)
-    return algorithm.deconvolve(image, psf, logger=logger, **kwargs)
+    if color_mode not in COLOR_MODES:
+        raise ValueError(f"Modo de cor '{color_mode}' inválido. Opções: {', '.join(COLOR_MODES)}")
+    
+    if color_mode == 'luminance' and is_color_image(image, psf):
+        return deconvolve_luminance(
+            image,
+            lambda luminance: deconvolve(luminance, psf, algorithm_name, logger, memory_budget, **kwargs),
+            clip=kwargs.get('clip', True),
+            logger=logger
+        )
+    
+    plan = plan_execution(
+        np.shape(image),
+        np.shape(psf),
+        algorithm_name,
+        dtype=getattr(image, 'dtype', np.float64),
+        memory_budget=memory_budget,
+        **kwargs
+    )
+    if logger:
+        logger.info(plan.describe())
+    return execute_plan(plan, image, psf, algorithm_name, logger=logger, **kwargs)
 
 
 def get_available_algorithms():
@@ -0,0 +1,183 @@
+"""
+Pipeline de exibição de imagens em múltiplas resoluções.
+
+Uma pirâmide de imagens (cada nível com metade da resolução do anterior)
+é construída uma única vez por imagem. Para exibir a imagem em um dado
+zoom, apenas os blocos visíveis são reamostrados, a partir do nível da
+pirâmide mais próximo, e guardados em cache; assim o zoom e o
+deslocamento (pan) de imagens grandes não exigem redimensionar a imagem
+inteira a cada atualização.
+"""
+
+import math
+from collections import OrderedDict
+import numpy as np
+from PIL import Image
+
+
+# Tamanho (em pixels de tela) dos blocos renderizados
+DISPLAY_TILE_SIZE = 256
+
+# Número máximo de blocos renderizados mantidos em cache
+DISPLAY_CACHE_TILES = 256
+
+# Lado máximo (em pixels) das miniaturas
+THUMBNAIL_SIZE = 200
+
+
+def to_uint8(image):
+    """
+    Converte uma imagem para uint8 para exibição.
+
+    Args:
+        image: Imagem float com valores em [0, 1] ou uint8 (numpy.ndarray)
+
+    Returns:
+        numpy.ndarray: Imagem uint8
+    """
+    image = np.asarray(image)
+    if image.dtype == np.uint8:
+        return image
+    return (np.clip(image, 0, 1) * 255).astype(np.uint8)
+
+
+class ImagePyramid:
+    """
+    Pirâmide de resolução de uma imagem com cache de blocos renderizados.
+
+    Attributes:
+        width: Largura da imagem em resolução total (int)
+        height: Altura da imagem em resolução total (int)
+        levels: Lista de PIL.Image, do nível 0 (resolução total) ao mais reduzido
+    """
+
+    def __init__(self, image, tile_size=DISPLAY_TILE_SIZE, cache_tiles=DISPLAY_CACHE_TILES):
+        """
+        Constrói a pirâmide.
+
+        Args:
+            image: Imagem 2-D grayscale ou RGB (numpy.ndarray float em [0, 1] ou uint8)
+            tile_size: Tamanho dos blocos renderizados em pixels de tela (int)
+            cache_tiles: Número máximo de blocos em cache (int)
+
+        Raises:
+            ValueError: Se a imagem não for grayscale nem RGB
+        """
+        array = to_uint8(image)
+        if array.ndim == 2:
+            base = Image.fromarray(array, 'L')
+        elif array.ndim == 3 and array.shape[-1] == 3:
+            base = Image.fromarray(np.ascontiguousarray(array), 'RGB')
+        else:
+            raise ValueError(f"Imagem de shape {array.shape} não pode ser exibida (esperado HxW ou HxWx3)")
+
+        self.width, self.height = base.size
+        self.tile_size = tile_size
+        self.levels = [base]
+        # Reduzir por 2 (média de blocos 2x2) até a imagem caber em um bloco
+        while max(self.levels[-1].size) > tile_size:
+            self.levels.append(self.levels[-1].reduce(2))
+
+        self._cache = OrderedDict()
+        self._cache_tiles = cache_tiles
+
+    def level_for_zoom(self, zoom):
+        """
+        Escolhe o nível da pirâmide a ser reamostrado para um zoom.
+
+        É usado o nível mais reduzido que ainda tem resolução maior ou igual
+        à da tela, de modo que a reamostragem sempre reduz no máximo 2x.
+
+        Args:
+            zoom: Pixels de tela por pixel da imagem (float)
+
+        Returns:
+            int: Índice do nível
+        """
+        if zoom >= 1:
+            return 0
+        level = int(math.floor(math.log2(1 / zoom)))
+        return min(level, len(self.levels) - 1)
+
+    def display_size(self, zoom):
+        """Retorna (largura, altura) da imagem na tela para um zoom."""
+        return max(1, round(self.width * zoom)), max(1, round(self.height * zoom))
+
+    def visible_tiles(self, zoom, left, top, width, height):
+        """
+        Lista os blocos visíveis em uma janela da tela.
+
+        Args:
+            zoom: Pixels de tela por pixel da imagem (float)
+            left, top: Posição da janela em coordenadas de tela relativas ao
+                canto superior esquerdo da imagem (podem ser negativas)
+            width, height: Tamanho da janela em pixels de tela
+
+        Returns:
+            Lista de tuplas (coluna, linha, x, y) com os índices de cada bloco e
+            a posição do seu canto superior esquerdo em coordenadas de tela
+            relativas à imagem
+        """
+        display_width, display_height = self.display_size(zoom)
+        size = self.tile_size
+        first_col = max(0, int(left) // size)
+        first_row = max(0, int(top) // size)
+        last_col = min((display_width - 1) // size, int(math.ceil(left + width)) // size)
+        last_row = min((display_height - 1) // size, int(math.ceil(top + height)) // size)
+        return [(col, row, col * size, row * size)
+                for row in range(first_row, last_row + 1)
+                for col in range(first_col, last_col + 1)]
+
+    def tile(self, zoom, col, row):
+        """
+        Renderiza (ou obtém do cache) um bloco da imagem em um zoom.
+
+        Args:
+            zoom: Pixels de tela por pixel da imagem (float)
+            col, row: Índices do bloco (como retornados por visible_tiles)
+
+        Returns:
+            PIL.Image: Bloco com até tile_size x tile_size pixels
+        """
+        key = (round(zoom, 6), col, row)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        display_width, display_height = self.display_size(zoom)
+        size = self.tile_size
+        x0, y0 = col * size, row * size
+        x1, y1 = min(x0 + size, display_width), min(y0 + size, display_height)
+
+        # Janela correspondente no nível escolhido (coordenadas fracionárias)
+        source = self.levels[self.level_for_zoom(zoom)]
+        scale_x = source.width / display_width
+        scale_y = source.height / display_height
+        box = (x0 * scale_x, y0 * scale_y, x1 * scale_x, y1 * scale_y)
+
+        # Ampliações usam vizinho mais próximo para permitir a inspeção pixel a pixel
+        resample = Image.Resampling.NEAREST if zoom >= 1 else Image.Resampling.BILINEAR
+        rendered = source.resize((x1 - x0, y1 - y0), resample, box=box)
+
+        self._cache[key] = rendered
+        if len(self._cache) > self._cache_tiles:
+            self._cache.popitem(last=False)
+        return rendered
+
+
+def make_thumbnail(image, size=THUMBNAIL_SIZE):
+    """
+    Cria uma miniatura para exibição.
+
+    Args:
+        image: Imagem 2-D grayscale ou RGB (numpy.ndarray float em [0, 1] ou uint8)
+        size: Lado máximo da miniatura em pixels (int, padrão: THUMBNAIL_SIZE)
+
+    Returns:
+        PIL.Image: Miniatura mantendo a proporção da imagem
+    """
+    array = to_uint8(image)
+    thumbnail = Image.fromarray(np.ascontiguousarray(array), 'RGB' if array.ndim == 3 else 'L')
+    thumbnail.thumbnail((size, size), Image.Resampling.BILINEAR, reducing_gap=2.0)
+    return thumbnail
@@ -5,13 +5,41 @@ Interface gráfica para deconvolução de imagens.
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk, scrolledtext
 import numpy as np
-from PIL import Image, ImageTk
+from PIL import ImageTk
 import threading
+import queue
+import math
+import time
 import os
-from .psf_generator import generate_gaussian_psf, generate_motion_psf
 from .deconvolution import deconvolve, get_available_algorithms
-from .logger import DeconvolutionLogger
-from .algorithms import get_algorithm
+from .roi import deconvolve_roi, roi_tile
+from .display import ImagePyramid, make_thumbnail, THUMBNAIL_SIZE
+from .logger import DeconvolutionLogger, ProgressChannel, ProgressEvent
+from .variants import make_psf, parse_values, expand_variants, variant_label, variant_jobs, run_variants
+from .utils import load_image, save_image, to_float
+from .algorithms import get_algorithm, is_multi_frame
+
+
+# Intervalo (ms) entre leituras do canal de progresso (~30 quadros/s)
+PROGRESS_POLL_MS = 33
+# Número máximo de linhas mantidas na área de log
+LOG_MAX_LINES = 2000
+# Fator de cada passo de zoom e zoom máximo (pixels de tela por pixel da imagem)
+ZOOM_STEP = 1.25
+MAX_ZOOM = 32.0
+# Parâmetros que podem ser variados na grade de variantes (rótulo -> parâmetro)
+VARIANT_AXES = {
+    "sigma": "sigma",
+    "tamanho": "size",
+    "comprimento": "length",
+    "ângulo": "angle",
+    "iterações": "num_iterations",
+    "balance": "balance",
+    "regularização": "regularization",
+}
+# Algoritmos que usam o número de iterações e o peso de regularização
+ITERATIVE_ALGORITHMS = ("richardson_lucy", "landweber", "tv_admm", "blind_richardson_lucy")
+REGULARIZED_ALGORITHMS = ("tikhonov", "tv_admm")
 
 
 class DeconvolutionGUI:
@@ -24,8 +52,35 @@ class DeconvolutionGUI:
         self.original_image = None
         self.deconvolved_image = None
         
-        # Obter algoritmos disponíveis
-        self.available_algorithms = get_available_algorithms()
+        # Região de interesse (x, y, w, h) em pixels da imagem, ou None para a imagem inteira
+        self.roi = None
+        self._roi_start = None
+        # Escala e deslocamento de cada canvas (imagem -> canvas), usados na seleção da ROI
+        self._display_transforms = {}
+        
+        # Pirâmide de exibição de cada canvas e visão (zoom e centro, em pixels da
+        # imagem) compartilhada pelos dois canvas, que ficam sincronizados
+        self._pyramids = {}
+        self._zoom = None
+        self._center = (0.0, 0.0)
+        self._pan_start = None
+        self._render_pending = False
+        
+        # Grade de variantes: resultados chegam da thread de cálculo por uma fila
+        self._variant_queue = queue.Queue()
+        self._variants_window = None
+        self._variant_cells = []
+        self._variant_labels = []
+        self._variant_results = []
+        self._variant_tile = None
+        
+        # Mensagens e progresso da thread de cálculo, consumidos em lote pela UI
+        self.progress_channel = ProgressChannel()
+        self._progress_job = None
+        
+        # Obter algoritmos disponíveis (os de múltiplos quadros exigem uma pilha e ficam de fora)
+        self.available_algorithms = [name for name in get_available_algorithms()
+                                     if not is_multi_frame(name)]
         
         self.setup_ui()
     
@@ -144,7 +199,60 @@ class DeconvolutionGUI:
         balance_entry = tk.Entry(self.wiener_frame, textvariable=self.balance_var, width=8, font=("Arial", 9))
         balance_entry.grid(row=0, column=1, padx=5, pady=5, sticky=tk.W)
 
+        # Peso da regularização para Tikhonov e TV-ADMM (vazio usa o padrão do algoritmo)
+        self.regularization_frame = tk.Frame(params_frame)
+        self.regularization_frame.grid(row=3, column=2, columnspan=2, sticky=tk.W)
+
+        tk.Label(self.regularization_frame, text="Regularização:", font=("Arial", 9)).grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+        self.regularization_var = tk.StringVar(value="")
+        regularization_entry = tk.Entry(self.regularization_frame, textvariable=self.regularization_var, width=8, font=("Arial", 9))
+        regularization_entry.grid(row=0, column=1, padx=5, pady=5, sticky=tk.W)
+
         algorithm_combo.bind("<<ComboboxSelected>>", self.on_algorithm_change)
+        
+        # Modo de cor: 'luminance' deconvolui apenas o canal Y de imagens coloridas (~3x mais rápido)
+        tk.Label(params_frame, text="Modo de cor:", font=("Arial", 9)).grid(row=1, column=2, padx=5, sticky=tk.W)
+        self.color_mode_var = tk.StringVar(value="rgb")
+        color_mode_combo = ttk.Combobox(
+            params_frame,
+            textvariable=self.color_mode_var,
+            values=["rgb", "luminance"],
+            state="readonly",
+            width=10,
+            font=("Arial", 9)
+        )
+        color_mode_combo.grid(row=1, column=3, padx=5)
+        
+        # Região de interesse (selecionada arrastando o mouse sobre a imagem original)
+        roi_frame = tk.Frame(params_frame)
+        roi_frame.grid(row=4, column=0, columnspan=4, sticky=tk.W)
+        
+        self.roi_label = tk.Label(roi_frame, text="ROI: imagem inteira (arraste sobre a original)",
+                                  font=("Arial", 9), fg="gray")
+        self.roi_label.grid(row=0, column=0, padx=5, sticky=tk.W)
+        tk.Button(roi_frame, text="Limpar ROI", command=self.clear_roi,
+                  font=("Arial", 8), padx=5, pady=1).grid(row=0, column=1, padx=5)
+        
+        # Grade de variantes: um parâmetro com vários valores, calculados concorrentemente
+        variants_frame = tk.Frame(params_frame)
+        variants_frame.grid(row=5, column=0, columnspan=4, sticky=tk.W)
+        
+        tk.Label(variants_frame, text="Variar:", font=("Arial", 9)).grid(row=0, column=0, padx=5, sticky=tk.W)
+        self.variant_param_var = tk.StringVar(value="sigma")
+        ttk.Combobox(
+            variants_frame,
+            textvariable=self.variant_param_var,
+            values=list(VARIANT_AXES),
+            state="readonly",
+            width=12,
+            font=("Arial", 9)
+        ).grid(row=0, column=1, padx=5)
+        self.variant_values_var = tk.StringVar(value="2, 3, 5, 7")
+        tk.Entry(variants_frame, textvariable=self.variant_values_var, width=16,
+                 font=("Arial", 9)).grid(row=0, column=2, padx=5)
+        self.variants_btn = tk.Button(variants_frame, text="Executar grade", command=self.execute_variants,
+                                      font=("Arial", 8), padx=5, pady=1, state=tk.DISABLED)
+        self.variants_btn.grid(row=0, column=3, padx=5)
 
         # Botão executar
         self.execute_btn = tk.Button(
@@ -168,6 +276,19 @@ class DeconvolutionGUI:
         images_frame = tk.Frame(main_content)
         images_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
         
+        # Controles de zoom (sincronizados entre as duas imagens)
+        zoom_frame = tk.Frame(images_frame)
+        zoom_frame.pack(side=tk.TOP, fill=tk.X, padx=5)
+        for text, command in (("Ajustar", self.zoom_fit), ("100%", self.zoom_actual),
+                              ("+", lambda: self.zoom_step(ZOOM_STEP)),
+                              ("-", lambda: self.zoom_step(1 / ZOOM_STEP))):
+            tk.Button(zoom_frame, text=text, command=command, font=("Arial", 8),
+                      padx=5, pady=1).pack(side=tk.LEFT, padx=2)
+        self.zoom_label = tk.Label(zoom_frame, text="Zoom: -", font=("Arial", 9))
+        self.zoom_label.pack(side=tk.LEFT, padx=10)
+        tk.Label(zoom_frame, text="roda do mouse: zoom | botão direito ou do meio: mover",
+                 font=("Arial", 8), fg="gray").pack(side=tk.LEFT)
+        
         # Frame para imagem original
         original_frame = tk.Frame(images_frame)
         original_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
@@ -175,6 +296,9 @@ class DeconvolutionGUI:
         tk.Label(original_frame, text="Imagem Original", font=("Arial", 10, "bold")).pack(pady=5)
         self.original_canvas = tk.Canvas(original_frame, bg="gray90", highlightthickness=1, highlightbackground="gray")
         self.original_canvas.pack(fill=tk.BOTH, expand=True)
+        self.original_canvas.bind("<ButtonPress-1>", self.on_roi_press)
+        self.original_canvas.bind("<B1-Motion>", self.on_roi_drag)
+        self.original_canvas.bind("<ButtonRelease-1>", self.on_roi_release)
         
         # Frame para imagem deconvoluída
         deconvolved_frame = tk.Frame(images_frame)
@@ -184,6 +308,16 @@ class DeconvolutionGUI:
         self.deconvolved_canvas = tk.Canvas(deconvolved_frame, bg="gray90", highlightthickness=1, highlightbackground="gray")
         self.deconvolved_canvas.pack(fill=tk.BOTH, expand=True)
         
+        for canvas in (self.original_canvas, self.deconvolved_canvas):
+            canvas.bind("<Configure>", lambda event: self._schedule_render())
+            canvas.bind("<MouseWheel>", self.on_zoom_wheel)  # Windows e macOS
+            canvas.bind("<Button-4>", self.on_zoom_wheel)  # X11
+            canvas.bind("<Button-5>", self.on_zoom_wheel)
+            for button in (2, 3):
+                canvas.bind(f"<ButtonPress-{button}>", self.on_pan_press)
+                canvas.bind(f"<B{button}-Motion>", self.on_pan_drag)
+                canvas.bind(f"<ButtonRelease-{button}>", self.on_pan_release)
+        
         # Frame para área de log
         log_frame = tk.Frame(main_content, width=300)
         log_frame.pack(side=tk.RIGHT, fill=tk.BOTH, padx=5)
@@ -191,6 +325,12 @@ class DeconvolutionGUI:
         
         tk.Label(log_frame, text="Log de Execução", font=("Arial", 10, "bold")).pack(pady=5)
         
+        # Barra e descrição do progresso da etapa atual
+        self.progress_bar = ttk.Progressbar(log_frame, mode="determinate", maximum=1.0)
+        self.progress_bar.pack(fill=tk.X, pady=(0, 2))
+        self.progress_label = tk.Label(log_frame, text="", font=("Arial", 8), fg="gray", anchor=tk.W)
+        self.progress_label.pack(fill=tk.X)
+        
         # Área de texto com scrollbar para logs
         self.log_text = scrolledtext.ScrolledText(
             log_frame,
@@ -243,8 +383,18 @@ class DeconvolutionGUI:
     
     def add_log_message(self, message):
         """Adiciona uma mensagem à área de log."""
+        self.add_log_messages([message])
+    
+    def add_log_messages(self, messages):
+        """Adiciona várias mensagens à área de log com uma única inserção."""
+        if not messages:
+            return
         self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, message + "\n")
+        self.log_text.insert(tk.END, "\n".join(messages) + "\n")
+        # Descartar as linhas mais antigas para manter o widget leve
+        lines = int(self.log_text.index("end-1c").split(".")[0])
+        if lines > LOG_MAX_LINES:
+            self.log_text.delete("1.0", f"{lines - LOG_MAX_LINES}.0")
         self.log_text.see(tk.END)  # Scroll para o final
         self.log_text.config(state=tk.DISABLED)
     
@@ -254,6 +404,54 @@ class DeconvolutionGUI:
         self.log_text.delete(1.0, tk.END)
         self.log_text.config(state=tk.DISABLED)
     
+    def _start_progress_polling(self):
+        """Reinicia a barra de progresso e passa a ler o canal em taxa fixa."""
+        self.progress_channel.drain()
+        self.progress_bar.stop()
+        self.progress_bar.config(mode="determinate", value=0)
+        self.progress_label.config(text="")
+        self._poll_progress()
+    
+    def _poll_progress(self):
+        self._drain_progress()
+        self._progress_job = self.root.after(PROGRESS_POLL_MS, self._poll_progress)
+    
+    def _stop_progress_polling(self):
+        """Para a leitura periódica e consome o que restou no canal."""
+        if self._progress_job is not None:
+            self.root.after_cancel(self._progress_job)
+            self._progress_job = None
+        self._drain_progress()
+        self.progress_bar.stop()
+    
+    def _drain_progress(self):
+        """Aplica à UI, de uma vez, as mensagens e o progresso acumulados no canal."""
+        messages, events, dropped = self.progress_channel.drain()
+        if dropped:
+            messages.insert(0, f"... {dropped} mensagens omitidas")
+        self.add_log_messages(messages)
+        if events:
+            self._show_progress(events[-1])
+        self._drain_variants()
+    
+    def _show_progress(self, event):
+        fraction = event.fraction
+        if fraction is None:
+            # Total desconhecido (por exemplo, sequências): barra indeterminada
+            if str(self.progress_bar.cget("mode")) != "indeterminate":
+                self.progress_bar.config(mode="indeterminate")
+                self.progress_bar.start(50)
+            text = f"{event.stage}: {event.iteration}"
+        else:
+            if str(self.progress_bar.cget("mode")) != "determinate":
+                self.progress_bar.stop()
+                self.progress_bar.config(mode="determinate")
+            self.progress_bar.config(value=fraction)
+            text = f"{event.stage}: {event.iteration}/{event.total}"
+        if event.residual is not None:
+            text += f" - resíduo {event.residual:.4g}"
+        self.progress_label.config(text=f"{text} ({event.elapsed:.1f}s)")
+    
     def on_blur_type_change(self, event=None):
         """Atualiza a interface quando o tipo de blur muda."""
         blur_type = self.blur_type_var.get()
@@ -269,7 +467,7 @@ class DeconvolutionGUI:
         file_path = filedialog.askopenfilename(
             title="Selecionar Imagem",
             filetypes=[
-                ("Imagens", "*.jpg *.jpeg *.png *.bmp *.tiff *.tif"),
+                ("Imagens", "*.jpg *.jpeg *.png *.bmp *.tiff *.tif *.npy"),
                 ("Todos os arquivos", "*.*")
             ]
         )
@@ -281,55 +479,220 @@ class DeconvolutionGUI:
             self.image_label.config(text=filename, fg="black")
             self.load_and_display_original()
             self.execute_btn.config(state=tk.NORMAL)
+            self.variants_btn.config(state=tk.NORMAL)
     
     def load_and_display_original(self):
         """Carrega e exibe a imagem original."""
         try:
-            img = Image.open(self.image_path)
-            if img.mode != 'RGB' and img.mode != 'L':
-                img = img.convert('RGB')
+            # Carregar na profundidade de bits original e normalizar para [0, 1]
+            self.original_image = load_image(self.image_path)
             
-            # Converter para array numpy e normalizar
-            self.original_image = np.array(img, dtype=np.float64) / 255.0
-            
-            # Exibir imagem
+            # Exibir imagem (uma nova imagem descarta a ROI, a visão e o resultado exibido anteriores)
+            self.roi = None
+            self._zoom = None
+            self._pyramids.pop(self.deconvolved_canvas, None)
+            self.deconvolved_canvas.delete("all")
             self.display_image(self.original_image, self.original_canvas)
+            self._update_roi_label()
             self.status_label.config(text="Imagem carregada com sucesso", fg="green")
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar imagem: {e}")
             self.status_label.config(text=f"Erro: {e}", fg="red")
     
     def display_image(self, image_array, canvas):
-        """Exibe uma imagem em um canvas."""
-        # Garantir que os valores estão no range [0, 1]
-        image_array = np.clip(image_array, 0, 1)
+        """Exibe uma imagem em um canvas (a pirâmide de exibição é construída uma única vez)."""
+        self._pyramids[canvas] = ImagePyramid(image_array)
+        canvas.tile_photos = {}
+        if self._zoom is None:
+            canvas.update_idletasks()
+            self._fit_view()
+        self._render_views()
+    
+    def _fit_view(self):
+        """Ajusta o zoom para que a imagem original caiba inteira no canvas."""
+        pyramid = self._pyramids.get(self.original_canvas)
+        if pyramid is None:
+            return
+        self._zoom = self._fit_zoom(pyramid)
+        self._center = (pyramid.width / 2, pyramid.height / 2)
+    
+    def _fit_zoom(self, pyramid):
+        canvas_width = self.original_canvas.winfo_width()
+        canvas_height = self.original_canvas.winfo_height()
+        if canvas_width <= 1 or canvas_height <= 1:
+            return 1.0
+        return min(canvas_width / pyramid.width, canvas_height / pyramid.height, 1.0)
+    
+    def _schedule_render(self):
+        """Agenda uma única renderização para quando a fila de eventos esvaziar."""
+        if not self._render_pending:
+            self._render_pending = True
+            self.root.after_idle(self._render_views)
+    
+    def _render_views(self):
+        self._render_pending = False
+        for canvas in (self.original_canvas, self.deconvolved_canvas):
+            self._render_canvas(canvas)
+        if self._zoom is not None:
+            self.zoom_label.config(text=f"Zoom: {self._zoom * 100:.0f}%")
+    
+    def _render_canvas(self, canvas):
+        """Desenha apenas os blocos visíveis da imagem do canvas na visão atual."""
+        pyramid = self._pyramids.get(canvas)
+        canvas.delete("image")
+        if pyramid is None or self._zoom is None:
+            return
+        
+        # Guardar a transformação imagem -> canvas (o centro da visão fica no centro do canvas)
+        canvas_width, canvas_height = canvas.winfo_width(), canvas.winfo_height()
+        offset_x = round(canvas_width / 2 - self._center[0] * self._zoom)
+        offset_y = round(canvas_height / 2 - self._center[1] * self._zoom)
+        self._display_transforms[canvas] = (self._zoom, offset_x, offset_y)
         
-        # Converter para uint8
-        image_array = (image_array * 255).astype(np.uint8)
+        # Reaproveitar os PhotoImage dos blocos que continuam visíveis (pan)
+        previous = canvas.tile_photos
+        photos = {}
+        for col, row, x, y in pyramid.visible_tiles(self._zoom, -offset_x, -offset_y,
+                                                    canvas_width, canvas_height):
+            key = (self._zoom, col, row)
+            photo = previous.get(key)
+            if photo is None:
+                photo = ImageTk.PhotoImage(pyramid.tile(self._zoom, col, row))
+            photos[key] = photo
+            canvas.create_image(offset_x + x, offset_y + y, image=photo, anchor=tk.NW, tags="image")
+        canvas.tile_photos = photos  # Manter referências
         
-        # Converter para PIL Image
-        if len(image_array.shape) == 3:
-            img = Image.fromarray(image_array, 'RGB')
+        if canvas is self.original_canvas:
+            self._draw_roi()
+    
+    def _set_view(self, zoom, center):
+        """Aplica zoom e centro (limitados à imagem) às duas imagens."""
+        pyramid = self._pyramids.get(self.original_canvas)
+        if pyramid is None:
+            return
+        self._zoom = float(np.clip(zoom, min(self._fit_zoom(pyramid), 1.0), MAX_ZOOM))
+        self._center = (float(np.clip(center[0], 0, pyramid.width)),
+                        float(np.clip(center[1], 0, pyramid.height)))
+        self._schedule_render()
+    
+    def _zoom_at(self, canvas, factor, x, y):
+        """Multiplica o zoom por factor mantendo fixo o ponto (x, y) do canvas."""
+        if self._zoom is None:
+            return
+        image_x, image_y = self._canvas_to_image(canvas, x, y)
+        pyramid = self._pyramids[self.original_canvas]
+        zoom = float(np.clip(self._zoom * factor, min(self._fit_zoom(pyramid), 1.0), MAX_ZOOM))
+        self._set_view(zoom, (image_x - (x - canvas.winfo_width() / 2) / zoom,
+                              image_y - (y - canvas.winfo_height() / 2) / zoom))
+    
+    def zoom_step(self, factor):
+        """Aplica um passo de zoom em torno do centro da visão."""
+        canvas = self.original_canvas
+        self._zoom_at(canvas, factor, canvas.winfo_width() / 2, canvas.winfo_height() / 2)
+    
+    def zoom_fit(self):
+        """Volta a exibir a imagem inteira."""
+        self._fit_view()
+        self._schedule_render()
+    
+    def zoom_actual(self):
+        """Exibe a imagem em 100% (um pixel da imagem por pixel da tela)."""
+        if self._zoom is not None:
+            self._set_view(1.0, self._center)
+    
+    def on_zoom_wheel(self, event):
+        """Zoom com a roda do mouse em torno do cursor."""
+        zoom_in = event.num == 4 or getattr(event, "delta", 0) > 0
+        self._zoom_at(event.widget, ZOOM_STEP if zoom_in else 1 / ZOOM_STEP, event.x, event.y)
+    
+    def on_pan_press(self, event):
+        """Inicia o deslocamento (pan) da visão."""
+        if self._zoom is not None:
+            self._pan_start = (event.x, event.y, self._center)
+    
+    def on_pan_drag(self, event):
+        """Desloca as duas imagens acompanhando o mouse."""
+        if self._pan_start is None:
+            return
+        start_x, start_y, (center_x, center_y) = self._pan_start
+        self._set_view(self._zoom, (center_x - (event.x - start_x) / self._zoom,
+                                    center_y - (event.y - start_y) / self._zoom))
+    
+    def on_pan_release(self, event):
+        self._pan_start = None
+    
+    def _canvas_to_image(self, canvas, x, y):
+        """Converte coordenadas do canvas em coordenadas (coluna, linha) da imagem."""
+        scale, offset_x, offset_y = self._display_transforms.get(canvas, (1.0, 0, 0))
+        return (x - offset_x) / scale, (y - offset_y) / scale
+    
+    def _image_to_canvas(self, canvas, x, y):
+        """Converte coordenadas (coluna, linha) da imagem em coordenadas do canvas."""
+        scale, offset_x, offset_y = self._display_transforms.get(canvas, (1.0, 0, 0))
+        return x * scale + offset_x, y * scale + offset_y
+    
+    def on_roi_press(self, event):
+        """Inicia a seleção da ROI (rubber band) sobre a imagem original."""
+        if self.original_image is None:
+            return
+        self._roi_start = (event.x, event.y)
+        self.original_canvas.delete("roi")
+    
+    def on_roi_drag(self, event):
+        """Atualiza o retângulo de seleção enquanto o mouse é arrastado."""
+        if self._roi_start is None:
+            return
+        self.original_canvas.delete("roi")
+        self.original_canvas.create_rectangle(
+            *self._roi_start, event.x, event.y, outline="#ff3b30", width=2, dash=(4, 2), tags="roi"
+        )
+    
+    def on_roi_release(self, event):
+        """Finaliza a seleção e converte o retângulo para pixels da imagem."""
+        if self._roi_start is None:
+            return
+        x0, y0 = self._canvas_to_image(self.original_canvas, *self._roi_start)
+        x1, y1 = self._canvas_to_image(self.original_canvas, event.x, event.y)
+        self._roi_start = None
+        
+        height, width = self.original_image.shape[:2]
+        left = int(np.clip(np.floor(min(x0, x1)), 0, width))
+        top = int(np.clip(np.floor(min(y0, y1)), 0, height))
+        right = int(np.clip(np.ceil(max(x0, x1)), 0, width))
+        bottom = int(np.clip(np.ceil(max(y0, y1)), 0, height))
+        
+        # Cliques sem arrasto (ou fora da imagem) não definem uma ROI
+        if right - left < 2 or bottom - top < 2:
+            self.roi = None
+        else:
+            self.roi = (left, top, right - left, bottom - top)
+        self._draw_roi()
+        self._update_roi_label()
+    
+    def clear_roi(self):
+        """Remove a ROI, voltando a deconvoluir a imagem inteira."""
+        self.roi = None
+        self._draw_roi()
+        self._update_roi_label()
+    
+    def _draw_roi(self):
+        """Desenha a ROI atual sobre a imagem original."""
+        self.original_canvas.delete("roi")
+        if self.roi is None:
+            return
+        x, y, w, h = self.roi
+        self.original_canvas.create_rectangle(
+            *self._image_to_canvas(self.original_canvas, x, y),
+            *self._image_to_canvas(self.original_canvas, x + w, y + h),
+            outline="#ff3b30", width=2, tags="roi"
+        )
+    
+    def _update_roi_label(self):
+        if self.roi is None:
+            self.roi_label.config(text="ROI: imagem inteira (arraste sobre a original)", fg="gray")
         else:
-            img = Image.fromarray(image_array, 'L')
-        
-        # Redimensionar para caber no canvas mantendo aspect ratio
-        canvas.update_idletasks()
-        canvas_width = canvas.winfo_width()
-        canvas_height = canvas.winfo_height()
-        
-        if canvas_width > 1 and canvas_height > 1:
-            img_width, img_height = img.size
-            scale = min(canvas_width / img_width, canvas_height / img_height, 1.0)
-            new_width = int(img_width * scale)
-            new_height = int(img_height * scale)
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
-        # Converter para PhotoImage e exibir
-        photo = ImageTk.PhotoImage(img)
-        canvas.delete("all")
-        canvas.create_image(canvas_width // 2, canvas_height // 2, image=photo, anchor=tk.CENTER)
-        canvas.image = photo  # Manter referência
+            x, y, w, h = self.roi
+            self.roi_label.config(text=f"ROI: x={x}, y={y}, {w}x{h}", fg="black")
     
     def execute_deconvolution(self):
         """Executa a deconvolução em uma thread separada."""
@@ -339,35 +702,7 @@ class DeconvolutionGUI:
         
         # Validar parâmetros
         try:
-            blur_type = self.blur_type_var.get()
-            algorithm_name = self.algorithm_var.get()
-            algo_params = {}
-            
-            if blur_type == "gaussian":
-                size = int(self.size_var.get())
-                sigma = float(self.sigma_var.get())
-                if size <= 0 or sigma <= 0:
-                    raise ValueError("Tamanho e sigma devem ser positivos")
-            else:  # motion
-                size = int(self.motion_size_var.get())
-                length = float(self.length_var.get())
-                angle = float(self.angle_var.get())
-                if size <= 0 or length <= 0:
-                    raise ValueError("Tamanho e comprimento devem ser positivos")
-            
-            # Validar parâmetros específicos do algoritmo
-            if algorithm_name == "richardson_lucy":
-                iterations = int(self.iterations_var.get())
-                if iterations <= 0:
-                    raise ValueError("Iterações devem ser positivas")
-                algo_params['num_iterations'] = iterations
-            elif algorithm_name == "wiener":
-                try:
-                    balance = float(self.balance_var.get())
-                    algo_params['balance'] = balance
-                except ValueError:
-                    raise ValueError("Balance deve ser um número válido")
-
+            blur_type, algorithm_name, psf_params, algo_params = self._read_parameters()
         except ValueError as e:
             messagebox.showerror("Erro", f"Parâmetros inválidos: {e}")
             return
@@ -382,12 +717,219 @@ class DeconvolutionGUI:
         self.add_log_message(f"Iniciando deconvolução com algoritmo: {algorithm_name}")
         self.add_log_message(f"Tipo de blur: {blur_type}")
         self.add_log_message("=" * 50)
+        self._start_progress_polling()
         
         # Executar em thread separada para não travar a UI
-        thread = threading.Thread(target=self._deconvolve_thread, args=(blur_type, algorithm_name, algo_params))
+        thread = threading.Thread(target=self._deconvolve_thread,
+                                  args=(blur_type, algorithm_name, psf_params, algo_params))
         thread.daemon = True
         thread.start()
+    
+    def _read_parameters(self):
+        """
+        Lê e valida os parâmetros da interface.
+        
+        Returns:
+            Tupla (blur_type, algorithm_name, psf_params, algo_params)
+        
+        Raises:
+            ValueError: Se algum parâmetro for inválido
+        """
+        blur_type = self.blur_type_var.get()
+        algorithm_name = self.algorithm_var.get()
+        algo_params = {'color_mode': self.color_mode_var.get()}
+        
+        if blur_type == "gaussian":
+            psf_params = {'size': int(self.size_var.get()), 'sigma': float(self.sigma_var.get())}
+            if psf_params['size'] <= 0 or psf_params['sigma'] <= 0:
+                raise ValueError("Tamanho e sigma devem ser positivos")
+        else:  # motion
+            psf_params = {
+                'size': int(self.motion_size_var.get()),
+                'length': float(self.length_var.get()),
+                'angle': float(self.angle_var.get()),
+            }
+            if psf_params['size'] <= 0 or psf_params['length'] <= 0:
+                raise ValueError("Tamanho e comprimento devem ser positivos")
+        
+        # Validar parâmetros específicos do algoritmo
+        if algorithm_name in ITERATIVE_ALGORITHMS:
+            iterations = int(self.iterations_var.get())
+            if iterations <= 0:
+                raise ValueError("Iterações devem ser positivas")
+            algo_params['num_iterations'] = iterations
+        if algorithm_name in REGULARIZED_ALGORITHMS:
+            regularization_text = self.regularization_var.get().strip()
+            if regularization_text:
+                try:
+                    algo_params['regularization'] = float(regularization_text)
+                except ValueError:
+                    raise ValueError("Regularização deve ser um número válido (ou vazia para o padrão)")
+        if algorithm_name == "wiener":
+            balance_text = self.balance_var.get().strip()
+            if balance_text.lower() == "auto":
+                algo_params['balance'] = 'auto'
+            else:
+                try:
+                    balance = float(balance_text)
+                    algo_params['balance'] = balance
+                except ValueError:
+                    raise ValueError("Balance deve ser um número válido ou 'auto'")
+        
+        return blur_type, algorithm_name, psf_params, algo_params
+
 
+    def execute_variants(self):
+        """Deconvolui uma grade de variantes de um parâmetro em uma thread separada."""
+        if self.original_image is None:
+            messagebox.showwarning("Aviso", "Por favor, selecione uma imagem primeiro.")
+            return
+        
+        try:
+            blur_type, algorithm_name, psf_params, algo_params = self._read_parameters()
+            base = dict(psf_params, clip=True, **algo_params)
+            label = self.variant_param_var.get()
+            name = VARIANT_AXES[label]
+            if name not in base:
+                raise ValueError(f"'{label}' não se aplica a {algorithm_name} com blur {blur_type}")
+            axes = {name: parse_values(self.variant_values_var.get())}
+            variants = expand_variants(base, axes)
+        except ValueError as e:
+            messagebox.showerror("Erro", f"Parâmetros inválidos: {e}")
+            return
+        
+        labels = [variant_label(params, axes) for params in variants]
+        self.execute_btn.config(state=tk.DISABLED)
+        self.variants_btn.config(state=tk.DISABLED, text="Processando...")
+        self.status_label.config(text=f"Processando {len(variants)} variantes com {algorithm_name}...", fg="blue")
+        
+        self.clear_log()
+        self.add_log_message("=" * 50)
+        self.add_log_message(f"Grade de {len(variants)} variantes de '{label}' com {algorithm_name}")
+        self.add_log_message("=" * 50)
+        self._open_variants_window(labels)
+        self._start_progress_polling()
+        
+        thread = threading.Thread(target=self._variants_thread,
+                                  args=(blur_type, algorithm_name, variants))
+        thread.daemon = True
+        thread.start()
+    
+    def _variants_thread(self, blur_type, algorithm_name, variants):
+        """Calcula as variantes concorrentemente, entregando cada uma assim que termina."""
+        try:
+            logger = DeconvolutionLogger(callback=self.progress_channel.post_message)
+            
+            # Todas as variantes compartilham a mesma imagem (ou região da ROI)
+            jobs = variant_jobs(self.original_image, blur_type, algorithm_name, variants)
+            tile = None
+            if self.roi is not None:
+                largest_psf = max((psf.shape for _, psf, _ in jobs), key=max)
+                tile = roi_tile(self.original_image.shape, self.roi, largest_psf)
+                region = self.original_image[tile.outer]
+                jobs = [(region, psf, params) for _, psf, params in jobs]
+            self._variant_tile = tile
+            
+            total = len(jobs)
+            start = time.perf_counter()
+            
+            def on_result(progress):
+                # Miniatura gerada aqui para não ocupar a thread da interface
+                thumbnail = make_thumbnail(progress.result) if progress.ok else None
+                self._variant_queue.put((progress, thumbnail))
+                self.progress_channel.post_progress(
+                    ProgressEvent("variantes", progress.completed, total, elapsed=time.perf_counter() - start)
+                )
+            
+            run_variants(jobs, max_workers=min(total, os.cpu_count() or 1), logger=logger, on_result=on_result)
+            self.root.after(0, self._update_ui_after_variants, None)
+        except Exception as e:
+            error_msg = str(e)
+            self.progress_channel.post_message(f"ERRO: {error_msg}")
+            self.root.after(0, self._update_ui_after_variants, error_msg)
+    
+    def _open_variants_window(self, labels):
+        """Abre (ou recria) a janela com uma célula por variante."""
+        if self._variants_window is not None and self._variants_window.winfo_exists():
+            self._variants_window.destroy()
+        window = tk.Toplevel(self.root)
+        window.title("Variantes (clique para exibir)")
+        self._variants_window = window
+        
+        self._variant_labels = labels
+        self._variant_results = [None] * len(labels)
+        self._variant_cells = []
+        placeholder = tk.PhotoImage(width=THUMBNAIL_SIZE, height=THUMBNAIL_SIZE)
+        columns = math.ceil(math.sqrt(len(labels)))
+        for index, label in enumerate(labels):
+            cell = tk.Label(window, text=f"{label}\ncalculando...", image=placeholder, compound=tk.TOP,
+                            font=("Arial", 9), relief=tk.GROOVE, bd=2, cursor="hand2")
+            cell.image = placeholder
+            cell.grid(row=index // columns, column=index % columns, padx=4, pady=4)
+            cell.bind("<Button-1>", lambda event, i=index: self.promote_variant(i))
+            self._variant_cells.append(cell)
+    
+    def _drain_variants(self):
+        """Preenche as miniaturas das variantes que terminaram."""
+        while True:
+            try:
+                progress, thumbnail = self._variant_queue.get_nowait()
+            except queue.Empty:
+                return
+            index = progress.index
+            if index >= len(self._variant_results):
+                continue
+            if progress.ok:
+                self._variant_results[index] = progress.result
+            cell = self._variant_cells[index]
+            if not cell.winfo_exists():
+                continue
+            label = self._variant_labels[index]
+            if progress.ok:
+                photo = ImageTk.PhotoImage(thumbnail)
+                cell.config(image=photo, text=f"{label}\n{progress.elapsed:.1f}s")
+                cell.image = photo  # Manter referência
+            else:
+                cell.config(text=f"{label}\nerro: {progress.error}", fg="red")
+    
+    def promote_variant(self, index):
+        """Exibe o resultado de uma variante como imagem deconvoluída, sem recalculá-lo."""
+        result = self._variant_results[index]
+        if result is None:
+            return
+        tile = self._variant_tile
+        if tile is None:
+            self.deconvolved_image = result
+        else:
+            # Resultado da ROI colado em uma cópia da original (como em deconvolve_roi)
+            output = to_float(np.asarray(self.original_image),
+                              out=np.empty(self.original_image.shape, dtype=np.float64))
+            output[tile.inner] = result[tile.local]
+            self.deconvolved_image = output
+        
+        for i, cell in enumerate(self._variant_cells):
+            if cell.winfo_exists():
+                cell.config(relief=tk.SOLID if i == index else tk.GROOVE)
+        self.display_image(self.deconvolved_image, self.deconvolved_canvas)
+        self.save_deconvolved_btn.config(state=tk.NORMAL)
+        self.status_label.config(text=f"Variante exibida: {self._variant_labels[index]}", fg="green")
+    
+    def _update_ui_after_variants(self, error_msg):
+        """Atualiza a UI após o cálculo da grade de variantes."""
+        self._stop_progress_polling()
+        if error_msg is None:
+            self.progress_bar.config(mode="determinate", value=1.0)
+            done = sum(result is not None for result in self._variant_results)
+            self.status_label.config(
+                text=f"{done}/{len(self._variant_results)} variantes concluídas - clique em uma miniatura para exibi-la",
+                fg="green"
+            )
+        else:
+            messagebox.showerror("Erro", f"Erro durante as variantes: {error_msg}")
+            self.status_label.config(text=f"Erro: {error_msg}", fg="red")
+        
+        self.execute_btn.config(state=tk.NORMAL)
+        self.variants_btn.config(state=tk.NORMAL, text="Executar grade")
 
     def save_deconvolved_image(self):
         """Salva a imagem deconvoluída em um arquivo no diretório"""
@@ -409,55 +951,56 @@ class DeconvolutionGUI:
 
         if file_path:
             try:
-                # Garantir que os valores estão no range [0, 1]
-                image_array = np.clip(self.deconvolved_image, 0, 1)
-                
-                # Converter para uint8
-                image_array = (image_array * 255).astype(np.uint8)
-                
-                # Converter para PIL Image
-                if len(image_array.shape) == 3:
-                    img = Image.fromarray(image_array, 'RGB')
-                else:
-                    img = Image.fromarray(image_array, 'L')
-                
-                # Salvar imagem
-                img.save(file_path)
+                save_image(self.deconvolved_image, file_path)
                 messagebox.showinfo("Sucesso", f"Imagem deconvoluída salva em:\n{file_path}")
             except Exception as e:
                 messagebox.showerror("Erro", f"Erro ao salvar imagem: {e}")
     
-    def _deconvolve_thread(self, blur_type, algorithm_name, algo_params):
+    def _deconvolve_thread(self, blur_type, algorithm_name, psf_params, algo_params):
         """Executa a deconvolução em uma thread separada."""
         try:
-            # Criar logger com callback para atualizar a UI
-            logger = DeconvolutionLogger(callback=lambda msg: self.root.after(0, self.add_log_message, msg))
+            # Logger publica no canal de progresso; a UI o consome em lote (_poll_progress)
+            logger = DeconvolutionLogger(
+                callback=self.progress_channel.post_message,
+                progress_callback=self.progress_channel.post_progress
+            )
             
             # Gerar PSF
             logger.info(f"Gerando PSF do tipo '{blur_type}'...")
+            psf = make_psf(blur_type, psf_params)
             if blur_type == "gaussian":
-                size = int(self.size_var.get())
-                sigma = float(self.sigma_var.get())
-                psf = generate_gaussian_psf(size, sigma)
-                logger.info(f"PSF gaussiana: tamanho={size}, sigma={sigma}")
+                logger.info(f"PSF gaussiana: tamanho={psf_params['size']}, sigma={psf_params['sigma']}")
             else:  # motion
-                size = int(self.motion_size_var.get())
-                length = float(self.length_var.get())
-                angle = float(self.angle_var.get())
-                psf = generate_motion_psf(size, length, angle)
-                logger.info(f"PSF de movimento: tamanho={size}, comprimento={length}, ângulo={angle}°")
+                logger.info(f"PSF de movimento: tamanho={psf_params['size']}, "
+                            f"comprimento={psf_params['length']}, ângulo={psf_params['angle']}°")
+            if psf.shape[0] != psf_params['size'] or psf.shape[1] != psf_params['size']:
+                logger.info(f"PSF recortada ao suporte real: {psf.shape[0]}x{psf.shape[1]}")
             
             # Aplicar deconvolução
             logger.info(f"Parâmetros: {algo_params}, clipping ativado")
             
-            deconvolved = deconvolve(
-                self.original_image,
-                psf,
-                algorithm_name=algorithm_name,
-                clip=True,
-                logger=logger,
-                **algo_params
-            )
+            # Canais RGB processados em paralelo (FFTs liberam o GIL)
+            algo_params['threads'] = min(3, os.cpu_count() or 1)
+            if self.roi is not None:
+                # Apenas a ROI (mais uma margem) é deconvoluída e colada na original
+                deconvolved = deconvolve_roi(
+                    self.original_image,
+                    psf,
+                    self.roi,
+                    algorithm_name=algorithm_name,
+                    clip=True,
+                    logger=logger,
+                    **algo_params
+                )
+            else:
+                deconvolved = deconvolve(
+                    self.original_image,
+                    psf,
+                    algorithm_name=algorithm_name,
+                    clip=True,
+                    logger=logger,
+                    **algo_params
+                )
             
             self.deconvolved_image = deconvolved
             
@@ -465,12 +1008,14 @@ class DeconvolutionGUI:
             self.root.after(0, self._update_ui_after_deconvolution, True, None)
         except Exception as e:
             error_msg = str(e)
-            self.root.after(0, lambda: self.add_log_message(f"ERRO: {error_msg}"))
+            self.progress_channel.post_message(f"ERRO: {error_msg}")
             self.root.after(0, self._update_ui_after_deconvolution, False, error_msg)
     
     def _update_ui_after_deconvolution(self, success, error_msg):
         """Atualiza a UI após a deconvolução."""
+        self._stop_progress_polling()
         if success:
+            self.progress_bar.config(mode="determinate", value=1.0)
             self.display_image(self.deconvolved_image, self.deconvolved_canvas)
             self.status_label.config(text="Deconvolução concluída com sucesso!", fg="green")
             self.save_deconvolved_btn.config(state=tk.NORMAL)
@@ -493,9 +1038,12 @@ class DeconvolutionGUI:
         # 2. Mostrar/Esconder Frames
         self.lucy_frame.grid_remove()
         self.wiener_frame.grid_remove()
+        self.regularization_frame.grid_remove()
         
-        if algo_name == "richardson_lucy":
+        if algo_name in ITERATIVE_ALGORITHMS:
             self.lucy_frame.grid()
+        if algo_name in REGULARIZED_ALGORITHMS:
+            self.regularization_frame.grid()
         elif algo_name == "wiener":
             self.wiener_frame.grid()
 
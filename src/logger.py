@@ -3,25 +3,131 @@ Sistema de logging customizado para deconvolução.
 """
 
 import logging
+import threading
+import time
+from collections import OrderedDict, deque
 from typing import Optional, Callable
 from datetime import datetime
 
 
+class ProgressEvent:
+    """
+    Evento de progresso de uma etapa do processamento.
+
+    Attributes:
+        stage: Nome da etapa, como 'richardson_lucy' ou 'blocos' (str)
+        iteration: Passo atual da etapa (int)
+        total: Número total de passos da etapa (int ou None se desconhecido)
+        residual: Resíduo da iteração atual, quando disponível (float ou None)
+        elapsed: Tempo decorrido desde a criação do logger, em segundos (float)
+    """
+
+    def __init__(self, stage, iteration, total=None, residual=None, elapsed=0.0):
+        self.stage = stage
+        self.iteration = iteration
+        self.total = total
+        self.residual = residual
+        self.elapsed = elapsed
+
+    @property
+    def fraction(self):
+        """Fração concluída da etapa entre 0 e 1 (None se o total for desconhecido)."""
+        if self.total is None:
+            return None
+        if self.total <= 0:
+            return 1.0
+        return min(1.0, self.iteration / self.total)
+
+    @property
+    def done(self):
+        """True se o último passo da etapa foi atingido."""
+        return self.total is not None and self.iteration >= self.total
+
+    def __repr__(self):
+        residual = f", resíduo={self.residual:.4g}" if self.residual is not None else ""
+        return f"ProgressEvent({self.stage}, {self.iteration}/{self.total}{residual}, {self.elapsed:.2f}s)"
+
+
+class ProgressChannel:
+    """
+    Canal thread-safe entre a thread de cálculo e a interface gráfica.
+
+    As mensagens são acumuladas e os eventos de progresso são coalescidos
+    (apenas o mais recente de cada etapa é mantido). A interface consome o
+    canal em lote com drain(), em uma taxa fixa, em vez de agendar um
+    callback do Tk para cada mensagem.
+    """
+
+    def __init__(self, max_messages=1000):
+        """
+        Inicializa o canal.
+
+        Args:
+            max_messages: Número máximo de mensagens pendentes; as mais antigas
+                são descartadas se o consumidor não acompanhar (int, padrão: 1000)
+        """
+        self._lock = threading.Lock()
+        self._messages = deque(maxlen=max_messages)
+        self._events = OrderedDict()
+        self._dropped = 0
+
+    def post_message(self, message: str):
+        """Adiciona uma mensagem de log ao canal."""
+        with self._lock:
+            if len(self._messages) == self._messages.maxlen:
+                self._dropped += 1
+            self._messages.append(message)
+
+    def post_progress(self, event: ProgressEvent):
+        """Publica um evento de progresso, substituindo o anterior da mesma etapa."""
+        with self._lock:
+            self._events.pop(event.stage, None)
+            self._events[event.stage] = event
+
+    def drain(self):
+        """
+        Retira tudo o que está pendente no canal.
+
+        Returns:
+            Tupla (messages, events, dropped): lista de mensagens em ordem,
+            lista com o evento mais recente de cada etapa (o último é o mais
+            recente de todos) e número de mensagens descartadas
+        """
+        with self._lock:
+            messages = list(self._messages)
+            events = list(self._events.values())
+            dropped = self._dropped
+            self._messages.clear()
+            self._events.clear()
+            self._dropped = 0
+        return messages, events, dropped
+
+
 class DeconvolutionLogger:
     """
     Logger customizado para algoritmos de deconvolução.
     Permite callbacks para atualização em tempo real na interface gráfica.
     """
     
-    def __init__(self, callback: Optional[Callable[[str], None]] = None):
+    def __init__(self, callback: Optional[Callable[[str], None]] = None,
+                 progress_callback: Optional[Callable[[ProgressEvent], None]] = None,
+                 progress_interval: float = 0.05):
         """
         Inicializa o logger.
         
         Args:
             callback: Função opcional que será chamada para cada mensagem de log
+            progress_callback: Função opcional que recebe eventos de progresso (ProgressEvent)
+            progress_interval: Intervalo mínimo em segundos entre eventos de
+                progresso de uma mesma etapa; eventos intermediários são
+                descartados, mas o último passo de cada etapa é sempre entregue
         """
         self.callback = callback
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
         self.messages = []
+        self._start = time.perf_counter()
+        self._last_progress = {}
     
     def info(self, message: str):
         """Registra uma mensagem de informação."""
@@ -55,6 +161,30 @@ class DeconvolutionLogger:
         if self.callback:
             self.callback(log_message)
     
+    def progress(self, stage: str, iteration: int, total: Optional[int] = None,
+                 residual: Optional[float] = None):
+        """
+        Registra o progresso de uma etapa.
+
+        Sem progress_callback a chamada não faz nada, de modo que os
+        algoritmos podem reportar cada iteração sem custo.
+
+        Args:
+            stage: Nome da etapa (str)
+            iteration: Passo atual (int)
+            total: Número total de passos (int ou None)
+            residual: Resíduo da iteração, se disponível (float ou None)
+        """
+        if self.progress_callback is None:
+            return
+        now = time.perf_counter()
+        last = self._last_progress.get(stage)
+        final = total is not None and iteration >= total
+        if not final and last is not None and now - last < self.progress_interval:
+            return
+        self._last_progress[stage] = now
+        self.progress_callback(ProgressEvent(stage, iteration, total, residual, now - self._start))
+    
     def get_messages(self):
         """Retorna todas as mensagens de log."""
         return self.messages
@@ -62,4 +192,3 @@ class DeconvolutionLogger:
     def clear(self):
         """Limpa todas as mensagens de log."""
         self.messages = []
-
@@ -4,13 +4,11 @@ Aplicação de linha de comando para deconvolução de imagens.
 
 import argparse
 import sys
-from .psf_generator import generate_gaussian_psf, generate_motion_psf
-from .deconvolution import deconvolve, get_available_algorithms
-from .utils import load_image, save_image
+from .algorithms import list_algorithms
 
 
 def main():
-    algorithms = get_available_algorithms()
+    algorithms = list_algorithms()
     
     parser = argparse.ArgumentParser(
         description='Aplicação de deconvolução de imagens',
@@ -22,6 +20,15 @@ Exemplos de uso:
   
   # Deconvolução com blur de movimento:
   python -m src.main --image input.jpg --blur-type motion --size 20 --length 10 --angle 45 --algorithm richardson_lucy --iterations 30 --output output.jpg
+  
+  # Deconvolução apenas de uma região (x,y,largura,altura), colada de volta na imagem:
+  python -m src.main --image input.jpg --blur-type gaussian --size 15 --sigma 5.0 --roi 120,80,200,100 --output output.jpg
+  
+  # Deconvolução de um volume 3-D (z-stack) com PSF gaussiana 3-D:
+  python -m src.main --volume --image stack.tif --blur-type gaussian --size 9 --sigma 1.5 --size-z 7 --sigma-z 3.0 --output saida.npy
+  
+  # Deconvolução de uma sequência de quadros (diretório ou TIFF multipágina):
+  python -m src.main --sequence --image quadros/ --blur-type gaussian --size 15 --sigma 5.0 --iterations 10 --output saida/
 
 Algoritmos disponíveis: {', '.join(algorithms)}
         """
@@ -29,17 +36,18 @@ Algoritmos disponíveis: {', '.join(algorithms)}
     
     # Argumentos obrigatórios
     parser.add_argument('--image', '-i', required=True,
-                        help='Caminho para a imagem de entrada')
+                        help='Caminho para a imagem de entrada (ou diretório/TIFF multipágina com --sequence; '
+                             'pilha .npy/TIFF multipágina de quadros com joint_richardson_lucy)')
     
-    parser.add_argument('--blur-type', '-t', required=True,
+    parser.add_argument('--blur-type', '-t',
                         choices=['gaussian', 'motion'],
-                        help='Tipo de blur: gaussian ou motion')
+                        help='Tipo de blur: gaussian ou motion (obrigatório se --psf não for usado)')
     
-    parser.add_argument('--size', '-s', type=int, required=True,
-                        help='Tamanho do kernel PSF (em pixels)')
+    parser.add_argument('--size', '-s', type=int,
+                        help='Tamanho do kernel PSF (em pixels, obrigatório se --psf não for usado)')
     
     parser.add_argument('--output', '-o', required=True,
-                        help='Caminho para salvar a imagem deconvoluída')
+                        help='Caminho para salvar a imagem deconvoluída (diretório com --sequence)')
     
     # Argumentos opcionais
     parser.add_argument('--algorithm', '-a', type=str, default='richardson_lucy',
@@ -58,47 +66,452 @@ Algoritmos disponíveis: {', '.join(algorithms)}
     parser.add_argument('--iterations', '-n', type=int, default=30,
                         help='Número de iterações do algoritmo (padrão: 30)')
     
+    parser.add_argument('--stopping', choices=['fixed', 'discrepancy'], default='fixed',
+                        help="Critério de parada do Richardson-Lucy: 'fixed' executa --iterations iterações; "
+                             "'discrepancy' para quando o resíduo atinge o nível de ruído, usando --iterations como máximo (padrão: fixed)")
+    
+    parser.add_argument('--noise-sigma', type=float,
+                        help='Com --stopping discrepancy, desvio padrão do ruído (padrão: estimado a partir da imagem)')
+    
+    parser.add_argument('--balance', default='0.01',
+                        help="Parâmetro de equilíbrio K do Wiener (padrão: 0.01). Use 'auto' para estimá-lo a partir da imagem")
+    
+    parser.add_argument('--regularization', type=float,
+                        help='Peso da regularização do tikhonov e do tv_admm (padrão: 0.01 e 0.002)')
+    
+    parser.add_argument('--scales', type=int, default=1,
+                        help='Com blind_richardson_lucy, níveis da estimativa coarse-to-fine da PSF (padrão: 1)')
+    
+    parser.add_argument('--working-size', type=int, default=512,
+                        help='Com blind_richardson_lucy, lado máximo em pixels da imagem usada para estimar '
+                             'a PSF (padrão: 512)')
+    
+    parser.add_argument('--psf-output',
+                        help='Com blind_richardson_lucy, salva a PSF estimada neste arquivo .npy')
+    
     parser.add_argument('--no-clip', action='store_true',
                         help='Não limita os valores entre 0 e 1 após deconvolução')
     
+    parser.add_argument('--color-mode', choices=['rgb', 'luminance'], default='rgb',
+                        help="Para imagens coloridas: 'rgb' deconvolui os três canais; 'luminance' deconvolui "
+                             "apenas a luminância (YCbCr), cerca de 3x mais rápido (padrão: rgb)")
+    
+    parser.add_argument('--psf',
+                        help='Caminho para uma PSF medida (.npy ou imagem), usada no lugar de --blur-type '
+                             '(com joint_richardson_lucy, .npy com uma PSF por quadro (N, kh, kw))')
+    
+    parser.add_argument('--psf-energy', type=float, default=0.999,
+                        help='Fração da energia mantida ao recortar a PSF (medida ou gerada) ao seu suporte; '
+                             'PSFs medidas também são centralizadas no centroide (padrão: 0.999)')
+    
+    parser.add_argument('--psf-grid', nargs='+', metavar='PSF',
+                        help='PSF espacialmente variável: arquivo .npy com shape (linhas, colunas, kh, kw) ou '
+                             'imagens de PSF em ordem de linhas (com --psf-grid-shape)')
+    
+    parser.add_argument('--psf-grid-shape',
+                        help='Grade de regiões LxC da PSF variável, como 3x3. Sem --psf-grid, gera PSFs '
+                             'gaussianas com --sigma no centro e --sigma-corner nos cantos')
+    
+    parser.add_argument('--sigma-corner', type=float,
+                        help='Com --psf-grid-shape, desvio padrão da PSF gaussiana nos cantos do quadro')
+    
+    parser.add_argument('--patch-overlap', type=float, default=0.1,
+                        help='Com PSF variável, fração de cada região sobreposta às vizinhas para a mistura (padrão: 0.1)')
+    
+    parser.add_argument('--reference',
+                        help='Imagem nítida de referência: ao final, a entrada e a saída são avaliadas com PSNR, '
+                             'SSIM e nitidez')
+    
+    parser.add_argument('--bit-depth', type=int, choices=[8, 16, 32], default=8,
+                        help='Profundidade de bits da saída: 8, 16 (PNG/TIFF) ou 32 (TIFF em ponto flutuante) (padrão: 8)')
+    
+    parser.add_argument('--compression', type=int, choices=range(10), metavar='0-9',
+                        help='Nível de compressão PNG/TIFF de 0 (mais rápido) a 9 (arquivos menores); em TIFF, o nível '
+                             'exige o pacote tifffile, sem ele 1-9 apenas ligam o deflate (padrão: padrão do formato)')
+    
+    parser.add_argument('--jpeg-quality', type=int,
+                        help='Qualidade da saída JPEG, de 1 a 95 (padrão: padrão do PIL)')
+    
+    parser.add_argument('--quantization', choices=['truncate', 'round'], default='truncate',
+                        help="Quantização das saídas de 8/16 bits: 'truncate' ou 'round' (padrão: truncate)")
+    
+    parser.add_argument('--raw-shape',
+                        help='Shape de uma entrada .raw/.bin sem cabeçalho, como 480x640 ou 480x640x3')
+    
+    parser.add_argument('--raw-dtype',
+                        help='dtype de uma entrada .raw/.bin, como uint8, uint16 ou float32')
+    
+    parser.add_argument('--volume', action='store_true',
+                        help='Processa um volume 3-D (z-stack) em .npy ou TIFF multipágina')
+    
+    parser.add_argument('--size-z', type=int,
+                        help='Com --volume, tamanho axial (z) da PSF gaussiana (padrão: igual a --size)')
+    
+    parser.add_argument('--sigma-z', type=float,
+                        help='Com --volume, desvio padrão axial (z) da PSF gaussiana (padrão: igual a --sigma)')
+    
+    parser.add_argument('--memory-budget',
+                        help='Orçamento de memória, como 512M ou 4G (padrão: 80%% da memória disponível). '
+                             'Imagens maiores são processadas em blocos')
+    
+    parser.add_argument('--roi',
+                        help='Deconvolui apenas a região x,y,largura,altura (mais uma margem derivada da PSF) '
+                             'e cola o resultado na imagem original')
+    
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='Número de processos para execução paralela com memória compartilhada (padrão: 1, 0 = todos os núcleos)')
+    
+    parser.add_argument('--backend', choices=['process', 'thread'], default='process',
+                        help='Backend da execução paralela com --workers (padrão: process)')
+    
+    parser.add_argument('--threads', type=int, default=1,
+                        help='Número de threads para processar os canais RGB (ou as regiões da PSF variável) em paralelo (padrão: 1)')
+    
+    parser.add_argument('--sequence', action='store_true',
+                        help='Processa uma sequência de quadros (diretório de imagens ou TIFF multipágina)')
+    
+    parser.add_argument('--no-warm-start', action='store_true',
+                        help='Com --sequence, não inicia cada quadro a partir do resultado do anterior')
+    
+    parser.add_argument('--prefetch', type=int, default=4,
+                        help='Com --sequence, número de quadros lidos antecipadamente e aguardando gravação (padrão: 4)')
+    
+    parser.add_argument('--output-format', default='png',
+                        help='Com --sequence, formato dos quadros de saída (padrão: png)')
+    
     args = parser.parse_args()
     
+    # Módulos pesados (NumPy, SciPy, PIL) são importados apenas depois de
+    # interpretar os argumentos, para que --help e erros de uso respondam rápido
+    from .deconvolution import deconvolve
+    from .logger import DeconvolutionLogger
+    from .parallel import deconvolve_parallel
+    from .roi import deconvolve_roi, parse_roi
+    from .spatially_varying import deconvolve_spatially_varying
+    from .utils import load_image, load_stack, save_image, save_stack
+    
     # Validação de argumentos
-    if args.blur_type == 'gaussian' and args.sigma is None:
-        print("Erro: --sigma é obrigatório quando --blur-type=gaussian", file=sys.stderr)
+    # O Richardson-Lucy conjunto recebe uma pilha de quadros (rajada) e produz uma única imagem
+    joint = args.algorithm == 'joint_richardson_lucy'
+    if joint and (args.volume or args.sequence or args.roi or args.workers != 1
+                  or args.psf_grid is not None or args.psf_grid_shape is not None):
+        print("Erro: o algoritmo joint_richardson_lucy não pode ser usado com --volume, --sequence, "
+              "--roi, --workers ou PSF variável", file=sys.stderr)
         sys.exit(1)
     
-    if args.blur_type == 'motion' and args.length is None:
-        print("Erro: --length é obrigatório quando --blur-type=motion", file=sys.stderr)
+    # O Richardson-Lucy cego estima uma única PSF 2-D para a imagem inteira
+    blind = args.algorithm == 'blind_richardson_lucy'
+    if blind and (args.volume or args.psf_grid is not None or args.psf_grid_shape is not None):
+        print("Erro: o algoritmo blind_richardson_lucy não pode ser usado com --volume ou PSF variável",
+              file=sys.stderr)
+        sys.exit(1)
+    if args.psf_output and (not blind or args.sequence or args.roi or args.workers != 1):
+        print("Erro: --psf-output exige o algoritmo blind_richardson_lucy, sem --sequence, --roi ou --workers",
+              file=sys.stderr)
         sys.exit(1)
     
-    # Carregar imagem
+    if args.reference and (args.volume or args.sequence):
+        print("Erro: --reference não pode ser usado com --volume ou --sequence", file=sys.stderr)
+        sys.exit(1)
+    
+    spatially_varying = args.psf_grid is not None or args.psf_grid_shape is not None
+    if spatially_varying and (args.volume or args.sequence or args.roi or args.psf or args.workers != 1):
+        print("Erro: a PSF variável (--psf-grid/--psf-grid-shape) não pode ser usada com "
+              "--psf, --volume, --sequence, --roi ou --workers", file=sys.stderr)
+        sys.exit(1)
+    if args.psf_grid is None and args.psf_grid_shape is not None:
+        if args.blur_type != 'gaussian' or args.sigma_corner is None:
+            print("Erro: para gerar a grade de PSFs use --blur-type gaussian, --sigma e --sigma-corner "
+                  "(ou carregue as PSFs com --psf-grid)", file=sys.stderr)
+            sys.exit(1)
+    
+    if args.psf is None and args.psf_grid is None:
+        if args.blur_type is None or args.size is None:
+            print("Erro: --blur-type e --size são obrigatórios quando --psf não é usado", file=sys.stderr)
+            sys.exit(1)
+        
+        if args.blur_type == 'gaussian' and args.sigma is None:
+            print("Erro: --sigma é obrigatório quando --blur-type=gaussian", file=sys.stderr)
+            sys.exit(1)
+        
+        if args.blur_type == 'motion' and args.length is None:
+            print("Erro: --length é obrigatório quando --blur-type=motion", file=sys.stderr)
+            sys.exit(1)
+        
+        if args.volume and args.blur_type == 'motion':
+            print("Erro: --volume suporta apenas --blur-type=gaussian ou uma PSF medida (--psf)", file=sys.stderr)
+            sys.exit(1)
+    
+    roi = None
+    if args.roi is not None:
+        if args.volume or args.sequence:
+            print("Erro: --roi não pode ser usado com --volume ou --sequence", file=sys.stderr)
+            sys.exit(1)
+        try:
+            roi = parse_roi(args.roi)
+        except ValueError as e:
+            print(f"Erro: {e}", file=sys.stderr)
+            sys.exit(1)
+    
+    if spatially_varying:
+        try:
+            psf = build_psf_grid(args)
+        except (OSError, ValueError) as e:
+            print(f"Erro na grade de PSFs: {e}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        psf = build_psf(args)
+    
+    if args.sequence:
+        run_sequence(args, psf)
+        return
+    
+    # Carregar imagem na profundidade de bits original; a conversão para
+    # ponto flutuante é feita sob demanda (por bloco, quando houver blocos)
     print(f"Carregando imagem: {args.image}")
-    image = load_image(args.image)
-    print(f"Imagem carregada: {image.shape}")
+    try:
+        if args.volume or joint:
+            image = load_stack(args.image, dtype=None)
+        else:
+            raw_shape = [int(s) for s in args.raw_shape.lower().split('x')] if args.raw_shape else None
+            image = load_image(args.image, dtype=None, raw_shape=raw_shape, raw_dtype=args.raw_dtype)
+    except (OSError, ValueError) as e:
+        print(f"Erro ao carregar imagem: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Imagem carregada: {image.shape} ({image.dtype})")
+    
+    # Aplicar deconvolução
+    print(f"Aplicando deconvolução usando algoritmo '{args.algorithm}' ({args.iterations} iterações)...")
+    if spatially_varying:
+        logger = DeconvolutionLogger(callback=print)
+        deconvolved = deconvolve_spatially_varying(
+            image,
+            psf,
+            algorithm_name=args.algorithm,
+            logger=logger,
+            overlap=args.patch_overlap,
+            workers=args.threads,
+            num_iterations=args.iterations,
+            stopping=args.stopping,
+            noise_sigma=args.noise_sigma,
+            balance=args.balance,
+            regularization=args.regularization,
+            scales=args.scales,
+            working_size=args.working_size,
+            color_mode=args.color_mode,
+            clip=not args.no_clip
+        )
+    elif roi is not None:
+        print(f"Região de interesse: x={roi[0]}, y={roi[1]}, largura={roi[2]}, altura={roi[3]}")
+        deconvolved = deconvolve_roi(
+            image,
+            psf,
+            roi,
+            algorithm_name=args.algorithm,
+            memory_budget=args.memory_budget,
+            threads=args.threads,
+            num_iterations=args.iterations,
+            stopping=args.stopping,
+            noise_sigma=args.noise_sigma,
+            balance=args.balance,
+            regularization=args.regularization,
+            scales=args.scales,
+            working_size=args.working_size,
+            color_mode=args.color_mode,
+            clip=not args.no_clip
+        )
+    elif args.workers != 1:
+        deconvolved = deconvolve_parallel(
+            image,
+            psf,
+            algorithm_name=args.algorithm,
+            workers=args.workers or None,
+            backend=args.backend,
+            num_iterations=args.iterations,
+            stopping=args.stopping,
+            noise_sigma=args.noise_sigma,
+            balance=args.balance,
+            regularization=args.regularization,
+            scales=args.scales,
+            working_size=args.working_size,
+            color_mode=args.color_mode,
+            clip=not args.no_clip
+        )
+    else:
+        # O plano de execução é escolhido e registrado pelo próprio deconvolve
+        info = {}
+        deconvolved = deconvolve(
+            image,
+            psf,
+            algorithm_name=args.algorithm,
+            logger=DeconvolutionLogger(callback=print),
+            memory_budget=args.memory_budget,
+            threads=args.threads,
+            num_iterations=args.iterations,
+            stopping=args.stopping,
+            noise_sigma=args.noise_sigma,
+            info=info,
+            balance=args.balance,
+            regularization=args.regularization,
+            scales=args.scales,
+            working_size=args.working_size,
+            color_mode=args.color_mode,
+            clip=not args.no_clip
+        )
+        if args.stopping == 'discrepancy' and 'iterations' in info:
+            print(f"Iterações executadas (critério de discrepância): {info['iterations']}")
+        if args.psf_output and 'psf' in info:
+            import numpy as np
+            np.save(args.psf_output, info['psf'])
+            print(f"PSF estimada salva em: {args.psf_output}")
+    
+    # Salvar resultado
+    try:
+        if args.volume:
+            save_stack(deconvolved, args.output, bit_depth=args.bit_depth)
+        else:
+            save_image(deconvolved, args.output, **writer_options(args))
+    except (OSError, ValueError) as e:
+        print(f"Erro ao salvar imagem: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Imagem salva em: {args.output}")
+    print("Deconvolução concluída!")
+    
+    if args.reference:
+        report_metrics(args.reference, image, deconvolved)
+
+
+def report_metrics(reference_path, image, deconvolved):
+    """Avalia a entrada e a saída em relação a uma imagem de referência."""
+    import numpy as np
+    from .metrics import psnr, sharpness, ssim
+    from .utils import load_image, to_float
+    
+    try:
+        reference = load_image(reference_path)
+        observed = to_float(np.asarray(image))
+        color = reference.ndim == 3
+        scores = {
+            'entrada': (psnr(observed, reference, multichannel=color), ssim(observed, reference, multichannel=color),
+                        sharpness(observed, color)),
+            'saída': (psnr(deconvolved, reference, multichannel=color),
+                      ssim(deconvolved, reference, multichannel=color), sharpness(deconvolved, color)),
+        }
+    except (OSError, ValueError) as e:
+        print(f"Erro ao avaliar em relação à referência: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    print(f"Métricas em relação a {reference_path}:")
+    for label, values in scores.items():
+        if observed.ndim > reference.ndim and label == 'entrada':
+            # Pilha de quadros (joint_richardson_lucy): média entre os quadros
+            label = f"entrada (média de {observed.shape[0]} quadros)"
+        value_psnr, value_ssim, value_sharpness = (float(np.mean(v)) for v in values)
+        print(f"  {label}: PSNR {value_psnr:.2f} dB, SSIM {value_ssim:.4f}, nitidez {value_sharpness:.3g}")
+
+
+def build_psf(args):
+    """Carrega a PSF medida ou gera a PSF paramétrica a partir dos argumentos."""
+    import numpy as np
+    from .psf_generator import (crop_psf, generate_gaussian_psf, generate_gaussian_psf_3d, generate_motion_psf,
+                                load_psf, prepare_psf)
+    from .utils import load_image
+    
+    if args.psf is not None:
+        print(f"Carregando PSF medida: {args.psf}")
+        try:
+            if args.algorithm == 'joint_richardson_lucy':
+                psf = load_image(args.psf)
+                if psf.ndim == 3:
+                    # Pilha (N, kh, kw) com uma PSF por quadro; cada uma é normalizada pelo algoritmo
+                    psf = np.asarray(psf, dtype=np.float64)
+                    print(f"PSFs carregadas: {psf.shape[0]} quadros, {psf.shape[1]}x{psf.shape[2]}")
+                    return psf
+                psf = prepare_psf(psf, args.psf_energy)
+            else:
+                psf = load_psf(args.psf, args.psf_energy, ndim=3 if args.volume else 2)
+        except (OSError, ValueError) as e:
+            print(f"Erro ao carregar PSF: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"PSF carregada, centralizada e recortada para {psf.shape} ({args.psf_energy:.1%} da energia)")
+        return psf
     
-    # Gerar PSF
     print(f"Gerando PSF do tipo '{args.blur_type}'...")
-    if args.blur_type == 'gaussian':
+    if args.volume:
+        psf = generate_gaussian_psf_3d(args.size, args.sigma, args.size_z, args.sigma_z)
+        print(f"PSF gaussiana 3-D gerada: shape={psf.shape}, sigma={args.sigma}, sigma_z={args.sigma_z or args.sigma}")
+    elif args.blur_type == 'gaussian':
         psf = generate_gaussian_psf(args.size, args.sigma)
         print(f"PSF gaussiana gerada: size={args.size}, sigma={args.sigma}")
     else:  # motion
         psf = generate_motion_psf(args.size, args.length, args.angle)
         print(f"PSF de movimento gerada: size={args.size}, length={args.length}, angle={args.angle}°")
     
-    # Aplicar deconvolução
-    print(f"Aplicando deconvolução usando algoritmo '{args.algorithm}' ({args.iterations} iterações)...")
-    deconvolved = deconvolve(
-        image,
+    # O kernel passa a refletir o suporte real da PSF, e não o tamanho pedido
+    try:
+        cropped = crop_psf(psf, args.psf_energy)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+    if cropped.shape != psf.shape:
+        print(f"PSF recortada de {psf.shape} para {cropped.shape} ({args.psf_energy:.1%} da energia)")
+    return cropped
+
+
+def build_psf_grid(args):
+    """Carrega ou gera a grade de PSFs da deconvolução com PSF variável."""
+    from .spatially_varying import generate_gaussian_psf_grid, load_psf_grid, parse_grid_shape
+    
+    grid_shape = parse_grid_shape(args.psf_grid_shape) if args.psf_grid_shape else None
+    if args.psf_grid is not None:
+        print(f"Carregando grade de PSFs: {', '.join(args.psf_grid)}")
+        grid = load_psf_grid(args.psf_grid, grid_shape)
+    else:
+        grid = generate_gaussian_psf_grid(grid_shape, args.size, args.sigma, args.sigma_corner)
+        print(f"Grade de PSFs gaussianas gerada: sigma={args.sigma} no centro, {args.sigma_corner} nos cantos")
+    print(f"Grade de PSFs: {grid.shape[0]}x{grid.shape[1]} regiões, PSFs de {grid.shape[2]}x{grid.shape[3]}")
+    return grid
+
+
+def writer_options(args):
+    """Opções de codificação da saída a partir dos argumentos."""
+    return {
+        'bit_depth': args.bit_depth,
+        'compression': args.compression,
+        'quality': args.jpeg_quality,
+        'quantization': args.quantization,
+    }
+
+
+def run_sequence(args, psf):
+    """Executa a deconvolução de uma sequência de quadros."""
+    from .logger import DeconvolutionLogger
+    from .sequence import deconvolve_sequence
+    
+    logger = DeconvolutionLogger(callback=print)
+    print(f"Processando sequência: {args.image}")
+    stats = deconvolve_sequence(
+        args.image,
         psf,
+        args.output,
         algorithm_name=args.algorithm,
+        logger=logger,
+        warm_start=not args.no_warm_start,
+        prefetch=args.prefetch,
+        output_format=args.output_format,
+        writer_options=writer_options(args),
+        threads=args.threads,
         num_iterations=args.iterations,
+        stopping=args.stopping,
+        noise_sigma=args.noise_sigma,
+        balance=args.balance,
+        regularization=args.regularization,
+        scales=args.scales,
+        working_size=args.working_size,
+        color_mode=args.color_mode,
         clip=not args.no_clip
     )
-    
-    # Salvar resultado
-    save_image(deconvolved, args.output)
-    print("Deconvolução concluída!")
+    print(f"Throughput: {stats['fps']:.2f} quadros/s ({stats['frames']} quadros em {stats['elapsed']:.2f}s)")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,246 @@
+"""
+Planejamento de memória para deconvolução.
+
+Antes de iniciar a deconvolução, estima o pico de memória de trabalho a
+partir do shape da imagem, do número de canais, do dtype, do tamanho da
+PSF e do algoritmo, e escolhe uma estratégia de execução que caiba no
+orçamento de memória:
+
+- 'in_memory': a imagem inteira é processada de uma vez;
+- 'tiled': a imagem é processada em blocos com margens, com a saída em memória;
+- 'memmap': como 'tiled', mas a saída é gravada em um arquivo mapeado em
+  memória, para quando nem a entrada e a saída cabem juntas no orçamento.
+"""
+
+import os
+import tempfile
+import numpy as np
+from .algorithms import get_algorithm
+from .tiling import merge_region_info, region_kwargs, split_tiles
+from .utils import to_float
+
+
+STRATEGIES = ('in_memory', 'tiled', 'memmap')
+
+# Fração da memória disponível usada como orçamento padrão
+DEFAULT_BUDGET_FRACTION = 0.8
+
+_UNITS = {'': 1, 'B': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+def parse_memory_size(value):
+    """
+    Converte um tamanho de memória para bytes.
+
+    Args:
+        value: Número de bytes (int/float) ou texto como '512M', '2G', '1.5GB'
+
+    Returns:
+        int: Tamanho em bytes
+
+    Raises:
+        ValueError: Se o texto não puder ser interpretado
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip().upper()
+    if text.endswith('B') and len(text) > 1 and text[-2] in _UNITS:
+        text = text[:-1]
+    unit = text[-1] if text and text[-1] in _UNITS else ''
+    number = text[:-1] if unit else text
+    try:
+        return int(float(number) * _UNITS[unit])
+    except ValueError:
+        raise ValueError(f"Tamanho de memória inválido: '{value}' (use, por exemplo, 512M ou 2G)")
+
+
+def available_memory():
+    """
+    Retorna a memória física disponível em bytes (ou None se não for possível obtê-la).
+    """
+    try:
+        with open('/proc/meminfo') as meminfo:
+            for line in meminfo:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def format_bytes(num_bytes):
+    """Formata um número de bytes de forma legível (ex.: '1.5 GB')."""
+    value = float(num_bytes)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+
+class ExecutionPlan:
+    """
+    Plano de execução escolhido pelo planejador.
+
+    Attributes:
+        strategy: 'in_memory', 'tiled' ou 'memmap' (str)
+        peak_bytes: Pico estimado da execução escolhida (int)
+        full_bytes: Pico estimado da execução em memória da imagem inteira (int)
+        budget: Orçamento de memória em bytes (int ou None se desconhecido)
+        tile_shape: Shape dos blocos (tupla ou None para 'in_memory')
+        margin: Margem dos blocos em pixels (int)
+    """
+
+    def __init__(self, strategy, peak_bytes, full_bytes, budget, tile_shape=None, margin=0):
+        self.strategy = strategy
+        self.peak_bytes = peak_bytes
+        self.full_bytes = full_bytes
+        self.budget = budget
+        self.tile_shape = tile_shape
+        self.margin = margin
+
+    def describe(self):
+        """Retorna uma descrição do plano para mensagens de log."""
+        budget = format_bytes(self.budget) if self.budget is not None else "desconhecido"
+        text = (f"Plano de execução: {self.strategy} "
+                f"(pico estimado {format_bytes(self.peak_bytes)}, "
+                f"imagem inteira {format_bytes(self.full_bytes)}, orçamento {budget})")
+        if self.tile_shape is not None:
+            text += f", blocos de {'x'.join(str(s) for s in self.tile_shape)} com margem {self.margin}"
+        return text
+
+    def __repr__(self):
+        return f"ExecutionPlan({self.strategy!r}, peak={self.peak_bytes}, budget={self.budget})"
+
+
+def plan_execution(image_shape, psf_shape, algorithm_name='richardson_lucy', dtype=np.float64,
+                   memory_budget=None, margin=None, **kwargs):
+    """
+    Estima o pico de memória e escolhe a estratégia de execução.
+
+    Args:
+        image_shape: Shape da imagem (tupla)
+        psf_shape: Shape da PSF (tupla)
+        algorithm_name: Nome do algoritmo (str, padrão: 'richardson_lucy')
+        dtype: dtype da imagem de entrada (padrão: float64)
+        memory_budget: Orçamento de memória (bytes ou texto como '2G'; None usa
+            80% da memória disponível)
+        margin: Margem dos blocos em pixels (int ou None para 2x o tamanho da PSF)
+        **kwargs: Parâmetros específicos do algoritmo (ex.: threads)
+
+    Returns:
+        ExecutionPlan
+
+    Raises:
+        MemoryError: Se nem o menor bloco possível couber no orçamento
+    """
+    algorithm = get_algorithm(algorithm_name)
+    image_shape = tuple(image_shape)
+    psf_shape = tuple(psf_shape)
+    spatial_ndim = len(psf_shape)
+    spatial_shape = image_shape[:spatial_ndim]
+    channel_shape = image_shape[spatial_ndim:]
+
+    if memory_budget is None:
+        available = available_memory()
+        budget = int(available * DEFAULT_BUDGET_FRACTION) if available is not None else None
+    else:
+        budget = parse_memory_size(memory_budget)
+
+    input_bytes = int(np.prod(image_shape)) * np.dtype(dtype).itemsize
+    full_bytes = algorithm.estimate_memory(image_shape, psf_shape, **kwargs)
+
+    if budget is None or full_bytes <= budget:
+        return ExecutionPlan('in_memory', full_bytes, full_bytes, budget)
+
+    if algorithm.multi_frame:
+        raise MemoryError(
+            f"Imagem {image_shape} precisa de {format_bytes(full_bytes)}, acima do orçamento de "
+            f"{format_bytes(budget)}, e o algoritmo '{algorithm_name}' não pode ser executado em blocos"
+        )
+
+    if margin is None:
+        margin = 2 * max(psf_shape)
+
+    output_bytes = int(np.prod(image_shape)) * 8
+    # Saída em memória se entrada e saída couberem com folga; senão, em disco
+    strategy = 'tiled' if input_bytes + output_bytes < budget / 2 else 'memmap'
+    resident = output_bytes if strategy == 'tiled' else 0
+    tile_budget = budget - resident
+
+    tile_shape = list(spatial_shape)
+    while True:
+        outer_shape = tuple(min(t + 2 * margin, s) for t, s in zip(tile_shape, spatial_shape))
+        tile_bytes = algorithm.estimate_memory(outer_shape + channel_shape, psf_shape, **kwargs)
+        if tile_bytes <= tile_budget:
+            break
+        axis = int(np.argmax(tile_shape))
+        if tile_shape[axis] <= max(margin, 1):
+            raise MemoryError(
+                f"Imagem {image_shape} não cabe no orçamento de memória de {format_bytes(budget)}, "
+                f"nem mesmo em blocos (bloco mínimo precisa de {format_bytes(tile_bytes)})"
+            )
+        tile_shape[axis] = (tile_shape[axis] + 1) // 2
+
+    return ExecutionPlan(strategy, resident + tile_bytes, full_bytes, budget, tuple(tile_shape), margin)
+
+
+def execute_plan(plan, image, psf, algorithm_name='richardson_lucy', logger=None, **kwargs):
+    """
+    Executa a deconvolução de acordo com um plano.
+
+    Args:
+        plan: Plano de execução (ExecutionPlan)
+        image: Imagem de entrada (numpy.ndarray ou numpy.memmap; pixels inteiros
+            são normalizados para [0, 1] bloco a bloco, sem converter a imagem inteira)
+        psf: Point Spread Function (numpy.ndarray)
+        algorithm_name: Nome do algoritmo (str, padrão: 'richardson_lucy')
+        logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+        **kwargs: Parâmetros específicos do algoritmo
+
+    Returns:
+        numpy.ndarray (ou numpy.memmap na estratégia 'memmap'): Imagem deconvoluída
+    """
+    algorithm = get_algorithm(algorithm_name)
+    if plan.strategy == 'in_memory':
+        return algorithm.deconvolve(to_float(image), psf, logger=logger, **kwargs)
+
+    spatial_ndim = np.ndim(psf)
+    tiles = split_tiles(image.shape[:spatial_ndim], plan.tile_shape, plan.margin)
+
+    if plan.strategy == 'memmap':
+        output = _temporary_memmap(image.shape)
+    else:
+        output = np.empty(image.shape, dtype=np.float64)
+
+    tile_infos = []
+    for index, tile in enumerate(tiles, start=1):
+        if logger:
+            logger.info(f"Processando bloco {index}/{len(tiles)} {tile}")
+        tile_kwargs, tile_info = region_kwargs(kwargs, tile.outer)
+        result = algorithm.deconvolve(to_float(image[tile.outer]), psf, **tile_kwargs)
+        output[tile.inner] = result[tile.local]
+        tile_infos.append(tile_info)
+        if logger:
+            logger.progress('blocos', index, len(tiles))
+    merge_region_info(kwargs.get('info'), tile_infos)
+
+    if plan.strategy == 'memmap':
+        output.flush()
+    return output
+
+
+def _temporary_memmap(shape):
+    """Cria um array float64 mapeado em um arquivo temporário."""
+    handle, path = tempfile.mkstemp(suffix='.dat', prefix='deconvolucao_')
+    os.close(handle)
+    output = np.memmap(path, dtype=np.float64, mode='w+', shape=shape)
+    try:
+        # Em sistemas POSIX o arquivo continua acessível pelo mapeamento após ser removido
+        os.unlink(path)
+    except OSError:
+        pass
+    return output
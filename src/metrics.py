@@ -0,0 +1,177 @@
+"""
+Métricas de qualidade de imagem: PSNR, SSIM e nitidez.
+
+Todas as funções aceitam uma única imagem (H, W) ou (H, W, C) ou uma
+pilha de imagens (N, H, W[, C]), como os resultados de uma varredura de
+parâmetros, e calculam as métricas de todas as imagens de uma vez, sem
+laços em Python sobre imagens ou janelas. A referência pode ser uma única
+imagem, comparada com todas as da pilha, ou uma pilha do mesmo shape
+(uma referência por imagem). O SSIM usa filtros separáveis
+(caixa ou gaussiano) do scipy.ndimage sobre a pilha inteira.
+"""
+
+import numpy as np
+
+
+# Janelas aceitas pelo SSIM
+SSIM_WINDOWS = ('gaussian', 'box')
+
+# Constantes de estabilização do SSIM (Wang et al., 2004)
+SSIM_K1 = 0.01
+SSIM_K2 = 0.03
+
+
+def _image_axes(ndim, multichannel):
+    """Retorna os eixos (espaciais e de canais) de uma imagem no fim de um array com ndim eixos."""
+    image_ndim = 3 if multichannel else 2
+    if ndim < image_ndim:
+        raise ValueError(f"Esperada uma imagem com pelo menos {image_ndim} dimensões, recebido {ndim}")
+    return tuple(range(ndim - image_ndim, ndim))
+
+
+def _is_multichannel(shape, multichannel):
+    """Indica se o último eixo é o de canais (inferido quando multichannel é None)."""
+    if multichannel is None:
+        return len(shape) >= 3 and shape[-1] in (3, 4)
+    return bool(multichannel)
+
+
+def _broadcast_pair(images, reference):
+    """Converte as imagens e a referência para float64 e verifica a compatibilidade dos shapes."""
+    images = np.asarray(images, dtype=np.float64)
+    reference = np.asarray(reference, dtype=np.float64)
+    if reference.shape != images.shape and reference.shape != images.shape[images.ndim - reference.ndim:]:
+        raise ValueError(f"Shape {images.shape} incompatível com a referência {reference.shape}")
+    return images, np.broadcast_to(reference, images.shape)
+
+
+def _reduce(values):
+    """Converte o resultado de uma única imagem em float."""
+    return float(values) if np.ndim(values) == 0 else values
+
+
+def psnr(images, reference, data_range=1.0, multichannel=None):
+    """
+    Calcula o PSNR (relação sinal-ruído de pico) em relação a uma referência.
+
+    Args:
+        images: Imagem (H, W[, C]) ou pilha de imagens (N, H, W[, C]) (numpy.ndarray)
+        reference: Imagem de referência (H, W[, C]) ou pilha do mesmo shape
+            que images (numpy.ndarray)
+        data_range: Faixa dos valores das imagens (float, padrão: 1.0)
+        multichannel: Se True, o último eixo é o de canais (bool, padrão:
+            True quando o último eixo tem 3 ou 4 elementos e há pelo menos 3 eixos)
+
+    Returns:
+        float em dB para uma imagem, ou numpy.ndarray (N,) para uma pilha;
+        inf quando a imagem é idêntica à referência
+
+    Raises:
+        ValueError: Se os shapes não forem compatíveis
+    """
+    images, reference = _broadcast_pair(images, reference)
+    axes = _image_axes(images.ndim, _is_multichannel(reference.shape, multichannel))
+    mse = np.mean((images - reference) ** 2, axis=axes)
+    with np.errstate(divide='ignore'):
+        return _reduce(10 * np.log10(data_range ** 2 / mse))
+
+
+def _filter(array, spatial_axes, window, size, sigma):
+    """Média local ao longo dos eixos espaciais (os demais eixos não são misturados)."""
+    from scipy import ndimage
+
+    if window == 'gaussian':
+        sigmas = [sigma if axis in spatial_axes else 0 for axis in range(array.ndim)]
+        # Truncar o kernel em (size - 1) / 2 pixels, como a janela de tamanho size
+        return ndimage.gaussian_filter(array, sigmas, truncate=((size - 1) / 2) / sigma, mode='reflect')
+    sizes = [size if axis in spatial_axes else 1 for axis in range(array.ndim)]
+    return ndimage.uniform_filter(array, sizes, mode='reflect')
+
+
+def ssim(images, reference, data_range=1.0, window='gaussian', size=11, sigma=1.5, multichannel=None):
+    """
+    Calcula o SSIM médio (índice de similaridade estrutural) em relação a uma referência.
+
+    As médias, variâncias e covariâncias locais são obtidas com filtros
+    separáveis aplicados à pilha inteira; para imagens coloridas, o índice
+    é calculado por canal e a média inclui todos os canais. As bordas
+    ((size - 1) / 2 pixels) são descartadas da média.
+
+    Args:
+        images: Imagem (H, W[, C]) ou pilha de imagens (N, H, W[, C]) (numpy.ndarray)
+        reference: Imagem de referência (H, W[, C]) ou pilha do mesmo shape
+            que images (numpy.ndarray)
+        data_range: Faixa dos valores das imagens (float, padrão: 1.0)
+        window: 'gaussian' ou 'box' (str, padrão: 'gaussian')
+        size: Lado da janela em pixels, ímpar (int, padrão: 11)
+        sigma: Desvio padrão da janela gaussiana (float, padrão: 1.5)
+        multichannel: Se True, o último eixo é o de canais (bool, padrão:
+            True quando o último eixo tem 3 ou 4 elementos e há pelo menos 3 eixos)
+
+    Returns:
+        float em [-1, 1] para uma imagem, ou numpy.ndarray (N,) para uma pilha
+
+    Raises:
+        ValueError: Se os shapes não forem compatíveis ou a janela for inválida
+    """
+    if window not in SSIM_WINDOWS:
+        raise ValueError(f"Janela '{window}' inválida. Opções: {', '.join(SSIM_WINDOWS)}")
+    if size < 3 or size % 2 == 0:
+        raise ValueError(f"O tamanho da janela deve ser ímpar e maior ou igual a 3, recebido {size}")
+    images, reference = _broadcast_pair(images, reference)
+    axes = _image_axes(images.ndim, _is_multichannel(reference.shape, multichannel))
+    spatial_axes = axes[:2]
+    if any(images.shape[axis] < size for axis in spatial_axes):
+        raise ValueError(f"Imagem {images.shape} menor que a janela do SSIM ({size} pixels)")
+
+    mean_x = _filter(images, spatial_axes, window, size, sigma)
+    mean_y = _filter(reference, spatial_axes, window, size, sigma)
+    var_x = _filter(images * images, spatial_axes, window, size, sigma) - mean_x ** 2
+    var_y = _filter(reference * reference, spatial_axes, window, size, sigma) - mean_y ** 2
+    covariance = _filter(images * reference, spatial_axes, window, size, sigma) - mean_x * mean_y
+    if window == 'box':
+        # Variâncias amostrais, como na definição original com janela uniforme
+        correction = size * size / (size * size - 1.0)
+        var_x *= correction
+        var_y *= correction
+        covariance *= correction
+
+    c1 = (SSIM_K1 * data_range) ** 2
+    c2 = (SSIM_K2 * data_range) ** 2
+    index = ((2 * mean_x * mean_y + c1) * (2 * covariance + c2)) / (
+        (mean_x ** 2 + mean_y ** 2 + c1) * (var_x + var_y + c2)
+    )
+
+    border = (size - 1) // 2
+    crop = tuple(slice(border, -border) if axis in spatial_axes else slice(None) for axis in range(index.ndim))
+    return _reduce(index[crop].mean(axis=axes))
+
+
+def sharpness(images, multichannel=None):
+    """
+    Mede a nitidez pela variância do laplaciano discreto (sem referência).
+
+    Valores maiores indicam mais detalhes de alta frequência; útil para
+    comparar resultados de uma mesma imagem (por exemplo, entre iterações),
+    lembrando que ruído amplificado também aumenta a métrica.
+
+    Args:
+        images: Imagem (H, W[, C]) ou pilha de imagens (N, H, W[, C]) (numpy.ndarray)
+        multichannel: Se True, o último eixo é o de canais (bool, padrão:
+            True quando o último eixo tem 3 ou 4 elementos e há pelo menos 3 eixos)
+
+    Returns:
+        float para uma imagem, ou numpy.ndarray (N,) para uma pilha
+    """
+    images = np.asarray(images, dtype=np.float64)
+    axes = _image_axes(images.ndim, _is_multichannel(images.shape, multichannel))
+    row_axis, col_axis = axes[:2]
+
+    def shifted(row, col):
+        index = [slice(None)] * images.ndim
+        index[row_axis] = slice(1 + row, images.shape[row_axis] - 1 + row)
+        index[col_axis] = slice(1 + col, images.shape[col_axis] - 1 + col)
+        return images[tuple(index)]
+
+    laplacian = shifted(-1, 0) + shifted(1, 0) + shifted(0, -1) + shifted(0, 1) - 4 * shifted(0, 0)
+    return _reduce(laplacian.var(axis=axes))
@@ -0,0 +1,250 @@
+"""
+Execução paralela de deconvolução por canais e/ou tiles.
+
+Dois backends estão disponíveis:
+- 'process': a imagem de entrada, a imagem de saída e a PSF ficam em blocos
+  de multiprocessing.shared_memory. Os workers recebem apenas os nomes dos
+  blocos e as fatias que devem processar, leem os pixels diretamente da
+  memória compartilhada e escrevem o resultado no lugar, sem serializar
+  dados de pixel entre processos.
+- 'thread': as tarefas rodam em um pool de threads sobre os próprios arrays,
+  aproveitando que as FFTs e ufuncs do NumPy/SciPy liberam o GIL.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+from .algorithms import get_algorithm
+from .color import COLOR_MODES, deconvolve_luminance, is_color_image
+from .tiling import merge_region_info, region_kwargs, split_tiles, tile_shape_for_count
+from .utils import to_float
+
+
+BACKENDS = ('process', 'thread')
+
+
+class SharedArray:
+    """
+    Array numpy armazenado em um bloco de memória compartilhada.
+
+    Attributes:
+        shm: Bloco de memória compartilhada (SharedMemory)
+        array: View numpy sobre o bloco (numpy.ndarray)
+    """
+
+    def __init__(self, shm, shape, dtype, owner):
+        self.shm = shm
+        self.array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        self._owner = owner
+
+    @classmethod
+    def create(cls, shape, dtype=np.float64):
+        """Cria um novo bloco com o shape e dtype dados."""
+        dtype = np.dtype(dtype)
+        nbytes = max(1, int(np.prod(shape)) * dtype.itemsize)
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        return cls(shm, shape, dtype, owner=True)
+
+    @classmethod
+    def from_array(cls, array, dtype=np.float64):
+        """Cria um bloco e copia o conteúdo do array para ele (pixels inteiros são normalizados para [0, 1])."""
+        shared = cls.create(array.shape, dtype)
+        to_float(np.asarray(array), out=shared.array)
+        return shared
+
+    @classmethod
+    def attach(cls, spec):
+        """Anexa a um bloco existente a partir de sua especificação."""
+        name, shape, dtype = spec
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, shape, dtype, owner=False)
+
+    @property
+    def spec(self):
+        """Especificação serializável (nome, shape, dtype) do bloco."""
+        return (self.shm.name, self.array.shape, self.array.dtype.str)
+
+    def close(self):
+        """Libera o bloco (e o remove do sistema, se este processo o criou)."""
+        self.array = None
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+def _run_region(image, output, psf, channel, tile, algorithm_name, kwargs):
+    """
+    Deconvolui um canal e/ou tile de `image` e escreve o resultado em `output`.
+
+    Args:
+        kwargs: Parâmetros do algoritmo já preparados para a região (region_kwargs)
+
+    Returns:
+        Tupla (tempo de execução em segundos, info da região ou None)
+    """
+    start = time.perf_counter()
+    region = to_float(image[_region_index(channel, tile)])
+
+    algorithm = get_algorithm(algorithm_name)
+    result = algorithm.deconvolve(region, psf, **kwargs)
+
+    output[tile.inner + ((channel,) if channel is not None else ())] = result[tile.local]
+    return time.perf_counter() - start, kwargs.get('info')
+
+
+def _region_index(channel, tile):
+    """Índice da região (tile com margem e canal) na imagem."""
+    return tile.outer + ((channel,) if channel is not None else ())
+
+
+def _process_task(image_spec, output_spec, psf_spec, channel, tile, algorithm_name, kwargs):
+    """
+    Processa uma tarefa (canal e/ou tile) dentro de um worker.
+
+    Função de nível de módulo para poder ser enviada a outros processos.
+    """
+    image = SharedArray.attach(image_spec)
+    output = SharedArray.attach(output_spec)
+    psf = SharedArray.attach(psf_spec)
+    try:
+        return _run_region(image.array, output.array, psf.array, channel, tile, algorithm_name, kwargs)
+    finally:
+        image.close()
+        output.close()
+        psf.close()
+
+
+def plan_tasks(image_shape, psf_shape, workers, margin=None):
+    """
+    Divide o trabalho em tarefas por canal e/ou tile.
+
+    Imagens com canais são divididas primeiro por canal; tiles só são usados
+    quando há mais workers que canais.
+
+    Args:
+        image_shape: Shape da imagem (tupla)
+        psf_shape: Shape da PSF (tupla)
+        workers: Número de workers (int)
+        margin: Margem dos tiles em pixels (int ou None para 2x o tamanho da PSF)
+
+    Returns:
+        Lista de tuplas (canal ou None, Tile)
+    """
+    spatial_ndim = len(psf_shape)
+    spatial_shape = tuple(image_shape[:spatial_ndim])
+    channels = list(range(image_shape[spatial_ndim])) if len(image_shape) > spatial_ndim else [None]
+
+    if margin is None:
+        margin = 2 * max(psf_shape)
+
+    tiles_per_channel = max(1, -(-workers // len(channels)))
+    tile_shape = tile_shape_for_count(spatial_shape, tiles_per_channel)
+    tiles = split_tiles(spatial_shape, tile_shape, margin if tiles_per_channel > 1 else 0)
+
+    return [(channel, tile) for channel in channels for tile in tiles]
+
+
+def deconvolve_parallel(image, psf, algorithm_name='richardson_lucy', logger=None, workers=None,
+                        margin=None, backend='process', color_mode='rgb', **kwargs):
+    """
+    Aplica deconvolução dividindo a imagem em canais e/ou tiles processados em paralelo.
+
+    Args:
+        image: Imagem de entrada (numpy.ndarray, pode ser RGB ou grayscale)
+        psf: Point Spread Function (numpy.ndarray)
+        algorithm_name: Nome do algoritmo a ser usado (str, padrão: 'richardson_lucy')
+        logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+        workers: Número de processos ou threads (int ou None para usar todos os núcleos)
+        margin: Margem dos tiles em pixels (int ou None para 2x o tamanho da PSF)
+        backend: 'process' (memória compartilhada) ou 'thread' (str, padrão: 'process')
+        color_mode: 'rgb' ou 'luminance' (apenas o canal Y é deconvoluído, em tiles)
+            (str, padrão: 'rgb')
+        **kwargs: Parâmetros específicos do algoritmo
+
+    Returns:
+        numpy.ndarray: Imagem deconvoluída
+
+    Raises:
+        ValueError: Se o algoritmo, o backend ou o modo de cor forem inválidos
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend '{backend}' inválido. Opções: {', '.join(BACKENDS)}")
+    if color_mode not in COLOR_MODES:
+        raise ValueError(f"Modo de cor '{color_mode}' inválido. Opções: {', '.join(COLOR_MODES)}")
+
+    if color_mode == 'luminance' and is_color_image(image, psf):
+        return deconvolve_luminance(
+            image,
+            lambda luminance: deconvolve_parallel(luminance, psf, algorithm_name, logger, workers,
+                                                  margin, backend, **kwargs),
+            clip=kwargs.get('clip', True),
+            logger=logger
+        )
+
+    # Validar o algoritmo antes de criar os workers
+    get_algorithm(algorithm_name)
+
+    workers = workers or os.cpu_count() or 1
+    psf = np.asarray(psf, dtype=np.float64)
+    info = kwargs.get('info')
+    tasks = plan_tasks(image.shape, psf.shape, workers, margin)
+
+    if logger:
+        kind = "processos (memória compartilhada)" if backend == 'process' else "threads"
+        logger.info(f"Execução paralela: {len(tasks)} tarefas em {workers} {kind}")
+
+    if backend == 'thread':
+        output = np.empty(image.shape, dtype=np.float64)
+        with ThreadPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            futures = [
+                executor.submit(_run_region, image, output, psf, channel, tile, algorithm_name,
+                                region_kwargs(kwargs, _region_index(channel, tile))[0])
+                for channel, tile in tasks
+            ]
+            region_infos = _wait_tasks(futures, len(tasks), logger)
+        merge_region_info(info, region_infos)
+        return output
+
+    shared_image = SharedArray.from_array(image)
+    shared_output = SharedArray.create(image.shape)
+    shared_psf = SharedArray.from_array(psf)
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            futures = [
+                executor.submit(
+                    _process_task,
+                    shared_image.spec,
+                    shared_output.spec,
+                    shared_psf.spec,
+                    channel,
+                    tile,
+                    algorithm_name,
+                    region_kwargs(kwargs, _region_index(channel, tile))[0]
+                )
+                for channel, tile in tasks
+            ]
+            region_infos = _wait_tasks(futures, len(tasks), logger)
+
+        merge_region_info(info, region_infos)
+        return shared_output.array.copy()
+    finally:
+        shared_image.close()
+        shared_output.close()
+        shared_psf.close()
+
+
+def _wait_tasks(futures, total, logger):
+    """
+    Aguarda as tarefas, propagando exceções e registrando o progresso.
+
+    Returns:
+        Lista com o info de cada tarefa, na ordem das tarefas
+    """
+    for completed, future in enumerate(as_completed(futures), start=1):
+        elapsed, _ = future.result()
+        if logger:
+            logger.info(f"Tarefa {completed}/{total} concluída ({elapsed:.2f}s)")
+            logger.progress('tarefas', completed, total)
+    return [future.result()[1] for future in futures]
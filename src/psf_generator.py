@@ -1,38 +1,47 @@
 """
 Módulo para geração de PSFs (Point Spread Functions) a partir de parâmetros.
+
+Inclui também o pré-processamento de PSFs medidas e geradas: centralização
+no centroide e recorte para a menor janela que contém uma fração da
+energia, de modo que o tamanho do kernel reflita o suporte real da PSF.
 """
 
 import numpy as np
-from scipy import ndimage
+
+
+# Fração da energia mantida por padrão no recorte das PSFs
+DEFAULT_PSF_ENERGY = 0.999
 
 
 def generate_gaussian_psf(size, sigma):
     """
-    Gera uma PSF gaussiana.
+    Gera uma PSF gaussiana 2-D ou N-dimensional.
     
     Args:
-        size: Tamanho do kernel (int ou tupla (height, width))
-        sigma: Desvio padrão do blur gaussiano (float ou tupla (sigma_y, sigma_x))
+        size: Tamanho do kernel (int para 2-D, ou tupla como (height, width)
+            ou (depth, height, width) para PSFs 3-D)
+        sigma: Desvio padrão do blur gaussiano (float, ou tupla com um valor por eixo,
+            como (sigma_y, sigma_x) ou (sigma_z, sigma_y, sigma_x))
     
     Returns:
         numpy.ndarray: PSF normalizada
     """
     if isinstance(size, int):
         size = (size, size)
+    size = tuple(int(s) for s in size)
     
     if isinstance(sigma, (int, float)):
-        sigma = (sigma, sigma)
+        sigma = (sigma,) * len(size)
+    if len(sigma) != len(size):
+        raise ValueError(f"sigma deve ter {len(size)} valores, mas tem {len(sigma)}")
     
     # Criar grid de coordenadas
-    center = (size[0] // 2, size[1] // 2)
-    y, x = np.ogrid[:size[0], :size[1]]
-    
-    # Calcular distâncias do centro
-    y_centered = y - center[0]
-    x_centered = x - center[1]
+    center = tuple(s // 2 for s in size)
+    grids = np.ogrid[tuple(slice(0, s) for s in size)]
     
-    # Calcular PSF gaussiana 2D
-    psf = np.exp(-(x_centered**2 / (2 * sigma[1]**2) + y_centered**2 / (2 * sigma[0]**2)))
+    # Calcular PSF gaussiana somando as distâncias ao centro em cada eixo
+    exponent = sum((g - c) ** 2 / (2 * sd ** 2) for g, c, sd in zip(grids, center, sigma))
+    psf = np.exp(-exponent)
     
     # Normalizar
     psf = normalize_psf(psf)
@@ -40,6 +49,27 @@ def generate_gaussian_psf(size, sigma):
     return psf
 
 
+def generate_gaussian_psf_3d(size, sigma, size_z=None, sigma_z=None):
+    """
+    Gera uma PSF gaussiana 3-D para volumes (z-stacks).
+    
+    Em microscopia o blur axial (z) costuma ser maior que o lateral, por isso
+    o tamanho e o sigma do eixo z podem ser definidos separadamente.
+    
+    Args:
+        size: Tamanho lateral do kernel (int)
+        sigma: Desvio padrão lateral (float)
+        size_z: Tamanho axial do kernel (int, padrão: igual a size)
+        sigma_z: Desvio padrão axial (float, padrão: igual a sigma)
+    
+    Returns:
+        numpy.ndarray: PSF normalizada com shape (size_z, size, size)
+    """
+    size_z = size if size_z is None else size_z
+    sigma_z = sigma if sigma_z is None else sigma_z
+    return generate_gaussian_psf((size_z, size, size), (sigma_z, sigma, sigma))
+
+
 def generate_motion_psf(size, length, angle):
     """
     Gera uma PSF de movimento (motion blur).
@@ -78,6 +108,7 @@ def generate_motion_psf(size, length, angle):
     
     # Aplicar suavização leve para evitar artefatos
     if length > 1:
+        from scipy import ndimage
         psf = ndimage.gaussian_filter(psf, sigma=0.5)
     
     # Normalizar
@@ -101,3 +132,149 @@ def normalize_psf(psf):
         psf = psf / psf_sum
     return psf
 
+
+def center_psf(psf):
+    """
+    Desloca a PSF para que o centroide fique na origem do kernel.
+    
+    A origem segue a convenção de convolve2d(mode='same'): o índice
+    (k - 1) // 2 em cada eixo. O deslocamento é inteiro (sem interpolação,
+    que borraria a PSF); o que sai do kernel é descartado.
+    
+    Args:
+        psf: PSF não negativa (numpy.ndarray, qualquer número de dimensões)
+    
+    Returns:
+        numpy.ndarray: PSF centralizada, com o mesmo shape
+    """
+    psf = np.asarray(psf, dtype=np.float64)
+    total = psf.sum()
+    if total <= 0:
+        return psf.copy()
+    
+    shifts = []
+    for axis, k in enumerate(psf.shape):
+        profile = psf.sum(axis=tuple(a for a in range(psf.ndim) if a != axis))
+        centroid = float(np.dot(np.arange(k), profile) / total)
+        shifts.append(int(round((k - 1) // 2 - centroid)))
+    
+    centered = np.zeros_like(psf)
+    source = tuple(slice(max(0, -d), k - max(0, d)) for d, k in zip(shifts, psf.shape))
+    target = tuple(slice(max(0, d), k - max(0, -d)) for d, k in zip(shifts, psf.shape))
+    centered[target] = psf[source]
+    return centered
+
+
+def psf_support(psf, energy=DEFAULT_PSF_ENERGY):
+    """
+    Calcula a menor janela centrada na origem que contém uma fração da energia.
+    
+    A janela tem tamanho ímpar 2r + 1 em cada eixo e é centrada na origem
+    do kernel ((k - 1) // 2), de modo que recortar a PSF não desloca o
+    resultado da convolução. Em cada eixo, o raio é o menor que descarta no
+    máximo (1 - energy) / ndim da energia do perfil marginal, então a
+    janela inteira mantém pelo menos a fração pedida.
+    
+    Args:
+        psf: PSF não negativa (numpy.ndarray)
+        energy: Fração da energia a manter, em (0, 1] (float, padrão: 0.999)
+    
+    Returns:
+        Tupla de slices com a janela em cada eixo
+    
+    Raises:
+        ValueError: Se energy estiver fora de (0, 1]
+    """
+    if not 0 < energy <= 1:
+        raise ValueError(f"A fração de energia deve estar em (0, 1], recebido {energy}")
+    psf = np.asarray(psf, dtype=np.float64)
+    total = psf.sum()
+    if total <= 0:
+        return tuple(slice(0, k) for k in psf.shape)
+    
+    allowed = (1 - energy) / psf.ndim * total
+    window = []
+    for axis, k in enumerate(psf.shape):
+        profile = psf.sum(axis=tuple(a for a in range(psf.ndim) if a != axis))
+        origin = (k - 1) // 2
+        max_radius = min(origin, k - 1 - origin)
+        # Energia fora da janela [origin - r, origin + r] para cada raio r
+        inside = np.cumsum(profile)
+        radii = np.arange(max_radius + 1)
+        kept = inside[origin + radii] - np.concatenate(([0.0], inside[:origin]))[::-1][:max_radius + 1]
+        outside = total - kept
+        fits = np.nonzero(outside <= allowed)[0]
+        if len(fits) == 0:
+            # Nem a maior janela simétrica basta: manter o eixo inteiro
+            window.append(slice(0, k))
+        else:
+            radius = int(fits[0])
+            window.append(slice(origin - radius, origin + radius + 1))
+    return tuple(window)
+
+
+def crop_psf(psf, energy=DEFAULT_PSF_ENERGY):
+    """
+    Recorta a PSF para a menor janela que contém uma fração da energia e a normaliza.
+    
+    Kernels grandes com pouco suporte (por exemplo, tamanho 41 com sigma
+    pequeno) são reduzidos ao suporte real, barateando a convolução.
+    
+    Args:
+        psf: PSF não negativa (numpy.ndarray)
+        energy: Fração da energia a manter, em (0, 1] (float, padrão: 0.999)
+    
+    Returns:
+        numpy.ndarray: PSF recortada e normalizada
+    """
+    psf = np.asarray(psf, dtype=np.float64)
+    return normalize_psf(np.ascontiguousarray(psf[psf_support(psf, energy)]))
+
+
+def prepare_psf(psf, energy=DEFAULT_PSF_ENERGY, center=True):
+    """
+    Pré-processa uma PSF medida: remove valores negativos, centraliza no
+    centroide, recorta ao suporte e normaliza.
+    
+    Args:
+        psf: PSF (numpy.ndarray)
+        energy: Fração da energia a manter no recorte, em (0, 1] (float, padrão: 0.999)
+        center: Se True, centraliza a PSF no centroide antes do recorte (bool, padrão: True)
+    
+    Returns:
+        numpy.ndarray: PSF pronta para a deconvolução
+    """
+    psf = np.maximum(np.asarray(psf, dtype=np.float64), 0)
+    if center:
+        psf = center_psf(psf)
+    return crop_psf(psf, energy)
+
+
+def load_psf(path, energy=DEFAULT_PSF_ENERGY, center=True, ndim=2):
+    """
+    Carrega uma PSF medida de um arquivo de imagem ou .npy e a pré-processa.
+    
+    Args:
+        path: Caminho do arquivo (.npy, TIFF ou outro formato de imagem)
+        energy: Fração da energia a manter no recorte, em (0, 1] (float, padrão: 0.999)
+        center: Se True, centraliza a PSF no centroide (bool, padrão: True)
+        ndim: Número de dimensões esperado: 2 para imagens ou 3 para
+            volumes (int, padrão: 2)
+    
+    Returns:
+        numpy.ndarray: PSF centralizada, recortada e normalizada
+    
+    Raises:
+        OSError: Se o arquivo não puder ser lido
+        ValueError: Se a PSF não tiver o número de dimensões esperado
+    """
+    # Importado aqui para que a geração de PSFs não dependa da leitura de imagens
+    from .utils import load_image, load_stack
+    
+    psf = np.asarray(load_stack(path, mmap=False) if ndim == 3 else load_image(path), dtype=np.float64)
+    if ndim == 2 and psf.ndim == 3 and psf.shape[-1] in (3, 4):
+        # PSF salva como imagem colorida: usar a média dos canais
+        psf = psf[..., :3].mean(axis=-1)
+    if psf.ndim != ndim:
+        raise ValueError(f"Esperada uma PSF {ndim}-D, mas '{path}' tem shape {psf.shape}")
+    return prepare_psf(psf, energy, center)
@@ -0,0 +1,188 @@
+"""
+Deconvolução de sequências de quadros (diretórios de imagens ou TIFF multipágina).
+
+A leitura, o processamento e a gravação dos quadros rodam em paralelo,
+ligados por filas limitadas (a gravação usa AsyncImageWriter). A mesma PSF (e sua OTF em cache) é usada
+para todos os quadros e, para algoritmos iterativos, cada quadro parte
+da estimativa do quadro anterior (warm start temporal).
+"""
+
+import os
+import queue
+import threading
+import time
+from PIL import Image, ImageSequence
+from .algorithms import get_algorithm
+from .color import COLOR_MODES, deconvolve_luminance, is_color_image
+from .utils import pil_to_array
+from .writer import AsyncImageWriter
+
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+# Marcador de fim de fila
+_END = object()
+
+
+def list_frames(source):
+    """
+    Lista os quadros de uma sequência.
+
+    Args:
+        source: Diretório com imagens ou arquivo TIFF multipágina (str)
+
+    Returns:
+        Lista de tuplas (nome, localização), onde localização é um caminho
+        de arquivo ou um índice de página
+
+    Raises:
+        ValueError: Se a fonte não contiver quadros
+    """
+    if os.path.isdir(source):
+        names = sorted(
+            name for name in os.listdir(source)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        frames = [(os.path.splitext(name)[0], os.path.join(source, name)) for name in names]
+    else:
+        with Image.open(source) as img:
+            num_pages = getattr(img, 'n_frames', 1)
+        frames = [(f"frame_{index:05d}", index) for index in range(num_pages)]
+
+    if not frames:
+        raise ValueError(f"Nenhum quadro encontrado em: {source}")
+    return frames
+
+
+def iter_frames(source):
+    """
+    Lê os quadros de uma sequência um a um.
+
+    Args:
+        source: Diretório com imagens ou arquivo TIFF multipágina (str)
+
+    Yields:
+        Tuplas (nome, numpy.ndarray) com valores normalizados entre 0 e 1
+    """
+    frames = list_frames(source)
+    if os.path.isdir(source):
+        for name, path in frames:
+            with Image.open(path) as img:
+                yield name, pil_to_array(img)
+    else:
+        with Image.open(source) as img:
+            for (name, _), page in zip(frames, ImageSequence.Iterator(img)):
+                yield name, pil_to_array(page)
+
+
+def _reader(source, frame_queue, stop_event):
+    """Thread de leitura: decodifica quadros e os coloca na fila."""
+    try:
+        for item in iter_frames(source):
+            while not stop_event.is_set():
+                try:
+                    frame_queue.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if stop_event.is_set():
+                return
+        frame_queue.put(_END)
+    except Exception as e:
+        frame_queue.put(e)
+
+
+def deconvolve_sequence(source, psf, output_dir, algorithm_name='richardson_lucy', logger=None,
+                        warm_start=True, prefetch=4, output_format='png', color_mode='rgb',
+                        writer_options=None, **kwargs):
+    """
+    Aplica deconvolução em todos os quadros de uma sequência.
+
+    Args:
+        source: Diretório com imagens ou arquivo TIFF multipágina (str)
+        psf: Point Spread Function compartilhada por todos os quadros (numpy.ndarray)
+        output_dir: Diretório onde os quadros deconvoluídos serão salvos (str)
+        algorithm_name: Nome do algoritmo a ser usado (str, padrão: 'richardson_lucy')
+        logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+        warm_start: Se True, inicia cada quadro com a estimativa do anterior
+            quando o algoritmo suporta (bool, padrão: True)
+        prefetch: Tamanho das filas de leitura e gravação (int, padrão: 4)
+        output_format: Extensão dos arquivos de saída (str, padrão: 'png')
+        color_mode: 'rgb' ou 'luminance' (apenas o canal Y de quadros coloridos é
+            deconvoluído; o warm start reutiliza o Y do quadro anterior) (str, padrão: 'rgb')
+        writer_options: Opções do gravador assíncrono (dict com max_workers,
+            bit_depth, compression, quality e/ou quantization; ver AsyncImageWriter)
+        **kwargs: Parâmetros específicos do algoritmo
+
+    Returns:
+        dict com 'frames' (int), 'elapsed' (float, segundos) e 'fps' (float)
+
+    Raises:
+        ValueError: Se o algoritmo ou o modo de cor forem inválidos
+    """
+    if color_mode not in COLOR_MODES:
+        raise ValueError(f"Modo de cor '{color_mode}' inválido. Opções: {', '.join(COLOR_MODES)}")
+    algorithm = get_algorithm(algorithm_name)
+    use_warm_start = warm_start and algorithm.supports_warm_start
+    os.makedirs(output_dir, exist_ok=True)
+
+    frame_queue = queue.Queue(maxsize=max(1, prefetch))
+    stop_event = threading.Event()
+
+    reader = threading.Thread(target=_reader, args=(source, frame_queue, stop_event), daemon=True)
+    # Gravação em um pool de threads, com no máximo `prefetch` quadros aguardando codificação
+    writer_options = dict(writer_options or {})
+    writer_options.setdefault('max_pending', max(1, prefetch))
+
+    if logger:
+        mode = "com warm start" if use_warm_start else "sem warm start"
+        logger.info(f"Iniciando deconvolução de sequência com '{algorithm_name}' ({mode})")
+
+    start = time.perf_counter()
+    reader.start()
+
+    num_frames = 0
+    previous = None
+    try:
+        # Ao sair do bloco, aguarda os quadros ainda em codificação
+        # (propagando o primeiro erro de gravação)
+        with AsyncImageWriter(**writer_options) as writer:
+            while True:
+                item = frame_queue.get()
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+
+                name, frame = item
+
+                def deconvolve_frame(image):
+                    # Guarda o resultado (RGB ou apenas Y) como estimativa inicial do próximo quadro
+                    nonlocal previous
+                    params = dict(kwargs)
+                    if use_warm_start and previous is not None and previous.shape == image.shape:
+                        params['initial_estimate'] = previous
+                    previous = algorithm.deconvolve(image, psf, **params)
+                    return previous
+
+                if color_mode == 'luminance' and is_color_image(frame, psf):
+                    deconvolved = deconvolve_luminance(frame, deconvolve_frame, clip=kwargs.get('clip', True))
+                else:
+                    deconvolved = deconvolve_frame(frame)
+                num_frames += 1
+
+                writer.submit(deconvolved, os.path.join(output_dir, f"{name}.{output_format}"))
+
+                if logger:
+                    fps = num_frames / (time.perf_counter() - start)
+                    logger.info(f"Quadro {num_frames} ({name}) processado - {fps:.2f} quadros/s")
+                    logger.progress('quadros', num_frames)
+    finally:
+        stop_event.set()
+
+    elapsed = time.perf_counter() - start
+    fps = num_frames / elapsed if elapsed > 0 else 0.0
+    if logger:
+        logger.info(f"Sequência concluída: {num_frames} quadros em {elapsed:.2f}s ({fps:.2f} quadros/s)")
+
+    return {'frames': num_frames, 'elapsed': elapsed, 'fps': fps}
@@ -0,0 +1,393 @@
+"""
+Deconvolução com PSF espacialmente variável.
+
+Lentes reais borram de forma diferente no centro e nos cantos do quadro.
+Neste modo a imagem é dividida em uma grade de regiões, cada uma com sua
+PSF local. Cada região é estendida por uma sobreposição (onde as regiões
+vizinhas são misturadas com pesos de janela cosseno, que somam 1) e por
+uma margem (descartada, para absorver os efeitos de borda), e todas as
+regiões são deconvoluídas com suas PSFs.
+
+Para o Richardson-Lucy as regiões têm o mesmo tamanho e são processadas
+em lote: as FFTs de todas as regiões (e canais) são feitas em uma única
+chamada sobre um array (N, H, W), com as OTFs locais empilhadas, de modo
+que o custo fica próximo ao de uma única execução sobre a imagem inteira.
+Os demais algoritmos processam as regiões em paralelo em um pool de threads.
+"""
+
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from scipy import fft as sp_fft
+from .algorithms import get_algorithm
+from .algorithms.convolution import psf_to_otf
+from .color import COLOR_MODES, deconvolve_luminance, is_color_image
+from .psf_generator import generate_gaussian_psf, normalize_psf
+from .tiling import merge_region_info, region_kwargs
+from .utils import load_image, to_float
+
+
+# Fração padrão do tamanho de cada região usada como sobreposição com as vizinhas
+DEFAULT_OVERLAP = 0.1
+
+
+def parse_grid_shape(text):
+    """
+    Converte um texto 'LxC' (linhas x colunas) em uma tupla de inteiros.
+
+    Args:
+        text: Texto como '3x3'
+
+    Returns:
+        Tupla (linhas, colunas)
+
+    Raises:
+        ValueError: Se o texto for inválido ou tiver valores não positivos
+    """
+    try:
+        rows, cols = (int(part) for part in str(text).lower().split('x'))
+    except ValueError:
+        raise ValueError(f"Grade inválida: '{text}' (use linhas x colunas, por exemplo 3x3)")
+    if rows <= 0 or cols <= 0:
+        raise ValueError(f"Grade inválida: '{text}' (linhas e colunas devem ser positivas)")
+    return rows, cols
+
+
+def generate_psf_grid(grid_shape, make_psf):
+    """
+    Gera uma grade de PSFs chamando uma função para cada região.
+
+    Args:
+        grid_shape: Número de regiões (linhas, colunas)
+        make_psf: Função (linha, coluna) -> PSF 2-D; todas as PSFs devem ter o mesmo shape
+
+    Returns:
+        numpy.ndarray: Grade com shape (linhas, colunas, kh, kw)
+
+    Raises:
+        ValueError: Se as PSFs geradas tiverem shapes diferentes
+    """
+    rows, cols = grid_shape
+    psfs = [[np.asarray(make_psf(row, col), dtype=np.float64) for col in range(cols)] for row in range(rows)]
+    shapes = {psf.shape for line in psfs for psf in line}
+    if len(shapes) != 1:
+        raise ValueError(f"Todas as PSFs da grade devem ter o mesmo shape, recebidos {sorted(shapes)}")
+    return np.array(psfs)
+
+
+def generate_gaussian_psf_grid(grid_shape, size, sigma_center, sigma_corner):
+    """
+    Gera uma grade de PSFs gaussianas cujo sigma cresce do centro para os cantos.
+
+    O sigma de cada região é interpolado linearmente pela distância (normalizada)
+    entre o centro da região e o centro do quadro, modelando o borrão típico
+    de lentes, maior nas bordas.
+
+    Args:
+        grid_shape: Número de regiões (linhas, colunas)
+        size: Tamanho das PSFs (int)
+        sigma_center: Sigma no centro do quadro (float)
+        sigma_corner: Sigma nos cantos do quadro (float)
+
+    Returns:
+        numpy.ndarray: Grade com shape (linhas, colunas, size, size)
+    """
+    rows, cols = grid_shape
+
+    def make_psf(row, col):
+        # Centro da região em coordenadas normalizadas [-1, 1]
+        y = (2 * row + 1) / rows - 1
+        x = (2 * col + 1) / cols - 1
+        radius = math.hypot(x, y) / math.sqrt(2)
+        return generate_gaussian_psf(size, sigma_center + (sigma_corner - sigma_center) * radius)
+
+    return generate_psf_grid(grid_shape, make_psf)
+
+
+def load_psf_grid(paths, grid_shape=None):
+    """
+    Carrega uma grade de PSFs.
+
+    Args:
+        paths: Caminho de um arquivo .npy com shape (linhas, colunas, kh, kw), ou
+            lista de caminhos de imagens de PSF em ordem de linhas
+        grid_shape: Número de regiões (linhas, colunas), obrigatório para uma
+            lista de imagens
+
+    Returns:
+        numpy.ndarray: Grade normalizada com shape (linhas, colunas, kh, kw)
+
+    Raises:
+        ValueError: Se o arquivo ou o número de imagens não corresponderem a uma grade
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    paths = list(paths)
+
+    if len(paths) == 1 and str(paths[0]).lower().endswith('.npy'):
+        grid = np.load(paths[0]).astype(np.float64)
+        if grid.ndim == 3 and grid_shape is not None:
+            grid = grid.reshape(tuple(grid_shape) + grid.shape[1:])
+        if grid.ndim != 4:
+            raise ValueError(f"A grade de PSFs deve ter shape (linhas, colunas, kh, kw), recebido {grid.shape}")
+    else:
+        if grid_shape is None:
+            raise ValueError("O shape da grade (linhas x colunas) é obrigatório para uma lista de imagens")
+        rows, cols = grid_shape
+        if len(paths) != rows * cols:
+            raise ValueError(f"Grade {rows}x{cols} exige {rows * cols} PSFs, recebidas {len(paths)}")
+
+        def read(index):
+            psf = load_image(paths[index])
+            # PSFs coloridas são convertidas para escala de cinza
+            return psf.mean(axis=2) if psf.ndim == 3 else psf
+
+        grid = generate_psf_grid(grid_shape, lambda row, col: read(row * cols + col))
+
+    for index in np.ndindex(grid.shape[:2]):
+        grid[index] = normalize_psf(grid[index])
+    return grid
+
+
+def _axis_layout(size, cells, overlap, margin):
+    """
+    Calcula o posicionamento das regiões em um eixo.
+
+    Returns:
+        Tupla (cell, extension, pad_before, pad_after, starts): tamanho de
+        cada região, sobreposição em cada lado, extensão da imagem antes e
+        depois e início de cada região (em coordenadas da imagem)
+    """
+    cell = math.ceil(size / cells)
+    extension = int(round(overlap * cell)) if cells > 1 else 0
+    pad_before = extension + margin
+    pad_after = extension + margin + cells * cell - size
+    starts = [i * cell for i in range(cells)]
+    return cell, extension, pad_before, pad_after, starts
+
+
+def _axis_weights(index, cells, cell, extension, margin):
+    """
+    Pesos de mistura de uma região ao longo de um eixo.
+
+    Nas sobreposições os pesos seguem uma rampa sin²/cos², de modo que os
+    pesos de regiões vizinhas somam 1; a margem tem peso zero.
+    """
+    core = cell + 2 * extension
+    weights = np.ones(core)
+    if extension > 0:
+        t = (np.arange(2 * extension) + 0.5) / (2 * extension)
+        rise = np.sin(np.pi / 2 * t) ** 2
+        if index > 0:
+            weights[:2 * extension] = rise
+        if index < cells - 1:
+            weights[-2 * extension:] = rise[::-1]
+    return np.pad(weights, margin)
+
+
+def _batched_richardson_lucy(patches, forward_otfs, backward_otfs, fft_shape, num_iterations,
+                             workers=None, logger=None):
+    """
+    Richardson-Lucy sobre um lote de regiões (FFTs em lote nos dois últimos eixos).
+
+    Args:
+        patches: Regiões observadas (N, ..., H, W), já estendidas até fft_shape
+        forward_otfs: OTFs das PSFs (N, ..., H, W // 2 + 1), com broadcast sobre os eixos intermediários
+        backward_otfs: OTFs das PSFs rotacionadas em 180°
+        fft_shape: Shape (H, W) das FFTs
+        num_iterations: Número de iterações (int)
+        workers: Número de threads das FFTs (int ou None)
+        logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+
+    Returns:
+        numpy.ndarray: Estimativas (mesmo shape de patches)
+    """
+    axes = (-2, -1)
+    estimate = np.maximum(patches, 1e-10)
+    for iteration in range(num_iterations):
+        spectrum = sp_fft.rfftn(estimate, axes=axes, workers=workers)
+        spectrum *= forward_otfs
+        convolved = sp_fft.irfftn(spectrum, s=fft_shape, axes=axes, workers=workers)
+
+        np.maximum(convolved, 1e-10, out=convolved)
+        ratio = np.divide(patches, convolved, out=convolved)
+
+        spectrum = sp_fft.rfftn(ratio, axes=axes, workers=workers)
+        spectrum *= backward_otfs
+        estimate *= sp_fft.irfftn(spectrum, s=fft_shape, axes=axes, workers=workers)
+        np.maximum(estimate, 0, out=estimate)
+
+        if logger:
+            logger.progress('psf_variavel', iteration + 1, num_iterations)
+    return estimate
+
+
+def deconvolve_spatially_varying(image, psf_grid, algorithm_name='richardson_lucy', logger=None,
+                                 overlap=DEFAULT_OVERLAP, margin=None, workers=None,
+                                 color_mode='rgb', batched=True, **kwargs):
+    """
+    Deconvolui uma imagem com uma grade de PSFs locais.
+
+    A imagem é dividida em linhas x colunas regiões (a forma da grade de
+    PSFs). Cada região é deconvoluída com sua PSF e misturada às vizinhas
+    com pesos de janela nas sobreposições.
+
+    Args:
+        image: Imagem de entrada 2-D (numpy.ndarray, pode ser RGB ou grayscale)
+        psf_grid: Grade de PSFs (numpy.ndarray com shape (linhas, colunas, kh, kw))
+        algorithm_name: Nome do algoritmo a ser usado (str, padrão: 'richardson_lucy')
+        logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+        overlap: Fração do tamanho de cada região estendida sobre as vizinhas
+            em cada lado (float entre 0 e 0.5, padrão: 0.1)
+        margin: Margem descartada em volta de cada região (int ou None para 2x o tamanho da PSF)
+        workers: Número de threads (FFTs em lote ou regiões em paralelo; None usa todos os núcleos)
+        color_mode: 'rgb' ou 'luminance' (str, padrão: 'rgb')
+        batched: Se True, usa o Richardson-Lucy em lote quando possível (bool, padrão: True)
+        **kwargs: Parâmetros específicos do algoritmo
+
+    Returns:
+        numpy.ndarray: Imagem deconvoluída (float64)
+
+    Raises:
+        ValueError: Se a grade, a sobreposição ou o modo de cor forem inválidos
+    """
+    if color_mode not in COLOR_MODES:
+        raise ValueError(f"Modo de cor '{color_mode}' inválido. Opções: {', '.join(COLOR_MODES)}")
+    psf_grid = np.asarray(psf_grid, dtype=np.float64)
+    if psf_grid.ndim != 4:
+        raise ValueError(f"A grade de PSFs deve ter shape (linhas, colunas, kh, kw), recebido {psf_grid.shape}")
+    if not 0 <= overlap <= 0.5:
+        raise ValueError(f"Sobreposição deve estar entre 0 e 0.5, recebido {overlap}")
+
+    psf_shape = psf_grid.shape[2:]
+    if color_mode == 'luminance' and is_color_image(image, psf_grid[0, 0]):
+        return deconvolve_luminance(
+            image,
+            lambda luminance: deconvolve_spatially_varying(
+                luminance, psf_grid, algorithm_name, logger, overlap, margin, workers, batched=batched, **kwargs
+            ),
+            clip=kwargs.get('clip', True),
+            logger=logger
+        )
+
+    image = to_float(np.asarray(image))
+    # PSFs normalizadas uma vez, para que o caminho em lote e o por região usem as mesmas
+    psf_grid = np.array([[normalize_psf(psf) for psf in row] for row in psf_grid])
+    rows, cols = psf_grid.shape[:2]
+    height, width = image.shape[:2]
+    if rows > height or cols > width:
+        raise ValueError(f"Grade {rows}x{cols} maior que a imagem ({width}x{height})")
+    if margin is None:
+        margin = 2 * max(psf_shape)
+    workers = workers or os.cpu_count() or 1
+
+    cell_y, ext_y, before_y, after_y, starts_y = _axis_layout(height, rows, overlap, margin)
+    cell_x, ext_x, before_x, after_x, starts_x = _axis_layout(width, cols, overlap, margin)
+    patch_shape = (cell_y + 2 * (ext_y + margin), cell_x + 2 * (ext_x + margin))
+
+    if logger:
+        logger.info(f"PSF variável: grade {rows}x{cols}, regiões de {patch_shape[1]}x{patch_shape[0]} "
+                    f"(sobreposição {ext_x}x{ext_y}, margem {margin})")
+
+    # Imagem estendida de forma simétrica: todas as regiões viram fatias de mesmo tamanho
+    pad_width = ((before_y, after_y), (before_x, after_x)) + ((0, 0),) * (image.ndim - 2)
+    padded = np.pad(image, pad_width, mode='symmetric')
+    windows = [(row, col, (slice(y, y + patch_shape[0]), slice(x, x + patch_shape[1])))
+               for row, y in enumerate(starts_y) for col, x in enumerate(starts_x)]
+
+    clip = kwargs.get('clip', True)
+    if batched and algorithm_name == 'richardson_lucy' and _supports_batch(kwargs):
+        num_iterations = kwargs.get('num_iterations', 30)
+        results = _deconvolve_batch(padded, windows, psf_grid, patch_shape, num_iterations, workers, logger)
+        if kwargs.get('info') is not None:
+            kwargs['info']['iterations'] = num_iterations
+    else:
+        params = dict(kwargs, clip=False)
+        if params.get('initial_estimate') is not None:
+            # Estimativa estendida como a imagem, para ser recortada com as mesmas janelas
+            params['initial_estimate'] = np.pad(to_float(np.asarray(params['initial_estimate'])),
+                                                pad_width, mode='symmetric')
+        results = _deconvolve_each(padded, windows, psf_grid, algorithm_name, workers, logger, params)
+
+    # Mistura das regiões com pesos de janela (que somam 1 dentro da imagem)
+    output = np.zeros(padded.shape, dtype=np.float64)
+    weight_sum = np.zeros(padded.shape[:2], dtype=np.float64)
+    weights_y = [_axis_weights(i, rows, cell_y, ext_y, margin) for i in range(rows)]
+    weights_x = [_axis_weights(i, cols, cell_x, ext_x, margin) for i in range(cols)]
+    for (row, col, window), result in zip(windows, results):
+        weights = np.outer(weights_y[row], weights_x[col])
+        weight_sum[window] += weights
+        if result.ndim > 2:
+            weights = weights[..., np.newaxis]
+        output[window] += weights * result
+
+    crop = (slice(before_y, before_y + height), slice(before_x, before_x + width))
+    weight_sum = np.maximum(weight_sum[crop], 1e-12)
+    output = output[crop] / (weight_sum[..., np.newaxis] if image.ndim > 2 else weight_sum)
+
+    if clip:
+        np.clip(output, 0, 1, out=output)
+    return output
+
+
+def _supports_batch(kwargs):
+    """Indica se o Richardson-Lucy em lote respeita os parâmetros (senão, cada região é processada à parte)."""
+    return (kwargs.get('stopping', 'fixed') == 'fixed'
+            and kwargs.get('method', 'auto') in ('auto', 'fft')
+            and kwargs.get('threads', 1) in (None, 1)
+            and kwargs.get('initial_estimate') is None)
+
+
+def _deconvolve_batch(padded, windows, psf_grid, patch_shape, num_iterations, workers, logger):
+    """Deconvolui todas as regiões com o Richardson-Lucy em lote."""
+    fft_shape = tuple(sp_fft.next_fast_len(s, real=True) for s in patch_shape)
+    channels = padded.shape[2:]
+
+    # (N, H, W[, C]) -> (N[, C], H, W), estendido de forma simétrica até o tamanho da FFT
+    patches = np.stack([padded[window] for _, _, window in windows])
+    if channels:
+        patches = np.moveaxis(patches, -1, 1)
+    extend = ((0, 0),) * (patches.ndim - 2) + tuple((0, f - s) for f, s in zip(fft_shape, patch_shape))
+    patches = np.pad(patches, extend, mode='symmetric')
+
+    forward = np.stack([psf_to_otf(psf_grid[row, col], fft_shape) for row, col, _ in windows])
+    backward = np.stack([psf_to_otf(psf_grid[row, col][::-1, ::-1], fft_shape) for row, col, _ in windows])
+    if channels:
+        # Mesma OTF para todos os canais de uma região (broadcast)
+        forward = forward[:, np.newaxis]
+        backward = backward[:, np.newaxis]
+
+    if logger:
+        logger.info(f"Richardson-Lucy em lote: {len(windows)} regiões, FFTs de "
+                    f"{fft_shape[1]}x{fft_shape[0]}, {num_iterations} iterações")
+    estimates = _batched_richardson_lucy(patches, forward, backward, fft_shape, num_iterations, workers, logger)
+
+    estimates = estimates[..., :patch_shape[0], :patch_shape[1]]
+    if channels:
+        estimates = np.moveaxis(estimates, 1, -1)
+    return list(estimates)
+
+
+def _deconvolve_each(padded, windows, psf_grid, algorithm_name, workers, logger, kwargs):
+    """Deconvolui as regiões uma a uma, em paralelo em um pool de threads."""
+    algorithm = get_algorithm(algorithm_name)
+    total = len(windows)
+    if logger:
+        logger.info(f"Deconvoluindo {total} regiões com '{algorithm_name}' em {min(workers, total)} threads")
+
+    def process(item):
+        row, col, window = item
+        params, region_info = region_kwargs(kwargs, window)
+        return algorithm.deconvolve(padded[window], psf_grid[row, col], **params), region_info
+
+    results = []
+    region_infos = []
+    with ThreadPoolExecutor(max_workers=min(workers, total)) as executor:
+        for completed, (result, region_info) in enumerate(executor.map(process, windows), start=1):
+            results.append(result)
+            region_infos.append(region_info)
+            if logger:
+                logger.progress('psf_variavel', completed, total)
+    merge_region_info(kwargs.get('info'), region_infos)
+    return results
@@ -0,0 +1,148 @@
+"""
+Divisão de imagens em blocos (tiles) com margens sobrepostas.
+
+Cada bloco é processado com uma margem extra ao redor, descartada ao
+colar o resultado de volta, para reduzir artefatos de borda causados
+pela extensão da PSF.
+"""
+
+import itertools
+import math
+import numpy as np
+
+
+# Parâmetros com um valor por pixel, recortados junto com cada bloco
+PER_PIXEL_KWARGS = ('initial_estimate',)
+
+
+class Tile:
+    """
+    Bloco de uma imagem.
+
+    Attributes:
+        outer: Fatias do bloco com margem, em coordenadas da imagem (tupla de slices)
+        inner: Fatias do bloco sem margem, em coordenadas da imagem (tupla de slices)
+        local: Fatias do bloco sem margem, relativas ao bloco com margem (tupla de slices)
+    """
+
+    def __init__(self, outer, inner, local):
+        self.outer = outer
+        self.inner = inner
+        self.local = local
+
+    @property
+    def shape(self):
+        """Shape do bloco com margem."""
+        return tuple(s.stop - s.start for s in self.outer)
+
+    def __repr__(self):
+        inner = ', '.join(f"{s.start}:{s.stop}" for s in self.inner)
+        return f"Tile([{inner}])"
+
+
+def split_tiles(shape, tile_shape, margin=0):
+    """
+    Divide um domínio em blocos com margens sobrepostas.
+
+    Args:
+        shape: Shape espacial da imagem (tupla)
+        tile_shape: Shape máximo de cada bloco sem margem (int ou tupla)
+        margin: Margem adicionada em cada lado do bloco (int ou tupla, padrão: 0)
+
+    Returns:
+        Lista de Tile cobrindo todo o domínio sem sobreposição dos blocos internos
+    """
+    ndim = len(shape)
+    if isinstance(tile_shape, int):
+        tile_shape = (tile_shape,) * ndim
+    if isinstance(margin, int):
+        margin = (margin,) * ndim
+
+    ranges = []
+    for size, tile, pad in zip(shape, tile_shape, margin):
+        tile = max(1, min(int(tile), size))
+        axis = []
+        for start in range(0, size, tile):
+            stop = min(start + tile, size)
+            outer_start = max(0, start - pad)
+            outer_stop = min(size, stop + pad)
+            axis.append((
+                slice(outer_start, outer_stop),
+                slice(start, stop),
+                slice(start - outer_start, stop - outer_start),
+            ))
+        ranges.append(axis)
+
+    tiles = []
+    for combination in itertools.product(*ranges):
+        outer = tuple(item[0] for item in combination)
+        inner = tuple(item[1] for item in combination)
+        local = tuple(item[2] for item in combination)
+        tiles.append(Tile(outer, inner, local))
+    return tiles
+
+
+def region_kwargs(kwargs, index):
+    """
+    Prepara os parâmetros do algoritmo para uma região (bloco e/ou canal) da imagem.
+
+    Os parâmetros por pixel (como initial_estimate) são recortados com o
+    mesmo índice da região e, se houver um dicionário info, a região recebe
+    o seu próprio, para ser combinado depois com merge_region_info.
+
+    Args:
+        kwargs: Parâmetros do algoritmo para a imagem inteira (dict)
+        index: Índice da região na imagem (tupla de slices e/ou inteiros)
+
+    Returns:
+        Tupla (parâmetros da região, info da região ou None)
+    """
+    region = dict(kwargs)
+    for name in PER_PIXEL_KWARGS:
+        if region.get(name) is not None:
+            region[name] = np.asarray(region[name])[index]
+    region_info = None
+    if kwargs.get('info') is not None:
+        region_info = {}
+        region['info'] = region_info
+    return region, region_info
+
+
+def merge_region_info(info, region_infos):
+    """
+    Combina em info as informações de cada região, como o Richardson-Lucy combina as dos canais.
+
+    Args:
+        info: Dicionário da imagem inteira (dict ou None)
+        region_infos: Dicionários das regiões, na ordem das regiões (lista)
+    """
+    if info is None:
+        return
+    info['regions'] = region_infos
+    if region_infos and all('iterations' in region for region in region_infos):
+        info['iterations'] = max(region['iterations'] for region in region_infos)
+        info['residuals'] = [region.get('residuals') for region in region_infos]
+        info['noise_sigma'] = [region.get('noise_sigma') for region in region_infos]
+
+
+def tile_shape_for_count(shape, count):
+    """
+    Calcula um shape de bloco que divide o domínio em aproximadamente `count` blocos.
+
+    Args:
+        shape: Shape espacial da imagem (tupla)
+        count: Número desejado de blocos (int)
+
+    Returns:
+        Tupla com o shape de cada bloco
+    """
+    count = max(1, int(count))
+    ndim = len(shape)
+    # Divide primeiro os eixos maiores
+    divisions = [1] * ndim
+    while math.prod(divisions) < count:
+        axis = max(range(ndim), key=lambda a: shape[a] / divisions[a])
+        if shape[axis] // (divisions[axis] + 1) < 1:
+            break
+        divisions[axis] += 1
+    return tuple(math.ceil(size / div) for size, div in zip(shape, divisions))
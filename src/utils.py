@@ -1,61 +1,345 @@
 """
 Funções utilitárias para carregamento e salvamento de imagens.
+
+As imagens são lidas na profundidade de bits original (8 ou 16 bits,
+ponto flutuante) e convertidas para o dtype pedido em uma única passada.
+Arquivos .npy e dados brutos (.raw/.bin) são abertos com memory-mapping,
+de modo que os pixels só são lidos do disco quando acessados. Erros são
+propagados como exceções, para que a biblioteca possa ser usada por
+outros programas.
 """
 
-import sys
+import os
 import numpy as np
-from PIL import Image
+from PIL import Image, ImageSequence
+
+
+# Extensões de arquivos de dados brutos (sem cabeçalho)
+RAW_EXTENSIONS = ('.raw', '.bin')
+
+# Extensões TIFF (aceitam saída de 16 bits e ponto flutuante)
+TIFF_EXTENSIONS = ('.tif', '.tiff')
+
+# Profundidades de bits aceitas por save_image (32 = ponto flutuante)
+BIT_DEPTHS = (8, 16, 32)
+
+# Modos de quantização para saídas inteiras
+QUANTIZATION_MODES = ('truncate', 'round')
+
+# Modos PIL lidos sem conversão (os demais são convertidos para RGB)
+_NATIVE_MODES = ('L', 'RGB', 'I;16', 'I;16L', 'I;16B', 'I', 'F')
+
+# Interpretações de cor de TIFFs lidas com o tifffile (as demais são lidas com o PIL)
+_TIFFFILE_PHOTOMETRICS = ('MINISBLACK', 'RGB')
+
+
+def _tifffile():
+    """Retorna o módulo tifffile, se instalado (usado para TIFFs RGB de 16/32 bits)."""
+    try:
+        import tifffile
+    except ImportError:
+        return None
+    return tifffile
+
+
+def to_float(array, dtype=np.float64, out=None):
+    """
+    Converte pixels para ponto flutuante em uma única passada.
+
+    Inteiros sem sinal são normalizados pelo maior valor do tipo (255 para
+    8 bits, 65535 para 16 bits); valores em ponto flutuante são mantidos.
+    Se o array já tiver o dtype pedido, ele é retornado sem cópia (um
+    memmap continua sendo lido sob demanda).
+
+    Args:
+        array: Pixels (numpy.ndarray ou numpy.memmap)
+        dtype: dtype de ponto flutuante desejado (padrão: float64)
+        out: Array opcional onde o resultado é escrito
+
+    Returns:
+        numpy.ndarray: Pixels em ponto flutuante
+    """
+    dtype = np.dtype(dtype)
+    if array.dtype.kind in 'ui':
+        scale = 1.0 / np.iinfo(array.dtype).max
+        if out is None:
+            return np.multiply(array, scale, dtype=dtype)
+        return np.multiply(array, scale, out=out, casting='unsafe')
+    if out is None:
+        return array.astype(dtype, copy=False)
+    out[...] = array
+    return out
+
+
+def _normalize_channels(array):
+    """
+    Reduz os canais de um array lido sem o PIL aos mesmos das imagens PIL (L ou RGB).
+
+    Imagens binárias viram 0/255, cinza com alfa vira RGB (como a conversão
+    LA -> RGB do PIL) e canais além do terceiro (alfa) são descartados.
+    """
+    if array.dtype == bool:
+        return array.astype(np.uint8) * 255
+    if array.ndim != 3:
+        return array
+    channels = array.shape[-1]
+    if channels == 1:
+        return array[..., 0]
+    if channels == 2:
+        return np.repeat(array[..., :1], 3, axis=-1)
+    return array[..., :3]
+
+
+def _read_tiff(image_path):
+    """
+    Lê a primeira página de um TIFF com o tifffile (preserva RGB de 16/32 bits).
+
+    Returns:
+        numpy.ndarray com os canais normalizados como em pil_to_array, ou None
+        se a interpretação das cores (paleta, CMYK etc.) deve ficar com o PIL
+    """
+    with _tifffile().TiffFile(image_path) as tif:
+        page = tif.pages[0]
+        photometric = getattr(page.photometric, 'name', page.photometric)
+        if photometric not in _TIFFFILE_PHOTOMETRICS:
+            return None
+        return _normalize_channels(page.asarray())
+
+
+def pil_to_array(img, dtype=np.float64):
+    """
+    Converte uma imagem PIL para array numpy, preservando a profundidade de bits.
+
+    Args:
+        img: Imagem PIL
+        dtype: dtype desejado (padrão: float64, normalizado entre 0 e 1);
+            None retorna os pixels no tipo original (uint8, uint16 ou float32)
+
+    Returns:
+        numpy.ndarray: Imagem como array numpy
+    """
+    # Converter para RGB se necessário (paleta, RGBA, CMYK etc.)
+    if img.mode == '1':
+        img = img.convert('L')
+    elif img.mode not in _NATIVE_MODES:
+        img = img.convert('RGB')
+
+    array = np.asarray(img)
+    if img.mode == 'I':
+        # PNGs de 16 bits podem ser abertos no modo 'I' (inteiros de 32 bits)
+        array = np.clip(array, 0, 65535).astype(np.uint16)
+
+    return array if dtype is None else to_float(array, dtype)
 
 
-def load_image(image_path):
+def load_image(image_path, dtype=np.float64, raw_shape=None, raw_dtype=None):
     """
     Carrega uma imagem do disco.
-    
+
+    Formatos de imagem comuns são lidos com PIL na profundidade de bits
+    original. Arquivos .npy e dados brutos (.raw/.bin) são abertos com
+    memory-mapping e convertidos apenas quando necessário.
+
     Args:
         image_path: Caminho para o arquivo de imagem
-    
+        dtype: dtype desejado (padrão: float64, normalizado entre 0 e 1);
+            None retorna os pixels no tipo original, sem conversão (útil para
+            converter por blocos depois, com to_float)
+        raw_shape: Shape dos dados brutos (tupla, obrigatório para .raw/.bin)
+        raw_dtype: dtype dos dados brutos (ex.: 'uint16' ou '<f4', obrigatório para .raw/.bin)
+
     Returns:
-        numpy.ndarray: Imagem como array numpy (valores normalizados entre 0 e 1)
+        numpy.ndarray: Imagem como array numpy
+
+    Raises:
+        OSError: Se o arquivo não puder ser lido
+        ValueError: Se faltar o shape/dtype de dados brutos ou se eles não
+            corresponderem ao tamanho do arquivo
     """
-    try:
-        img = Image.open(image_path)
-        # Converter para RGB se necessário
-        if img.mode != 'RGB' and img.mode != 'L':
-            img = img.convert('RGB')
-        
-        # Converter para array numpy e normalizar para [0, 1]
-        img_array = np.array(img, dtype=np.float64) / 255.0
-        
-        return img_array
-    except Exception as e:
-        print(f"Erro ao carregar imagem: {e}", file=sys.stderr)
-        sys.exit(1)
-
-
-def save_image(image_array, output_path):
+    extension = os.path.splitext(image_path)[1].lower()
+
+    if extension == '.npy':
+        array = np.load(image_path, mmap_mode='r')
+    elif extension in RAW_EXTENSIONS:
+        if raw_shape is None or raw_dtype is None:
+            raise ValueError(f"Arquivos {extension} exigem raw_shape e raw_dtype: '{image_path}'")
+        raw_shape = tuple(int(s) for s in raw_shape)
+        expected = int(np.prod(raw_shape)) * np.dtype(raw_dtype).itemsize
+        actual = os.path.getsize(image_path)
+        if actual != expected:
+            raise ValueError(
+                f"Tamanho de '{image_path}' ({actual} bytes) não corresponde ao shape "
+                f"{raw_shape} com dtype {np.dtype(raw_dtype)} ({expected} bytes)"
+            )
+        array = np.memmap(image_path, dtype=raw_dtype, mode='r', shape=raw_shape)
+    else:
+        array = None
+        if extension in TIFF_EXTENSIONS and _tifffile() is not None:
+            array = _read_tiff(image_path)
+        if array is None:
+            with Image.open(image_path) as img:
+                return pil_to_array(img, dtype)
+
+    return array if dtype is None else to_float(array, dtype)
+
+
+def save_image(image_array, output_path, bit_depth=8, compression=None, quality=None,
+               quantization='truncate'):
     """
     Salva uma imagem no disco.
-    
+
+    Com bit_depth=16 a imagem é salva com inteiros de 16 bits (PNG ou TIFF)
+    e com bit_depth=32 em ponto flutuante de 32 bits (TIFF, sem limitar os
+    valores). Arquivos .npy preservam o array como está. Imagens RGB de
+    16/32 bits exigem o pacote opcional tifffile.
+
     Args:
         image_array: Array numpy com a imagem (valores entre 0 e 1)
         output_path: Caminho para salvar a imagem
+        bit_depth: Profundidade de bits: 8, 16 ou 32 (int, padrão: 8)
+        compression: Nível de compressão de 0 (nenhuma, mais rápido) a 9 (máxima)
+            para PNG e TIFF (int ou None para o padrão do formato). Em TIFF o
+            nível do deflate exige o pacote tifffile; sem ele, o PIL só permite
+            ligar (1 a 9, nível padrão do zlib) ou desligar (0) a compressão
+        quality: Qualidade JPEG de 1 a 95 (int ou None para o padrão do PIL)
+        quantization: 'truncate' (padrão, compatível com versões anteriores) ou
+            'round' (valor inteiro mais próximo) para saídas de 8/16 bits
+
+    Raises:
+        OSError: Se o arquivo não puder ser gravado
+        ValueError: Se a profundidade de bits não for suportada pelo formato ou
+            se a quantização ou o nível de compressão forem inválidos
     """
-    try:
-        # Garantir que os valores estão no range [0, 1]
-        image_array = np.clip(image_array, 0, 1)
-        
-        # Converter para uint8 [0, 255]
-        image_array = (image_array * 255).astype(np.uint8)
-        
-        # Converter para PIL Image e salvar
-        if len(image_array.shape) == 3:
-            img = Image.fromarray(image_array, 'RGB')
-        else:
-            img = Image.fromarray(image_array, 'L')
-        
-        img.save(output_path)
-        print(f"Imagem salva em: {output_path}")
-    except Exception as e:
-        print(f"Erro ao salvar imagem: {e}", file=sys.stderr)
-        sys.exit(1)
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension == '.npy':
+        np.save(output_path, np.asarray(image_array))
+        return
+
+    bit_depth = int(bit_depth)
+    if bit_depth not in BIT_DEPTHS:
+        raise ValueError(f"Profundidade de bits {bit_depth} inválida. Opções: {', '.join(map(str, BIT_DEPTHS))}")
+    if bit_depth == 32 and extension not in TIFF_EXTENSIONS:
+        raise ValueError("Imagens em ponto flutuante (32 bits) só podem ser salvas em TIFF ou .npy")
+    if bit_depth == 16 and extension not in TIFF_EXTENSIONS + ('.png',):
+        raise ValueError("Imagens de 16 bits só podem ser salvas em PNG, TIFF ou .npy")
+
+    if quantization not in QUANTIZATION_MODES:
+        raise ValueError(f"Quantização '{quantization}' inválida. Opções: {', '.join(QUANTIZATION_MODES)}")
+    if compression is not None and not 0 <= int(compression) <= 9:
+        raise ValueError(f"Nível de compressão {compression} inválido (use de 0 a 9)")
+
+    pixels = _quantize(image_array, bit_depth, quantization)
+    is_rgb = pixels.ndim == 3
+
+    tifffile = _tifffile()
+    if is_rgb and bit_depth != 8 and (tifffile is None or extension not in TIFF_EXTENSIONS):
+        raise ValueError(f"Imagens RGB de {bit_depth} bits exigem saída TIFF e o pacote tifffile")
+    if extension in TIFF_EXTENSIONS and tifffile is not None and (compression is not None or is_rgb and bit_depth != 8):
+        # O tifffile aceita o nível do deflate (o PIL só liga ou desliga a compressão)
+        options = {} if not compression else {'compression': 'zlib', 'compressionargs': {'level': int(compression)}}
+        tifffile.imwrite(output_path, pixels, photometric='rgb' if is_rgb else 'minisblack', **options)
+        return
+
+    # Converter para PIL Image e salvar
+    if bit_depth == 8:
+        img = Image.fromarray(pixels, 'RGB' if is_rgb else 'L')
+    else:
+        # uint16 -> modo 'I;16', float32 -> modo 'F'
+        img = Image.fromarray(pixels)
+    img.save(output_path, **_encoder_options(extension, compression, quality))
+
+
+def _encoder_options(extension, compression, quality):
+    """Traduz compressão e qualidade para as opções do codificador PIL de cada formato."""
+    if extension == '.png' and compression is not None:
+        return {'compress_level': max(0, min(9, int(compression)))}
+    if extension in TIFF_EXTENSIONS and compression is not None:
+        return {'compression': 'tiff_adobe_deflate' if int(compression) > 0 else 'raw'}
+    if extension in ('.jpg', '.jpeg') and quality is not None:
+        return {'quality': max(1, min(95, int(quality)))}
+    return {}
+
+
+def _quantize(image_array, bit_depth, quantization='truncate'):
+    """Converte pixels em [0, 1] para o tipo de saída correspondente à profundidade de bits."""
+    if bit_depth == 32:
+        return np.asarray(image_array, dtype=np.float32)
+    dtype = np.uint8 if bit_depth == 8 else np.uint16
+    maximum = np.iinfo(dtype).max
+    # Garantir que os valores estão no range [0, 1] e converter para [0, maximum]
+    scaled = np.multiply(image_array, maximum, dtype=np.float64)
+    np.clip(scaled, 0, maximum, out=scaled)
+    if quantization == 'round':
+        np.rint(scaled, out=scaled)
+    return scaled.astype(dtype)
+
+
+def load_stack(stack_path, mmap=True, dtype=np.float64):
+    """
+    Carrega um volume (z-stack) do disco.
+
+    Arquivos .npy são abertos com memory-mapping (np.load com mmap_mode='r'),
+    de modo que os dados só são lidos do disco quando acessados. TIFFs
+    multipágina são lidos página a página em um único array (Z, H, W[, C]).
+
+    Args:
+        stack_path: Caminho para o arquivo .npy ou TIFF multipágina
+        mmap: Se True, usa memory-mapping para arquivos .npy (bool, padrão: True)
+        dtype: dtype desejado (padrão: float64); None mantém o tipo original
+
+    Returns:
+        numpy.ndarray: Volume como array numpy
+
+    Raises:
+        OSError: Se o arquivo não puder ser lido
+    """
+    if os.path.splitext(stack_path)[1].lower() == '.npy':
+        volume = np.load(stack_path, mmap_mode='r' if mmap else None)
+        return volume if dtype is None else to_float(volume, dtype)
+
+    with Image.open(stack_path) as img:
+        num_pages = getattr(img, 'n_frames', 1)
+        volume = None
+        for index, page in enumerate(ImageSequence.Iterator(img)):
+            page_array = pil_to_array(page, dtype=None)
+            if volume is None:
+                volume = np.empty((num_pages,) + page_array.shape, dtype=dtype or page_array.dtype)
+            if dtype is None:
+                volume[index] = page_array
+            else:
+                to_float(page_array, out=volume[index])
+    return volume
+
+
+def save_stack(volume, output_path, bit_depth=8):
+    """
+    Salva um volume (z-stack) no disco.
+
+    Arquivos .npy preservam os valores em ponto flutuante; outros formatos
+    são salvos como TIFF multipágina de 8 ou 16 bits, ou de ponto flutuante
+    (32 bits, apenas volumes sem canais de cor).
+
+    Args:
+        volume: Array numpy com o volume (Z, H, W[, C]) (valores entre 0 e 1)
+        output_path: Caminho para salvar o volume
+        bit_depth: Profundidade de bits das páginas TIFF: 8, 16 ou 32 (int, padrão: 8)
+
+    Raises:
+        OSError: Se o arquivo não puder ser gravado
+        ValueError: Se a profundidade de bits não for suportada
+    """
+    if os.path.splitext(output_path)[1].lower() == '.npy':
+        np.save(output_path, volume)
+        return
 
+    bit_depth = int(bit_depth)
+    if bit_depth not in BIT_DEPTHS:
+        raise ValueError(f"Profundidade de bits {bit_depth} inválida. Opções: {', '.join(map(str, BIT_DEPTHS))}")
+    pages = _quantize(volume, bit_depth)
+    if pages.ndim == 4 and bit_depth != 8:
+        raise ValueError(f"Volumes RGB só podem ser salvos em TIFF de 8 bits ou .npy (pedido: {bit_depth} bits)")
+    if bit_depth == 8:
+        images = [Image.fromarray(page, 'RGB' if pages.ndim == 4 else 'L') for page in pages]
+    else:
+        images = [Image.fromarray(page) for page in pages]
+    images[0].save(output_path, save_all=True, append_images=images[1:])
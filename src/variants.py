@@ -0,0 +1,163 @@
+"""
+Execução de variantes de parâmetros para comparação.
+
+Gera combinações de parâmetros (por exemplo, três valores de sigma da PSF
+ou de número de iterações) e as deconvolui concorrentemente em um pool de
+threads. Todas as variantes compartilham a mesma imagem de entrada, sem
+cópias, e cada resultado é entregue assim que fica pronto.
+"""
+
+import asyncio
+import itertools
+from .async_deconvolution import AsyncDeconvolver
+from .psf_generator import DEFAULT_PSF_ENERGY, crop_psf, generate_gaussian_psf, generate_motion_psf
+
+
+# Número máximo de variantes de uma grade
+MAX_VARIANTS = 12
+
+# Parâmetros de PSF de cada tipo de blur (os demais são parâmetros do algoritmo)
+PSF_PARAMETERS = {
+    'gaussian': ('size', 'sigma'),
+    'motion': ('size', 'length', 'angle'),
+}
+
+
+def parse_values(text):
+    """
+    Converte um texto com valores separados por vírgula em uma lista de floats.
+
+    Args:
+        text: Texto como '2, 3.5, 5'
+
+    Returns:
+        Lista de floats
+
+    Raises:
+        ValueError: Se algum valor não for numérico ou se a lista estiver vazia
+    """
+    parts = [part.strip() for part in str(text).split(',') if part.strip()]
+    if not parts:
+        raise ValueError("Informe ao menos um valor (por exemplo: 2, 3, 5)")
+    try:
+        return [float(part) for part in parts]
+    except ValueError:
+        raise ValueError(f"Valores inválidos: '{text}' (use números separados por vírgula)")
+
+
+def make_psf(blur_type, params, energy=DEFAULT_PSF_ENERGY):
+    """
+    Gera a PSF de uma variante, recortada ao seu suporte real.
+
+    Args:
+        blur_type: 'gaussian' ou 'motion' (str)
+        params: Dicionário com os parâmetros da PSF (size, sigma ou length/angle)
+        energy: Fração da energia mantida no recorte (float, padrão: 0.999)
+
+    Returns:
+        numpy.ndarray: PSF normalizada
+
+    Raises:
+        ValueError: Se o tipo de blur for inválido
+    """
+    if blur_type == 'gaussian':
+        psf = generate_gaussian_psf(int(params['size']), float(params['sigma']))
+    elif blur_type == 'motion':
+        psf = generate_motion_psf(int(params['size']), float(params['length']), float(params['angle']))
+    else:
+        raise ValueError(f"Tipo de blur '{blur_type}' inválido. Opções: {', '.join(PSF_PARAMETERS)}")
+    return crop_psf(psf, energy)
+
+
+def split_params(blur_type, params):
+    """Separa os parâmetros de uma variante em (parâmetros da PSF, parâmetros do algoritmo)."""
+    psf_names = PSF_PARAMETERS.get(blur_type, ())
+    psf_params = {name: value for name, value in params.items() if name in psf_names}
+    algo_params = {name: value for name, value in params.items() if name not in psf_names}
+    return psf_params, algo_params
+
+
+def expand_variants(base, axes):
+    """
+    Gera todas as combinações dos valores variados.
+
+    Valores de parâmetros inteiros na configuração base (como size e
+    num_iterations) são arredondados para inteiros.
+
+    Args:
+        base: Parâmetros comuns a todas as variantes (dict)
+        axes: Dicionário nome -> lista de valores a variar
+
+    Returns:
+        Lista de dicionários de parâmetros, um por variante
+
+    Raises:
+        ValueError: Se não houver valores ou se a grade exceder MAX_VARIANTS
+    """
+    names = list(axes)
+    combinations = list(itertools.product(*(axes[name] for name in names)))
+    if not combinations or not names:
+        raise ValueError("Nenhuma variante para executar")
+    if len(combinations) > MAX_VARIANTS:
+        raise ValueError(f"Grade com {len(combinations)} variantes excede o máximo de {MAX_VARIANTS}")
+
+    variants = []
+    for values in combinations:
+        params = dict(base)
+        for name, value in zip(names, values):
+            params[name] = int(round(value)) if isinstance(base.get(name), int) else value
+        variants.append(params)
+    return variants
+
+
+def variant_label(params, axes):
+    """Descreve uma variante pelos parâmetros que variam (por exemplo 'sigma=3')."""
+    return ', '.join(f"{name}={params[name]:g}" for name in axes)
+
+
+def variant_jobs(image, blur_type, algorithm_name, variants):
+    """
+    Monta os trabalhos (image, psf, params) das variantes.
+
+    Todas as tuplas referenciam o mesmo array de entrada.
+
+    Args:
+        image: Imagem de entrada (numpy.ndarray)
+        blur_type: 'gaussian' ou 'motion' (str)
+        algorithm_name: Nome do algoritmo (str)
+        variants: Lista de dicionários de parâmetros (como retornada por expand_variants)
+
+    Returns:
+        Lista de tuplas (image, psf, params) aceitas por AsyncDeconvolver.map
+    """
+    jobs = []
+    for params in variants:
+        psf_params, algo_params = split_params(blur_type, params)
+        jobs.append((image, make_psf(blur_type, psf_params), dict(algo_params, algorithm_name=algorithm_name)))
+    return jobs
+
+
+def run_variants(jobs, max_workers=None, logger=None, on_result=None):
+    """
+    Deconvolui as variantes concorrentemente em um pool de threads.
+
+    Args:
+        jobs: Lista de tuplas (image, psf, params) (veja variant_jobs)
+        max_workers: Número de threads (int ou None para o padrão do executor)
+        logger: Logger opcional para mensagens de progresso (DeconvolutionLogger)
+        on_result: Função opcional chamada com cada JobProgress assim que a
+            variante termina (na thread que executa run_variants)
+
+    Returns:
+        Lista de JobProgress na ordem das variantes (com result ou error)
+    """
+    async def consume():
+        events = [None] * len(jobs)
+        async with AsyncDeconvolver('thread', max_workers=max_workers, logger=logger) as deconvolver:
+            async for progress in deconvolver.map(jobs):
+                events[progress.index] = progress
+                if on_result:
+                    on_result(progress)
+        return events
+
+    return asyncio.run(consume())
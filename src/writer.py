@@ -0,0 +1,128 @@
+"""
+Gravação assíncrona de imagens de saída.
+
+A codificação PNG/TIFF de imagens grandes pode levar tanto tempo quanto
+a própria deconvolução. AsyncImageWriter codifica e grava os arquivos em
+um pool de threads (a compressão do PIL libera o GIL), enquanto a thread
+de cálculo já processa a próxima imagem. O número de imagens pendentes é
+limitado, de modo que a memória não cresce se a gravação for mais lenta
+que o cálculo.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .utils import save_image
+
+
+class AsyncImageWriter:
+    """
+    Grava imagens em segundo plano com uma fila limitada.
+
+    Os arrays enviados não devem ser modificados até que a gravação termine.
+
+    Exemplo:
+        with AsyncImageWriter(compression=1) as writer:
+            for image, path in results:
+                writer.submit(image, path)
+        # Ao sair do bloco, todas as gravações terminaram (ou o primeiro erro é propagado)
+    """
+
+    def __init__(self, max_workers=2, max_pending=4, output_format=None, bit_depth=8,
+                 compression=None, quality=None, quantization='truncate'):
+        """
+        Inicializa o gravador.
+
+        Args:
+            max_workers: Número de threads de codificação (int, padrão: 2)
+            max_pending: Número máximo de imagens aguardando gravação; submit
+                bloqueia quando o limite é atingido (int, padrão: 4)
+            output_format: Extensão que substitui a dos caminhos recebidos,
+                como 'png' ou 'tif' (str ou None para manter o caminho)
+            bit_depth: Profundidade de bits: 8, 16 ou 32 (int, padrão: 8)
+            compression: Nível de compressão de 0 a 9 para PNG/TIFF (int ou None)
+            quality: Qualidade JPEG de 1 a 95 (int ou None)
+            quantization: 'truncate' ou 'round' (str, padrão: 'truncate')
+        """
+        self.output_format = output_format
+        self.options = {
+            'bit_depth': bit_depth,
+            'compression': compression,
+            'quality': quality,
+            'quantization': quantization,
+        }
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                            thread_name_prefix='image-writer')
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._futures = []
+        self._lock = threading.Lock()
+        self.written = 0
+
+    def _output_path(self, path):
+        if self.output_format is None:
+            return path
+        return f"{os.path.splitext(path)[0]}.{self.output_format.lstrip('.')}"
+
+    def _write(self, image, path):
+        try:
+            save_image(image, path, **self.options)
+            with self._lock:
+                self.written += 1
+            return path
+        finally:
+            self._slots.release()
+
+    def submit(self, image, path):
+        """
+        Agenda a gravação de uma imagem.
+
+        Bloqueia enquanto houver max_pending imagens aguardando gravação.
+
+        Args:
+            image: Imagem (numpy.ndarray, valores entre 0 e 1)
+            path: Caminho de saída (a extensão é trocada se output_format for usado)
+
+        Returns:
+            concurrent.futures.Future com o caminho gravado
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(self._write, image, self._output_path(path))
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            # Descartar gravações já concluídas com sucesso (erros são mantidos para wait)
+            self._futures = [f for f in self._futures if not f.done() or f.exception() is not None]
+            self._futures.append(future)
+        return future
+
+    def wait(self):
+        """
+        Aguarda todas as gravações pendentes.
+
+        Raises:
+            A primeira exceção ocorrida durante as gravações
+        """
+        with self._lock:
+            futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self):
+        """Aguarda as gravações pendentes e encerra o pool de threads."""
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # Já há uma exceção em andamento: apenas encerrar sem mascará-la
+            self._executor.shutdown(wait=True)
+        return False
@@ -0,0 +1,88 @@
+"""
+Testes da leitura e da gravação de TIFFs com e sem o pacote opcional tifffile.
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+from src import utils
+
+
+class _FakePage:
+    """Página TIFF com a interface usada por utils._read_tiff."""
+
+    def __init__(self, path):
+        with Image.open(path) as img:
+            self.photometric = {'P': 'PALETTE', 'RGB': 'RGB', 'RGBA': 'RGB'}.get(img.mode, 'MINISBLACK')
+            self._array = np.asarray(img).copy()
+
+    def asarray(self):
+        return self._array
+
+
+class _FakeTiffFile:
+    def __init__(self, path):
+        self.pages = [_FakePage(path)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class _FakeTifffile:
+    """Substituto do tifffile que devolve os pixels sem as conversões de modo do PIL."""
+    TiffFile = _FakeTiffFile
+
+
+def _sample(mode):
+    rng = np.random.default_rng(0)
+    if mode == 'P':
+        img = Image.fromarray(rng.integers(0, 4, (8, 10), dtype=np.uint8), 'P')
+        img.putpalette([0, 0, 0, 255, 0, 0, 0, 255, 0, 0, 0, 255])
+        return img
+    channels = {'L': 1, 'LA': 2, 'RGB': 3, 'RGBA': 4}[mode]
+    pixels = rng.integers(0, 256, (8, 10, channels), dtype=np.uint8)
+    return Image.fromarray(pixels[..., 0] if channels == 1 else pixels, mode)
+
+
+@pytest.mark.parametrize('mode', ['L', 'LA', 'RGB', 'RGBA', 'P'])
+def test_tiff_channels_do_not_depend_on_tifffile(tmp_path, monkeypatch, mode):
+    path = str(tmp_path / f'imagem_{mode}.tif')
+    _sample(mode).save(path)
+
+    monkeypatch.setattr(utils, '_tifffile', lambda: None)
+    with_pil = utils.load_image(path, dtype=None)
+    monkeypatch.setattr(utils, '_tifffile', lambda: _FakeTifffile)
+    with_tifffile = utils.load_image(path, dtype=None)
+
+    assert with_tifffile.shape == with_pil.shape
+    np.testing.assert_array_equal(with_tifffile, with_pil)
+
+
+class _RecordingTifffile:
+    """Substituto do tifffile que registra as chamadas de imwrite."""
+
+    def __init__(self):
+        self.calls = []
+
+    def imwrite(self, path, pixels, **options):
+        self.calls.append((path, pixels.shape, options))
+
+
+@pytest.mark.parametrize('level', [1, 9])
+def test_tiff_compression_level_reaches_tifffile(tmp_path, monkeypatch, level):
+    recorder = _RecordingTifffile()
+    monkeypatch.setattr(utils, '_tifffile', lambda: recorder)
+    utils.save_image(np.full((8, 10), 0.5), str(tmp_path / 'saida.tif'), compression=level)
+
+    (_, shape, options), = recorder.calls
+    assert shape == (8, 10)
+    assert options['compression'] == 'zlib'
+    assert options['compressionargs'] == {'level': level}
+
+
+def test_invalid_compression_level(tmp_path):
+    with pytest.raises(ValueError):
+        utils.save_image(np.zeros((4, 4)), str(tmp_path / 'saida.png'), compression=12)